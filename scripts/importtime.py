@@ -0,0 +1,62 @@
+"""Import-time budget for the CLI (`python -X importtime`).
+
+    python scripts/importtime.py                      # import sudoku_dlx.cli, budget 40 ms
+    python scripts/importtime.py --budget-ms 25 --repeat 9 --top 15
+    python scripts/importtime.py --module sudoku_dlx.api --budget-ms 60
+
+Runs the import in fresh interpreters (the first run warms the bytecode cache), prints the
+median cumulative time of the target module and its slowest imports, and exits 1 when the
+median exceeds the budget. Every `sudoku-dlx` invocation pays this cost before doing any work.
+"""
+
+import argparse
+import os
+import statistics as st
+import subprocess
+import sys
+
+
+def importtime(module, env):
+    """One run: {module name: cumulative microseconds} from `-X importtime`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--module", default="sudoku_dlx.cli")
+    ap.add_argument("--budget-ms", type=float, default=40.0)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    ns = ap.parse_args()
+
+    env = dict(os.environ)
+    # measure with a bytecode cache, as an installed package would have
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    importtime(ns.module, env)
+    runs = [importtime(ns.module, env) for _ in range(max(1, ns.repeat))]
+    total_ms = st.median(r.get(ns.module, 0) for r in runs) / 1000.0
+    last = runs[-1]
+    for name, us in sorted(last.items(), key=lambda kv: kv[1], reverse=True)[: ns.top]:
+        print(f"{us / 1000.0:8.2f} ms  {name}")
+    ours = sorted(name for name in last if name.split(".")[0] == "sudoku_dlx")
+    print(f"loaded: {', '.join(ours)}")
+    status = "OK" if total_ms <= ns.budget_ms else "OVER BUDGET"
+    print(f"import {ns.module}: median {total_ms:.2f} ms (budget {ns.budget_ms:.0f} ms) {status}")
+    return 0 if total_ms <= ns.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
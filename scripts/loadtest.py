@@ -0,0 +1,122 @@
+"""Load-test a local `sudoku-dlx serve` instance.
+
+    python scripts/loadtest.py --start --op solve --tier hard --concurrency 8 --requests 2000
+    python scripts/loadtest.py --url http://127.0.0.1:8765 --op count --batch 32
+
+Each client thread keeps one HTTP/1.1 connection open and cycles through a bench corpus.
+Prints throughput, latency percentiles and error counts; exits 1 if any request failed.
+"""
+
+import argparse
+import http.client
+import json
+import statistics as st
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+from sudoku_dlx.bench import TIERS, load_corpus
+
+
+def wait_ready(url, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url + "/health", timeout=1) as resp:
+                return json.loads(resp.read())
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"server at {url} did not become ready")
+
+
+def client(url, op, puzzles, batch, n, offset, latencies, errors):
+    parts = urllib.parse.urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    path = "/batch" if batch > 1 else f"/{op}"
+    for i in range(n):
+        k = offset + i * batch
+        if batch > 1:
+            body = {"requests": [{"op": op, "grid": puzzles[(k + j) % len(puzzles)]} for j in range(batch)]}
+        else:
+            body = {"grid": puzzles[k % len(puzzles)]}
+        data = json.dumps(body).encode("utf-8")
+        t0 = time.perf_counter()
+        try:
+            conn.request("POST", path, body=data, headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            payload = resp.read()
+        except (OSError, http.client.HTTPException):
+            errors.append("connection")
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+            continue
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        if resp.status != 200:
+            errors.append(str(resp.status))
+        elif batch > 1:
+            errors.extend("item" for r in json.loads(payload)["results"] if "error" in r)
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--url", default="http://127.0.0.1:8765")
+    ap.add_argument("--start", action="store_true", help="start `sudoku-dlx serve` on the --url port first")
+    ap.add_argument("--workers", type=int, default=None, help="with --start: server worker processes")
+    ap.add_argument("--op", default="solve", choices=["solve", "count", "rate", "canonical", "explain", "analyze"])
+    ap.add_argument("--tier", default="hard", choices=TIERS)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=1000, help="HTTP requests in total")
+    ap.add_argument("--batch", type=int, default=1, help="puzzles per request (>1 uses /batch)")
+    ns = ap.parse_args()
+
+    server = None
+    if ns.start:
+        port = urllib.parse.urlsplit(ns.url).port or 8765
+        cmd = [sys.executable, "-m", "sudoku_dlx", "serve", "--port", str(port)]
+        if ns.workers is not None:
+            cmd += ["--workers", str(ns.workers)]
+        server = subprocess.Popen(cmd)
+    try:
+        info = wait_ready(ns.url)
+        puzzles = load_corpus(ns.tier)
+        per = [ns.requests // ns.concurrency + (i < ns.requests % ns.concurrency) for i in range(ns.concurrency)]
+        latencies, errors = [], []
+        threads = [
+            threading.Thread(
+                target=client,
+                args=(ns.url, ns.op, puzzles, ns.batch, per[i], sum(per[:i]) * ns.batch, latencies, errors),
+            )
+            for i in range(ns.concurrency)
+        ]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    lat = sorted(latencies)
+    q = st.quantiles(lat, n=100, method="inclusive") if len(lat) > 1 else lat * 99
+    done = len(lat)
+    print(f"server: {info}")
+    print(
+        f"op={ns.op} tier={ns.tier} concurrency={ns.concurrency} batch={ns.batch} "
+        f"requests={done} puzzles={done * ns.batch} wall_s={wall:.2f}"
+    )
+    print(f"req/s={done / wall:.1f} puzzles/s={done * ns.batch / wall:.1f}")
+    if lat:
+        print(f"p50_ms={q[49]:.2f} p95_ms={q[94]:.2f} p99_ms={q[98]:.2f} max_ms={lat[-1]:.2f}")
+    print(f"errors={len(errors)}" + (f" ({', '.join(sorted(set(errors)))})" if errors else ""))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,98 @@
 from __future__ import annotations
 
-from .api import (
-    Grid,
-    SolveResult,
-    Stats,
-    count_solutions,
-    from_string,
-    is_valid,
-    analyze,
-    solve,
-    to_string,
-    build_reveal_trace,
-)
-from .explain import explain
-from .canonical import canonical_form
-from .generate import generate
-from .rating import rate
-from .crosscheck import sat_solve, cnf_dimacs_lines
-from .formats import read_grids, write_grids, detect_format
-from .solver import (
-    SOLVER,
-    generate_minimal,
-    grid_clues,
-    hardness_estimate,
-    is_minimal,
-    print_grid,
-    set_seed,
-    to_string as legacy_to_string,
-    from_string as legacy_from_string,
-    validate_grid,
-)
+"""Sudoku solving, rating and generation on a bitset DLX core.
+
+Public names are resolved lazily (PEP 562) so ``import sudoku_dlx`` and the CLI only load the
+submodules a call actually needs.
+"""
+
+import sys
+import types
+
+# public name -> (submodule, attribute)
+_EXPORTS: dict[str, tuple[str, str]] = {
+    **{
+        name: ("api", name)
+        for name in (
+            "Grid",
+            "SolveResult",
+            "Stats",
+            "count_solutions",
+            "from_string",
+            "is_valid",
+            "analyze",
+            "solve",
+            "to_string",
+            "build_reveal_trace",
+        )
+    },
+    "Grid81": ("grid81", "Grid81"),
+    "parse_many": ("grid81", "parse_many"),
+    "explain": ("explain", "explain"),
+    "iter_explain": ("explain", "iter_explain"),
+    "canonical_form": ("canonical", "canonical_form"),
+    "generate": ("generate", "generate"),
+    "rate": ("rating", "rate"),
+    "is_solvable_with": ("strategies", "is_solvable_with"),
+    "sat_count": ("crosscheck", "sat_count"),
+    "sat_solve": ("crosscheck", "sat_solve"),
+    "cnf_dimacs_lines": ("crosscheck", "cnf_dimacs_lines"),
+    "TraceRecorder": ("trace", "TraceRecorder"),
+    "record_search": ("trace", "record_search"),
+    **{
+        name: ("formats", name)
+        for name in ("GridArray", "GridWriter", "detect_format", "iter_grids", "read_grids", "write_grids")
+    },
+    **{
+        name: ("solver", name)
+        for name in (
+            "SOLVER",
+            "SearchTracer",
+            "generate_minimal",
+            "grid_clues",
+            "hardness_estimate",
+            "is_minimal",
+            "print_grid",
+            "set_seed",
+            "validate_grid",
+        )
+    },
+    "legacy_to_string": ("solver", "to_string"),
+    "legacy_from_string": ("solver", "from_string"),
+}
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    # __import__ rather than importlib.import_module so -X importtime still reports the submodule
+    __import__(f"{__name__}.{module}")
+    value = getattr(sys.modules[f"{__name__}.{module}"], attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+class _Package(types.ModuleType):
+    # ``explain`` and ``generate`` are both functions and submodules; importing the submodule
+    # must not replace the function export (the eager package behaved the same way).
+    def __setattr__(self, name: str, value: object) -> None:
+        if name in ("explain", "generate") and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
 
 __all__ = [
     "Grid",
+    "Grid81",
+    "parse_many",
     "Stats",
     "SolveResult",
     "from_string",
@@ -43,14 +103,23 @@ __all__ = [
     "analyze",
     "count_solutions",
     "explain",
+    "iter_explain",
+    "is_solvable_with",
     "rate",
     "canonical_form",
     "generate",
     "sat_solve",
+    "sat_count",
     "cnf_dimacs_lines",
     "read_grids",
     "write_grids",
+    "iter_grids",
+    "GridWriter",
+    "GridArray",
     "detect_format",
+    "SearchTracer",
+    "TraceRecorder",
+    "record_search",
     # Legacy exports
     "SOLVER",
     "generate_minimal",
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from time import perf_counter
 from typing import List, Optional, Dict, Any, Iterable, Tuple
 
+from . import metrics as _metrics
+from .grid81 import Grid81, rows_to_text, text_to_cells
+
 Grid = List[List[int]]
 
 ANALYZE_VERSION = "1"
@@ -14,40 +17,34 @@ class Stats:
     ms: float
     nodes: int
     backtracks: int
+    dead_ends: int = 0
+    failed_columns: int = 0
+    max_depth: int = 0
+    branching: List[float] = field(default_factory=list)  # avg rows tried per node, by depth
 
 
 @dataclass
 class SolveResult:
-    grid: Grid
+    grid: Grid | Grid81
     stats: Stats
 
 
 def from_string(s: str) -> Grid:
     """Parse an 81-char string (digits 1-9, or . 0 - _ for blanks) to a 9x9 grid."""
-    text = "".join(ch for ch in s if not ch.isspace())
-    if len(text) != 81:
-        raise ValueError("grid string must be 81 characters")
-    out: Grid = [[0] * 9 for _ in range(9)]
-    for i, ch in enumerate(text):
-        r, c = divmod(i, 9)
-        if ch in "0.-_":
-            out[r][c] = 0
-        elif ch.isdigit():
-            value = int(ch)
-            if not (1 <= value <= 9):
-                raise ValueError("digits must be 1..9")
-            out[r][c] = value
-        else:
-            raise ValueError(f"bad char at {i}: {ch!r}")
-    return out
+    cells = text_to_cells(s)
+    return [list(cells[i : i + 9]) for i in range(0, 81, 9)]
 
 
-def to_string(grid: Grid) -> str:
-    return "".join(str(x) if x != 0 else "." for row in grid for x in row)
+def to_string(grid: Grid | Grid81) -> str:
+    if isinstance(grid, Grid81):
+        return grid.to_string()
+    return rows_to_text(grid)
 
 
-def is_valid(grid: Grid) -> bool:
+def is_valid(grid: Grid | Grid81) -> bool:
     """Cheap structural validity (no duplicates in row/col/box for existing clues)."""
+    if isinstance(grid, Grid81):
+        return _cells_valid(grid.cells)
     rows = [set() for _ in range(9)]
     cols = [set() for _ in range(9)]
     boxes = [set() for _ in range(9)]
@@ -64,8 +61,27 @@ def is_valid(grid: Grid) -> bool:
     return True
 
 
-def solve(grid: Grid, *, collect_stats: bool = True) -> Optional[SolveResult]:
-    """Solve Sudoku via the underlying DLX engine."""
+def _cells_valid(cells: memoryview) -> bool:
+    # one bitmask per row/col/box over the flat cells
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    for i, v in enumerate(cells):
+        if not v:
+            continue
+        bit = 1 << v
+        r, c = divmod(i, 9)
+        b = (r // 3) * 3 + c // 3
+        if (rows[r] | cols[c] | boxes[b]) & bit:
+            return False
+        rows[r] |= bit
+        cols[c] |= bit
+        boxes[b] |= bit
+    return True
+
+
+def solve(grid: Grid | Grid81, *, collect_stats: bool = True) -> Optional[SolveResult]:
+    """Solve Sudoku via the underlying DLX engine (a Grid81 puzzle gets a Grid81 solution)."""
     if not is_valid(grid):
         return None
     from .engine import DLXEngine, apply_solution_to_grid, build_ec_rows_from_grid
@@ -75,23 +91,42 @@ def solve(grid: Grid, *, collect_stats: bool = True) -> Optional[SolveResult]:
     t0 = perf_counter()
     sol_rows = engine.solve_first(rows)
     ms = (perf_counter() - t0) * 1000.0
+    reg = _metrics.ACTIVE
+    if reg is not None:
+        reg.observe_call("solve", ms / 1000.0, engine.nodes)
     if sol_rows is None:
         return None
-    solved = [row[:] for row in grid]
+    solved = grid.copy() if isinstance(grid, Grid81) else [row[:] for row in grid]
     apply_solution_to_grid(solved, sol_rows)
-    stats = Stats(ms=ms, nodes=engine.nodes, backtracks=engine.backtracks)
+    stats = Stats(
+        ms=ms,
+        nodes=engine.nodes,
+        backtracks=engine.backtracks,
+        dead_ends=engine.dead_ends,
+        failed_columns=engine.failed_columns,
+        max_depth=engine.max_depth,
+        branching=engine.branching,
+    )
     return SolveResult(solved, stats)
 
 
-def count_solutions(grid: Grid, limit: int = 2) -> int:
+def count_solutions(grid: Grid | Grid81, limit: int = 2) -> int:
     from .engine import DLXEngine, build_ec_rows_from_grid
 
     rows = build_ec_rows_from_grid(grid)
     engine = DLXEngine()
-    return engine.count(rows, limit=limit)
+    reg = _metrics.ACTIVE
+    if reg is None:
+        return engine.count(rows, limit=limit)
+    t0 = perf_counter()
+    count = engine.count(rows, limit=limit)
+    reg.observe_call("count", perf_counter() - t0, engine.nodes)
+    return count
 
 
-def build_reveal_trace(initial: Grid, solved: Grid, stats: Stats) -> Dict[str, Any]:
+def build_reveal_trace(
+    initial: Grid | Grid81, solved: Grid | Grid81, stats: Stats
+) -> Dict[str, Any]:
     """
     Build a simple, deterministic 'solution_reveal' trace:
       - initial: 81-char string (with '.')
@@ -118,7 +153,7 @@ def build_reveal_trace(initial: Grid, solved: Grid, stats: Stats) -> Dict[str, A
     }
 
 
-def analyze(grid: Grid) -> Dict[str, Any]:
+def analyze(grid: Grid | Grid81) -> Dict[str, Any]:
     """
     Return a compact analysis dict for a Sudoku grid. Keys:
       - version: schema version string
@@ -130,11 +165,16 @@ def analyze(grid: Grid) -> Dict[str, Any]:
       - canonical: str (81-char canonical form)
       - solution: str | None (81-char solution if solvable)
       - stats: {ms, nodes, backtracks} (0s if unsolvable)
+      - search: {dead_ends, failed_columns, max_depth, branching} from the same solve
+        (branching = average rows tried per node at each depth)
     """
     from .rating import rate
     from .canonical import canonical_form
 
-    givens = sum(1 for r in range(9) for c in range(9) if grid[r][c] != 0)
+    if isinstance(grid, Grid81):
+        givens = grid.givens()
+    else:
+        givens = sum(1 for r in range(9) for c in range(9) if grid[r][c] != 0)
     valid = is_valid(grid)
     uniq = False
     solv: Optional[SolveResult] = None
@@ -144,11 +184,18 @@ def analyze(grid: Grid) -> Dict[str, Any]:
         solv = solve(grid)
     solution = None
     ms = nodes = backs = 0
+    search: Dict[str, Any] = {"dead_ends": 0, "failed_columns": 0, "max_depth": 0, "branching": []}
     if solv is not None:
         solution = to_string(solv.grid)
         ms = int(round(solv.stats.ms))
         nodes = int(solv.stats.nodes)
         backs = int(solv.stats.backtracks)
+        search = {
+            "dead_ends": int(solv.stats.dead_ends),
+            "failed_columns": int(solv.stats.failed_columns),
+            "max_depth": int(solv.stats.max_depth),
+            "branching": list(solv.stats.branching),
+        }
     return {
         "version": ANALYZE_VERSION,
         "valid": valid,
@@ -159,10 +206,12 @@ def analyze(grid: Grid) -> Dict[str, Any]:
         "canonical": canonical_form(grid),
         "solution": solution,
         "stats": {"ms": ms, "nodes": nodes, "backtracks": backs},
+        "search": search,
     }
 
 __all__ = [
     "Grid",
+    "Grid81",
     "Stats",
     "SolveResult",
     "from_string",
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+"""Built-in benchmark suite: fixed corpora, timed operations, memory tracing, baseline comparison."""
+
+from .corpus import CORPUS_SIZE, SEVENTEEN_CLUE, TIERS, build_corpus, load_corpus
+from .memory import MEM_OPS, MEM_VERSION, run_memory_benchmarks
+from .runner import BENCH_VERSION, OPS, compare, run_benchmarks
+
+__all__ = [
+    "TIERS",
+    "CORPUS_SIZE",
+    "SEVENTEEN_CLUE",
+    "build_corpus",
+    "load_corpus",
+    "BENCH_VERSION",
+    "OPS",
+    "run_benchmarks",
+    "compare",
+    "MEM_VERSION",
+    "MEM_OPS",
+    "run_memory_benchmarks",
+]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+"""Deterministic benchmark corpora.
+
+Each tier is generated from fixed seeds by :func:`build_corpus` and shipped as
+``corpora/<tier>.txt`` so benchmark runs never pay for (or depend on) generation:
+
+- ``easy``:    ~36 givens
+- ``medium``:  ~28 givens
+- ``hard``:    minimal puzzles that need more than singles (strategy rating >= 2.5)
+- ``minimal``: well-known 17-clue puzzles, then generated minimal puzzles
+"""
+
+from pathlib import Path
+from typing import Dict, List
+
+from ..api import to_string
+from ..generate import generate
+from ..rating import rate
+
+TIERS = ("easy", "medium", "hard", "minimal")
+
+CORPUS_SIZE = 32
+
+# generate() keyword arguments per tier; seeds start at _SEED_BASE[tier]
+TIER_PARAMS: Dict[str, Dict] = {
+    "easy": {"target_givens": 36, "symmetry": "mix"},
+    "medium": {"target_givens": 28, "symmetry": "mix"},
+    "hard": {"target_givens": 22, "minimal": True, "symmetry": "none"},
+    "minimal": {"target_givens": 17, "minimal": True, "symmetry": "none"},
+}
+_SEED_BASE = {"easy": 10_000, "medium": 20_000, "hard": 30_000, "minimal": 40_000}
+
+# Unique 17-clue puzzles from the public catalogue of known 17-clue Sudokus.
+SEVENTEEN_CLUE = (
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+    "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+    "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+    "000000012008030000000000040120500000000004700060000000507000300000620000000100000",
+)
+
+_CORPUS_DIR = Path(__file__).with_name("corpora")
+
+
+def build_corpus(tier: str, n: int = CORPUS_SIZE) -> List[str]:
+    """Regenerate ``n`` puzzles of ``tier`` from its fixed seeds (slow; used to refresh the files)."""
+    if tier not in TIERS:
+        raise ValueError(f"unknown tier: {tier!r} (expected one of {', '.join(TIERS)})")
+    out: List[str] = []
+    if tier == "minimal":
+        out.extend(s.replace("0", ".") for s in SEVENTEEN_CLUE[:n])
+    seed = _SEED_BASE[tier]
+    while len(out) < n:
+        grid = generate(seed=seed, **TIER_PARAMS[tier])
+        seed += 1
+        if tier == "hard" and rate(grid, method="strategies") < 2.5:
+            continue
+        out.append(to_string(grid))
+    return out
+
+
+def load_corpus(tier: str) -> List[str]:
+    """The shipped puzzles of ``tier`` as 81-char strings."""
+    if tier not in TIERS:
+        raise ValueError(f"unknown tier: {tier!r} (expected one of {', '.join(TIERS)})")
+    text = (_CORPUS_DIR / f"{tier}.txt").read_text(encoding="utf-8")
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+
+
+__all__ = ["TIERS", "CORPUS_SIZE", "TIER_PARAMS", "SEVENTEEN_CLUE", "build_corpus", "load_corpus"]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+"""Memory benchmarks: tracemalloc peak/retained allocations per operation and process footprint.
+
+Per-puzzle ops (``count``, ``canonical``, ``rate``, ``explain``) are traced one call at a time;
+file ops (``read_grids``, ``iter_grids``, ``gen_batch``) run once per tier on a scratch file.
+``retained_*`` is what an op leaves allocated after it returns, so caches that grow without
+bound (e.g. the rating cache, which is deliberately not cleared here) and whole-file loads
+show up as regressions.
+"""
+
+import contextlib
+import io
+import os
+import platform
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..api import from_string
+from ..canonical import canonical_form
+from ..explain import explain
+from ..formats import iter_grids, read_grids
+from ..metrics import _percentile
+from ..rating import rate
+from ..solver import SOLVER, grid_clues
+from .corpus import TIER_PARAMS, TIERS, load_corpus
+
+MEM_VERSION = "bench-mem-1"
+
+# puzzles repeated into the scratch file used by the file ops (32 x 64 = 2048 lines)
+_FILE_REPEAT = 64
+_GEN_BATCH_COUNT = 4
+
+
+def _mem_count(s: str) -> None:
+    SOLVER.count_solutions(grid_clues(from_string(s)), limit=2)
+
+
+def _mem_canonical(s: str) -> None:
+    canonical_form(from_string(s))
+
+
+def _mem_rate(s: str) -> None:
+    rate(from_string(s))
+
+
+def _mem_explain(s: str) -> None:
+    explain(from_string(s))
+
+
+def _mem_read_grids(path: str, tier: str, workdir: str) -> None:
+    read_grids(path)
+
+
+def _mem_iter_grids(path: str, tier: str, workdir: str) -> None:
+    for _ in iter_grids(path):
+        pass
+
+
+def _mem_gen_batch(path: str, tier: str, workdir: str) -> None:
+    from .. import cli
+
+    params = TIER_PARAMS[tier]
+    argv = [
+        "gen-batch",
+        "--out",
+        os.path.join(workdir, f"gen-{tier}.txt"),
+        "--count",
+        str(_GEN_BATCH_COUNT),
+        "--givens",
+        str(params["target_givens"]),
+        "--symmetry",
+        params["symmetry"],
+        "--seed",
+        "0",
+    ]
+    if params.get("minimal"):
+        argv.append("--minimal")
+    with contextlib.redirect_stderr(io.StringIO()):
+        cli.main(argv)
+
+
+_PER_PUZZLE: Dict[str, Callable[[str], None]] = {
+    "count": _mem_count,
+    "canonical": _mem_canonical,
+    "rate": _mem_rate,
+    "explain": _mem_explain,
+}
+_PER_FILE: Dict[str, Callable[[str, str, str], None]] = {
+    "read_grids": _mem_read_grids,
+    "iter_grids": _mem_iter_grids,
+    "gen_batch": _mem_gen_batch,
+}
+MEM_OPS = tuple(_PER_PUZZLE) + tuple(_PER_FILE)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size, or the peak where only that is available (None if unknown)."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def _kib(n: float) -> float:
+    return round(n / 1024.0, 2)
+
+
+def _trace_calls(calls: Sequence[Callable[[], None]]) -> Dict[str, Any]:
+    """Run ``calls`` under tracemalloc (already started); per-call peaks and what stays retained."""
+    before = tracemalloc.take_snapshot()
+    start_current, _ = tracemalloc.get_traced_memory()
+    peaks: List[float] = []
+    for call in calls:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(max(0, peak - base))
+    end_current, _ = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    peaks.sort()
+    n = len(calls)
+    return {
+        "n": n,
+        "peak_kib_p50": _kib(_percentile(peaks, 0.50)),
+        "peak_kib_max": _kib(peaks[-1]) if peaks else 0.0,
+        "retained_kib": _kib(end_current - start_current),
+        "retained_blocks": blocks,
+        "retained_kib_per_call": _kib((end_current - start_current) / n) if n else 0.0,
+    }
+
+
+def run_memory_benchmarks(
+    tiers: Sequence[str] = TIERS,
+    ops: Sequence[str] = MEM_OPS,
+    *,
+    limit: int = 10,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Trace allocations of ``ops`` on the first ``limit`` puzzles (0 = all) of each tier.
+
+    Every op is warmed up once (untraced) before measuring. Returns
+    ``{"version", "env", "limit", "steady_state", "results": {"op/tier": record}}`` where each
+    record has n, peak_kib_p50, peak_kib_max, retained_kib, retained_blocks and
+    retained_kib_per_call; ``steady_state`` holds the process RSS after warmup and after the run.
+    """
+    for op in ops:
+        if op not in MEM_OPS:
+            raise ValueError(f"unknown memory op: {op!r} (expected one of {', '.join(MEM_OPS)})")
+    if tracemalloc.is_tracing():
+        raise ValueError("tracemalloc is already tracing; run memory benchmarks in a clean process")
+    corpora = {tier: load_corpus(tier) for tier in tiers}
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="sudoku-bench-") as workdir:
+        paths: Dict[str, str] = {}
+        for tier, puzzles in corpora.items():
+            paths[tier] = os.path.join(workdir, f"{tier}.txt")
+            with open(paths[tier], "w", encoding="utf-8") as fh:
+                fh.write("\n".join(puzzles * _FILE_REPEAT) + "\n")
+            if limit:
+                corpora[tier] = puzzles[:limit]
+
+        # warmup: imports, lazily built tables and first-call caches stay out of the numbers
+        for op in ops if tiers else ():
+            if op in _PER_PUZZLE:
+                _PER_PUZZLE[op](corpora[tiers[0]][0])
+            else:
+                _PER_FILE[op](paths[tiers[0]], tiers[0], workdir)
+
+        rss = _rss_bytes()
+        steady: Dict[str, Any] = {"rss_kib": _kib(rss) if rss is not None else None}
+        tracemalloc.start()
+        try:
+            for tier in tiers:
+                for op in ops:
+                    if op in _PER_PUZZLE:
+                        fn = _PER_PUZZLE[op]
+                        calls = [lambda s=s, fn=fn: fn(s) for s in corpora[tier]]
+                    else:
+                        ffn = _PER_FILE[op]
+                        calls = [lambda ffn=ffn, tier=tier: ffn(paths[tier], tier, workdir)]
+                    rec = {"op": op, "tier": tier, **_trace_calls(calls)}
+                    results[f"{op}/{tier}"] = rec
+                    if progress is not None:
+                        progress(
+                            f"{op}/{tier}: peak {rec['peak_kib_max']:.1f} KiB"
+                            f" · retained {rec['retained_kib']:.1f} KiB"
+                        )
+        finally:
+            tracemalloc.stop()
+    rss = _rss_bytes()
+    steady["rss_after_kib"] = _kib(rss) if rss is not None else None
+    return {
+        "version": MEM_VERSION,
+        "env": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "limit": limit,
+        "steady_state": steady,
+        "results": results,
+    }
+
+
+__all__ = ["MEM_VERSION", "MEM_OPS", "run_memory_benchmarks"]
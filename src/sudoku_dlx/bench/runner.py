@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+"""Benchmark runner: per-operation latency percentiles, throughput and baseline comparison."""
+
+import platform
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..api import count_solutions, from_string, solve, to_string
+from ..canonical import canonical_form
+from ..explain import explain
+from ..generate import generate
+from ..metrics import _percentile
+from ..rating import _RATING_CACHE, rate
+from ..solver import SOLVER
+from .corpus import TIER_PARAMS, TIERS, load_corpus
+
+BENCH_VERSION = "bench-1"
+
+
+def _op_solve(s: str, i: int, tier: str) -> Optional[int]:
+    res = solve(from_string(s))
+    return res.stats.nodes if res is not None else 0
+
+
+def _op_count(s: str, i: int, tier: str) -> Optional[int]:
+    count_solutions(from_string(s), limit=2)
+    return SOLVER.stats.nodes
+
+
+def _op_canonical(s: str, i: int, tier: str) -> Optional[int]:
+    canonical_form(from_string(s))
+    return None
+
+
+def _op_rate(s: str, i: int, tier: str) -> Optional[int]:
+    _RATING_CACHE.clear()  # measure the work, not the cache
+    rate(from_string(s))
+    return None
+
+
+def _op_explain(s: str, i: int, tier: str) -> Optional[int]:
+    explain(from_string(s))
+    return None
+
+
+def _op_generate(s: str, i: int, tier: str) -> Optional[int]:
+    # one generation per corpus slot, with the tier's settings and a fixed seed
+    generate(seed=i, **TIER_PARAMS[tier])
+    return None
+
+
+def _op_parse(s: str, i: int, tier: str) -> Optional[int]:
+    # parse + format round trip; should stay negligible next to solve
+    to_string(from_string(s))
+    return None
+
+
+# op name -> fn(puzzle, index, tier) returning search nodes (or None when not applicable)
+OPS: Dict[str, Callable[[str, int, str], Optional[int]]] = {
+    "solve": _op_solve,
+    "count": _op_count,
+    "canonical": _op_canonical,
+    "rate": _op_rate,
+    "explain": _op_explain,
+    "generate": _op_generate,
+    "parse": _op_parse,
+}
+
+
+def _measure(op: str, tier: str, puzzles: Sequence[str], repeat: int) -> Dict[str, Any]:
+    fn = OPS[op]
+    times: List[float] = []
+    nodes = 0
+    has_nodes = False
+    for _ in range(repeat):
+        for i, s in enumerate(puzzles):
+            t0 = perf_counter()
+            n = fn(s, i, tier)
+            times.append(perf_counter() - t0)
+            if n is not None:
+                has_nodes = True
+                nodes += n
+    total = sum(times)
+    times_ms = sorted(t * 1000.0 for t in times)
+    rec: Dict[str, Any] = {
+        "op": op,
+        "tier": tier,
+        "n": len(times),
+        "total_s": round(total, 6),
+        "per_s": round(len(times) / total, 3) if total else 0.0,
+        "p50_ms": round(_percentile(times_ms, 0.50), 4),
+        "p95_ms": round(_percentile(times_ms, 0.95), 4),
+        "p99_ms": round(_percentile(times_ms, 0.99), 4),
+    }
+    if has_nodes:
+        rec["nodes_per_s"] = round(nodes / total, 1) if total else 0.0
+    return rec
+
+
+def run_benchmarks(
+    tiers: Sequence[str] = TIERS,
+    ops: Sequence[str] = tuple(OPS),
+    *,
+    limit: int = 10,
+    repeat: int = 1,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run ``ops`` on the first ``limit`` puzzles (0 = all) of each tier, ``repeat`` times.
+
+    Returns ``{"version", "env", "limit", "repeat", "results": {"op/tier": record}}``;
+    each record has n, total_s, per_s, p50/p95/p99_ms and, for search ops, nodes_per_s.
+    """
+    for op in ops:
+        if op not in OPS:
+            raise ValueError(f"unknown op: {op!r} (expected one of {', '.join(OPS)})")
+    results: Dict[str, Any] = {}
+    for tier in tiers:
+        puzzles = load_corpus(tier)
+        if limit:
+            puzzles = puzzles[:limit]
+        for op in ops:
+            rec = _measure(op, tier, puzzles, repeat)
+            results[f"{op}/{tier}"] = rec
+            if progress is not None:
+                progress(f"{op}/{tier}: p50 {rec['p50_ms']:.3f} ms · {rec['per_s']:.1f}/s")
+    return {
+        "version": BENCH_VERSION,
+        "env": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "limit": limit,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    *,
+    threshold: float = 0.10,
+    metric: str = "p50_ms",
+) -> List[Dict[str, Any]]:
+    """
+    Regressions of ``current`` against ``baseline``: entries present in both whose
+    ``metric`` (a latency or memory figure, lower is better) grew by more than ``threshold`` (0.10 = 10%).
+    """
+    out: List[Dict[str, Any]] = []
+    base = baseline.get("results", {})
+    for key, rec in current.get("results", {}).items():
+        old = base.get(key)
+        if old is None or not old.get(metric) or metric not in rec:
+            continue
+        change = rec[metric] / old[metric] - 1.0
+        if change > threshold:
+            out.append(
+                {
+                    "key": key,
+                    "metric": metric,
+                    "baseline": old[metric],
+                    "current": rec[metric],
+                    "change": round(change, 4),
+                }
+            )
+    return out
+
+
+__all__ = ["BENCH_VERSION", "OPS", "run_benchmarks", "compare"]
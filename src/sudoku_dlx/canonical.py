@@ -11,9 +11,12 @@ Maps isomorphic puzzles to a single 81-char canonical form using:
 Total variants explored per grid: 8 × (3!)^4 = 10,368 — acceptable for CLI/tests.
 """
 from itertools import permutations
+from time import perf_counter
 from typing import List, Sequence, Tuple
 
+from . import metrics as _metrics
 from .api import Grid
+from .grid81 import Grid81
 
 # --------- Dihedral transforms over 9x9 grids (D4) ----------
 
@@ -181,10 +184,63 @@ def _canonical_band_stack(
     return best_local
 
 
+# --------- Invariant fingerprint (cheap prefilter) ----------
+
+
+def _line_profile(counts: List[int]) -> Tuple[int, ...]:
+    # (band totals..., per-band sorted line counts...) with bands ordered canonically
+    blocks = sorted(tuple(sorted(counts[b * 3 : b * 3 + 3])) for b in range(3))
+    return tuple(sum(block) for block in blocks) + tuple(x for block in blocks for x in block)
+
+
+def invariant_fingerprint(grid: Grid | Grid81) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Return a cheap isomorphism invariant of ``grid``.
+
+    Isomorphic puzzles always share a fingerprint, so two puzzles with different
+    fingerprints can never share a canonical form. Components:
+      - clue count
+      - digit frequency multiset (relabel invariant)
+      - box clue-count multiset
+      - band/stack clue-count multisets
+      - per-band row and per-stack column clue-count multisets
+    Costs a single pass over the 81 cells.
+    """
+    row_counts = [0] * 9
+    col_counts = [0] * 9
+    box_counts = [0] * 9
+    digit_counts: dict[object, int] = {}
+    if isinstance(grid, Grid81):
+        grid = grid.to_grid()
+    for r in range(9):
+        row = grid[r]
+        for c in range(9):
+            v = row[c]
+            if not v or v in {"0", ".", "-"}:
+                continue
+            row_counts[r] += 1
+            col_counts[c] += 1
+            box_counts[(r // 3) * 3 + c // 3] += 1
+            digit_counts[v] = digit_counts.get(v, 0) + 1
+
+    line_side = _line_profile(row_counts)
+    other_side = _line_profile(col_counts)
+    if other_side < line_side:
+        # rows and columns trade places under transpose/rotation
+        line_side, other_side = other_side, line_side
+    return (
+        (sum(row_counts),),
+        tuple(sorted(digit_counts.values())),
+        tuple(sorted(box_counts)),
+        line_side,
+        other_side,
+    )
+
+
 # --------- Public API (full canon) ----------
 
 
-def canonical_form(grid: Grid) -> str:
+def canonical_form(grid: Grid | Grid81) -> str:
     """
     Return the lexicographically smallest normalized string among all:
       - D4 dihedral transforms
@@ -192,6 +248,10 @@ def canonical_form(grid: Grid) -> str:
       - Row swaps within each band, column swaps within each stack
     Each candidate is normalized by greedy digit relabeling before compare.
     """
+    reg = _metrics.ACTIVE
+    t0 = perf_counter() if reg is not None else 0.0
+    if isinstance(grid, Grid81):
+        grid = grid.to_grid()  # the D4 transforms index rows many times; lists are faster
     best: str | None = None
     for tf in _TRANSFORMS:
         g1 = tf(grid)
@@ -202,7 +262,9 @@ def canonical_form(grid: Grid) -> str:
                 if cand is not None and (best is None or cand < best):
                     best = cand
     assert best is not None
+    if reg is not None:
+        reg.observe_call("canonical", perf_counter() - t0)
     return best
 
 
-__all__ = ["canonical_form"]
+__all__ = ["canonical_form", "invariant_fingerprint"]
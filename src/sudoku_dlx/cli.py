@@ -1,16 +1,15 @@
 from __future__ import annotations
 
-import argparse, sys, pathlib, csv, random, json, time, multiprocessing as mp
-from typing import Optional
+import argparse, sys
+from typing import TYPE_CHECKING, Iterable, Iterator
 
-from .api import analyze, build_reveal_trace, from_string, is_valid, solve, to_string
-from .crosscheck import sat_solve, cnf_dimacs_lines
-from .explain import explain
-from .canonical import canonical_form
-from .generate import generate
-from .rating import rate
-from .formats import detect_format, read_grids, write_grids
-from statistics import mean
+if TYPE_CHECKING:  # annotations only; nothing heavy is imported at CLI startup
+    import pathlib
+
+    from .api import Grid
+
+# Subcommands import what they use inside their cmd_* function: the CLI is run thousands of
+# times from shell pipelines, and loading every module up front dominated short invocations.
 
 
 def _count_givens(grid) -> int:
@@ -18,6 +17,11 @@ def _count_givens(grid) -> int:
 
 
 def _gen_batch_worker(args: tuple[int, int, bool, str, int, int]) -> str:
+    import random
+
+    from .canonical import canonical_form
+    from .generate import generate
+
     seed_i, target_givens, minimal, symmetry, min_givens, max_givens = args
     local_rng = random.Random(seed_i)
     while True:
@@ -32,6 +36,13 @@ def _gen_batch_worker(args: tuple[int, int, bool, str, int, int]) -> str:
             return canonical_form(g)
 
 
+def _crosscheck_worker(args: tuple[str, tuple[str, ...]]) -> tuple[str, dict]:
+    from .api import from_string
+    from .crosscheck import crosscheck_grid
+
+    s, engines = args
+    return s, crosscheck_grid(from_string(s), engines)
+
 
 def _read_grid_arg(ns: argparse.Namespace) -> str:
     if ns.grid:
@@ -59,12 +70,22 @@ def _print_analysis(data: dict) -> None:
     print(
         f"stats:     {stats['ms']} ms · nodes {stats['nodes']} · backtracks {stats['backtracks']}"
     )
+    search = data.get("search")
+    if search:
+        print(
+            f"search:    depth {search['max_depth']} · dead ends {search['dead_ends']}"
+            f" · failed columns {search['failed_columns']}"
+        )
     print(f"canonical: {data['canonical']}")
     if data["solution"]:
         print(f"solution:  {data['solution']}")
 
 
 def cmd_solve(ns: argparse.Namespace) -> int:
+    import json, pathlib
+
+    from .api import build_reveal_trace, from_string, is_valid, solve, to_string
+
     grid = from_string(_read_grid_arg(ns))
     grid_for_crosscheck = [row[:] for row in grid]
     if not is_valid(grid):
@@ -79,12 +100,29 @@ def cmd_solve(ns: argparse.Namespace) -> int:
     else:
         print(to_string(result.grid))
     if ns.trace:
-        trace = build_reveal_trace(grid, result.grid, result.stats)
         outp = pathlib.Path(ns.trace)
         outp.parent.mkdir(parents=True, exist_ok=True)
-        outp.write_text(json.dumps(trace, indent=2, sort_keys=True), encoding="utf-8")
+        if ns.trace_kind == "dlx":
+            from .formats import open_path
+            from .trace import record_search
+
+            with open_path(str(outp), "w") as handle:
+                end = record_search(
+                    grid_for_crosscheck,
+                    handle,
+                    sample=ns.trace_sample,
+                    max_depth=ns.trace_max_depth,
+                    max_events=ns.trace_max_events or None,
+                )
+            if end["truncated"]:
+                print(f"# trace truncated after {end['written']} events", file=sys.stderr)
+        else:
+            trace = build_reveal_trace(grid, result.grid, result.stats)
+            outp.write_text(json.dumps(trace, indent=2, sort_keys=True), encoding="utf-8")
     if ns.crosscheck:
         if ns.crosscheck == "sat":
+            from .crosscheck import sat_solve
+
             sat_grid = sat_solve(grid_for_crosscheck)
             if sat_grid is None:
                 print(
@@ -108,12 +146,19 @@ def cmd_solve(ns: argparse.Namespace) -> int:
 
 
 def cmd_rate(ns: argparse.Namespace) -> int:
+    from .api import from_string
+    from .rating import rate
+
     grid = from_string(_read_grid_arg(ns))
-    print(rate(grid))
+    print(rate(grid, method=ns.method))
     return 0
 
 
 def cmd_check(ns: argparse.Namespace) -> int:
+    import json
+
+    from .api import analyze, from_string
+
     grid = from_string(_read_grid_arg(ns))
     data = analyze(grid)
     if ns.json:
@@ -124,46 +169,105 @@ def cmd_check(ns: argparse.Namespace) -> int:
 
 
 def cmd_convert(ns: argparse.Namespace) -> int:
+    from .formats import GridWriter, detect_format, iter_grids
+
     infmt = ns.in_format or detect_format(ns.in_path)
     outfmt = ns.out_format or detect_format(ns.out_path)
-    grids = read_grids(ns.in_path, infmt)
-    write_grids(ns.out_path, grids, outfmt)
-    print(f"# converted {len(grids)} grids {infmt} → {outfmt}", file=sys.stderr)
+    with GridWriter(ns.out_path, outfmt, compresslevel=ns.compress_level) as writer:
+        writer.write_many(iter_grids(ns.in_path, infmt))
+    print(f"# converted {writer.count} grids {infmt} → {outfmt}", file=sys.stderr)
     return 0
 
 
+def _write_cnf(grid: Grid, outp: pathlib.Path, ns: argparse.Namespace) -> None:
+    import json
+
+    from .crosscheck import cnf_dimacs_lines, simplify_cnf
+
+    if ns.simplify or ns.singles:
+        enc = simplify_cnf(grid, singles=ns.singles)
+        lines = enc.dimacs_lines()
+        mapping = outp.with_name(outp.name + ".map.json")
+        mapping.write_text(json.dumps(enc.mapping(), separators=(",", ":")) + "\n", encoding="utf-8")
+    else:
+        lines = cnf_dimacs_lines(grid)
+    with outp.open("w", encoding="utf-8") as handle:
+        handle.write("\n".join(lines))
+        handle.write("\n")
+
+
 def cmd_to_cnf(ns: argparse.Namespace) -> int:
-    grid = from_string(_read_grid_arg(ns))
+    import pathlib
+
+    from .api import from_string
+    from .formats import iter_grids
+
     outp = pathlib.Path(ns.out_path)
+    if ns.in_path:
+        # batch: one DIMACS file per puzzle (and map when simplified) in the --out directory
+        outp.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for s in iter_grids(ns.in_path, ns.in_format):
+            written += 1
+            _write_cnf(from_string(s), outp / f"{written:06d}.cnf", ns)
+        print(f"# wrote {written} CNF files to {outp}", file=sys.stderr)
+        return 0
+    grid = from_string(_read_grid_arg(ns))
     outp.parent.mkdir(parents=True, exist_ok=True)
-    with outp.open("w", encoding="utf-8") as handle:
-        for line in cnf_dimacs_lines(grid):
-            handle.write(line)
-            if not line.endswith("\n"):
-                handle.write("\n")
+    _write_cnf(grid, outp, ns)
     return 0
 
 
 def cmd_explain_file(ns: argparse.Namespace) -> int:
-    inp = pathlib.Path(ns.in_path)
-    outp = pathlib.Path(ns.out_path)
-    grids = read_grids(str(inp), ns.in_format)
-    outp.parent.mkdir(parents=True, exist_ok=True)
+    import json
+
+    from .api import from_string
+    from .explain import explain
+    from .formats import iter_grids, open_path
+    from .strategies import StrategyProfile
+
+    outp = ns.out_path
     written = 0
-    with outp.open("w", encoding="utf-8") as handle:
-        for s in grids:
+    profile = StrategyProfile() if ns.strategy_profile else None
+    with open_path(outp, "w", compresslevel=ns.compress_level) as handle:
+        for s in iter_grids(ns.in_path, ns.in_format, shard=ns.shard):
             grid = from_string(s)
-            data = explain(grid, max_steps=ns.max_steps)
+            data = explain(
+                grid,
+                max_steps=ns.max_steps,
+                bulk_singles=ns.bulk_singles,
+                profile=profile if profile is not None else False,
+                techniques=ns.techniques,
+                upto=ns.upto,
+            )
+            data.pop("profile", None)  # aggregated below, not repeated per record
             obj = {"grid": s, **data}
             handle.write(json.dumps(obj, separators=(",", ":"), sort_keys=True) + "\n")
             written += 1
     print(f"# wrote {written} explanations to {outp}", file=sys.stderr)
+    if profile is not None:
+        print(profile.report(), file=sys.stderr)
     return 0
 
 
 def cmd_explain(ns: argparse.Namespace) -> int:
+    import json
+
+    from .api import from_string
+    from .explain import explain
+    from .strategies import StrategyProfile
+
     grid = from_string(_read_grid_arg(ns))
-    data = explain(grid, max_steps=ns.max_steps)
+    profile = StrategyProfile() if ns.strategy_profile else None
+    data = explain(
+        grid,
+        max_steps=ns.max_steps,
+        bulk_singles=ns.bulk_singles,
+        profile=profile if profile is not None else False,
+        techniques=ns.techniques,
+        upto=ns.upto,
+        solution=ns.json,  # the text report does not print it
+    )
     if ns.json:
         print(json.dumps(data, separators=(",", ":"), sort_keys=True))
     else:
@@ -171,10 +275,15 @@ def cmd_explain(ns: argparse.Namespace) -> int:
         for i, step in enumerate(data["steps"], 1):
             print(f"{i:03d}. {step['strategy']}: {step}")
         print(f"solved: {data['solved']}  steps: {len(data['steps'])}")
+        if profile is not None:
+            print(profile.report())
     return 0
 
 
 def cmd_gen(ns: argparse.Namespace) -> int:
+    from .api import to_string
+    from .generate import generate
+
     grid = generate(
         seed=ns.seed,
         target_givens=ns.givens,
@@ -189,6 +298,9 @@ def cmd_gen(ns: argparse.Namespace) -> int:
 
 
 def cmd_canon(ns: argparse.Namespace) -> int:
+    from .api import from_string
+    from .canonical import canonical_form
+
     grid = from_string(_read_grid_arg(ns))
     print(canonical_form(grid))
     return 0
@@ -198,15 +310,23 @@ def cmd_gen_batch(ns: argparse.Namespace) -> int:
     """
     Generate many canonicalized, unique puzzles quickly.
     """
+    import pathlib, random
+
+    from .formats import GridWriter
+    from .profiling import worker_pool
+
     outp = pathlib.Path(ns.out)
     seen: set[str] = set()
     uniq: list[str] = []
 
     base_seed = ns.seed if ns.seed is not None else random.randrange(2**31 - 1)
+    # shard k of n owns seed offsets k, k+n, k+2n, ... so shards never overlap
+    shard_index, shard_count = ns.shard or (0, 1)
     if ns.parallel <= 1:
         i = 0
         while len(uniq) < ns.count:
-            args = (base_seed + i, ns.givens, ns.minimal, ns.symmetry, ns.min_givens, ns.max_givens)
+            seed = base_seed + i * shard_count + shard_index
+            args = (seed, ns.givens, ns.minimal, ns.symmetry, ns.min_givens, ns.max_givens)
             i += 1
             c = _gen_batch_worker(args)
             if c in seen:
@@ -214,12 +334,12 @@ def cmd_gen_batch(ns: argparse.Namespace) -> int:
             seen.add(c)
             uniq.append(c)
     else:
-        with mp.Pool(processes=ns.parallel) as pool:
+        with worker_pool(ns.parallel) as pool:
             i = 0
             # produce candidates until we reach count
             while len(uniq) < ns.count:
                 batch_n = max(4 * ns.parallel, ns.count - len(uniq))
-                seeds = [base_seed + j for j in range(i, i + batch_n)]
+                seeds = [base_seed + j * shard_count + shard_index for j in range(i, i + batch_n)]
                 i += batch_n
                 args_iter = [
                     (seed, ns.givens, ns.minimal, ns.symmetry, ns.min_givens, ns.max_givens)
@@ -232,81 +352,209 @@ def cmd_gen_batch(ns: argparse.Namespace) -> int:
                     uniq.append(c)
                     if len(uniq) >= ns.count:
                         break
-    outp.parent.mkdir(parents=True, exist_ok=True)
-    with outp.open("w", encoding="utf-8") as f:
-        for u in uniq:
-            f.write(u + "\n")
+    with GridWriter(str(outp), compresslevel=ns.compress_level) as writer:
+        writer.write_many(uniq)
     print(f"# generated: {len(uniq)}", file=sys.stderr)
     return 0
 
 def cmd_rate_file(ns: argparse.Namespace) -> int:
-    inp = pathlib.Path(ns.in_path)
-    rows: list[tuple[str, float]] = []
-    with inp.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            s = "".join(ch for ch in line.strip() if not ch.isspace())
-            if not s:
-                continue
-            score = rate(from_string(s))
-            rows.append((s, score))
+    import csv, json
+
+    from .api import from_string
+    from .formats import iter_grids, open_path
+    from .rating import rate
+
+    csv_handle = open_path(ns.csv_path, "w", newline="") if ns.csv_path else None
+    writer = csv.writer(csv_handle) if csv_handle is not None else None
+    try:
+        if writer is not None:
+            writer.writerow(["grid", "score"])
+        for s in iter_grids(ns.in_path, ns.in_format, shard=ns.shard):
+            score = rate(from_string(s), method=ns.method)
+            if writer is not None:
+                writer.writerow((s, score))
             if ns.json:
                 print(json.dumps({"grid": s, "score": round(score, 1)}, separators=(",", ":")))
             else:
                 print(f"{score:.1f}")
-    if ns.csv_path:
-        with open(ns.csv_path, "w", newline="", encoding="utf-8") as csv_handle:
-            writer = csv.writer(csv_handle)
-            writer.writerow(["grid", "score"])
-            writer.writerows(rows)
+    finally:
+        if csv_handle is not None:
+            csv_handle.close()
+    return 0
+
+
+_LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+
+
+def _latency_record(engine: str, ms: list[float]) -> dict:
+    import bisect
+    from statistics import mean
+
+    from .metrics import _percentile
+
+    counts = [0] * (len(_LATENCY_BUCKETS_MS) + 1)
+    for x in ms:
+        counts[bisect.bisect_left(_LATENCY_BUCKETS_MS, x)] += 1
+    xs = sorted(ms)
+    return {
+        "type": "latency",
+        "engine": engine,
+        "n": len(xs),
+        "mean_ms": round(mean(xs), 4) if xs else 0.0,
+        "p50_ms": round(_percentile(xs, 0.50), 4),
+        "p90_ms": round(_percentile(xs, 0.90), 4),
+        "p99_ms": round(_percentile(xs, 0.99), 4),
+        "max_ms": round(xs[-1], 4) if xs else 0.0,
+        "histogram": {"le_ms": [*_LATENCY_BUCKETS_MS, None], "counts": counts},
+    }
+
+
+def cmd_crosscheck_file(ns: argparse.Namespace) -> int:
+    import json
+
+    from .crosscheck import available_engines, resolve_engine
+    from .formats import iter_grids, open_path
+    from .profiling import worker_pool
+
+    available = available_engines()
+    engines = tuple(ns.engines) if ns.engines else tuple(available)
+    missing = []
+    for e in engines:
+        if e in available:
+            continue
+        try:
+            if ":" not in e:
+                raise ValueError(e)
+            resolve_engine(e)
+        except ValueError:
+            missing.append(e)
+    if missing:
+        print(f"# crosscheck-file: engine(s) unavailable: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    if len(engines) < 2:
+        print("# crosscheck-file: need at least two engines to compare", file=sys.stderr)
+        return 2
+    latencies: dict[str, list[float]] = {e: [] for e in engines}
+    kinds: dict[str, int] = {}
+    checked = 0
+    jobs = ((s, engines) for s in iter_grids(ns.in_path, ns.in_format, shard=ns.shard))
+    pool = worker_pool(ns.parallel) if ns.parallel > 1 else None
+    try:
+        results = pool.imap(_crosscheck_worker, jobs, chunksize=64) if pool else map(_crosscheck_worker, jobs)
+        with open_path(ns.out_path, "w", compresslevel=ns.compress_level) as handle:
+            for s, res in results:
+                checked += 1
+                for name, r in res["engines"].items():
+                    latencies[name].append(r["ms"])
+                kind = res["mismatch"]
+                if kind is not None:
+                    kinds[kind] = kinds.get(kind, 0) + 1
+                    engines_out = {
+                        name: {"solution": r["solution"], "count": r["count"]}
+                        for name, r in res["engines"].items()
+                    }
+                    rec = {
+                        "type": "mismatch",
+                        "index": checked - 1,
+                        "grid": s,
+                        "kind": kind,
+                        "engines": engines_out,
+                    }
+                    handle.write(json.dumps(rec, separators=(",", ":"), sort_keys=True) + "\n")
+            for name in engines:
+                handle.write(json.dumps(_latency_record(name, latencies[name]), separators=(",", ":")) + "\n")
+            mismatches = sum(kinds.values())
+            summary = {
+                "type": "summary",
+                "puzzles": checked,
+                "engines": list(engines),
+                "mismatches": mismatches,
+                "kinds": kinds,
+            }
+            handle.write(json.dumps(summary, separators=(",", ":"), sort_keys=True) + "\n")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    print(
+        f"# crosscheck: {checked} puzzles · engines {','.join(engines)} · mismatches {mismatches}",
+        file=sys.stderr,
+    )
+    return 1 if mismatches else 0
+
+
+def _comma_list(text: str) -> list[str]:
+    return [t.strip() for t in text.split(",") if t.strip()]
+
+
+def cmd_bench(ns: argparse.Namespace) -> int:
+    import json, pathlib
+
+    from .bench import MEM_OPS, OPS, TIERS, compare, run_benchmarks, run_memory_benchmarks
+
+    known_ops = MEM_OPS if ns.memory else tuple(OPS)
+    tiers = ns.tiers or list(TIERS)
+    ops = ns.ops or list(known_ops)
+    bad = [t for t in tiers if t not in TIERS] + [o for o in ops if o not in known_ops]
+    if bad:
+        print(f"# bench: unknown tier/op: {', '.join(bad)}", file=sys.stderr)
+        return 2
+    metric = ns.metric or ("peak_kib_max" if ns.memory else "p50_ms")
+    progress = None if ns.quiet else (lambda line: print(f"# {line}", file=sys.stderr))
+    if ns.memory:
+        data = run_memory_benchmarks(tiers, ops, limit=ns.limit, progress=progress)
+    else:
+        data = run_benchmarks(tiers, ops, limit=ns.limit, repeat=ns.repeat, progress=progress)
+    text = json.dumps(data, indent=2, sort_keys=True)
+    if ns.out_path:
+        outp = pathlib.Path(ns.out_path)
+        outp.parent.mkdir(parents=True, exist_ok=True)
+        outp.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if ns.baseline:
+        baseline = json.loads(pathlib.Path(ns.baseline).read_text(encoding="utf-8"))
+        regressions = compare(data, baseline, threshold=ns.threshold, metric=metric)
+        for reg in regressions:
+            print(
+                f"# REGRESSION {reg['key']}: {reg['metric']} {reg['baseline']} -> {reg['current']}"
+                f" (+{reg['change'] * 100:.1f}%)",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+        print(f"# bench: no regressions beyond {ns.threshold * 100:.0f}% ({metric})", file=sys.stderr)
     return 0
 
 
-def _percentile(xs: list[float], p: float) -> float:
-    if not xs:
-        return 0.0
-    xs = sorted(xs)
-    k = (len(xs) - 1) * p
-    f = int(k)
-    c = min(f + 1, len(xs) - 1)
-    if f == c:
-        return xs[f]
-    return xs[f] + (xs[c] - xs[f]) * (k - f)
+def cmd_serve(ns: argparse.Namespace) -> int:
+    from .serve import serve
+
+    serve(ns.host, ns.port, workers=ns.workers, budget_ms=ns.budget_ms, max_batch=ns.max_batch)
+    return 0
 
 
 def cmd_stats_file(ns: argparse.Namespace) -> int:
-    inp = pathlib.Path(ns.in_path)
+    import csv, json, pathlib, random, time
+    from statistics import mean
+
+    from .api import analyze, from_string
+    from .formats import iter_grids
+    from .metrics import _percentile
+
     processed = 0
     n_valid = n_solvable = n_unique = 0
     givens: list[int] = []
     diffs: list[float] = []
     ms_list: list[float] = []
     t0 = time.perf_counter()
-    # reservoir sample if requested
-    sample_k = ns.sample if ns.sample and ns.sample > 0 else 0
-    rng = random.Random(1337)
-    lines: list[str] = []
-    with inp.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            s = "".join(ch for ch in line.strip() if not ch.isspace())
-            if not s:
-                continue
-            if ns.limit and processed >= ns.limit:
-                break
-            processed += 1
-            if sample_k == 0:
-                lines.append(s)
-            else:
-                if len(lines) < sample_k:
-                    lines.append(s)
-                else:
-                    j = rng.randrange(1, processed + 1)
-                    if j <= sample_k:
-                        lines[j - 1] = s
-    for s in lines:
+
+    def tally(s: str) -> None:
+        nonlocal n_valid, n_solvable, n_unique
         try:
             grid = from_string(s)
         except Exception:
-            continue
+            return  # counted as a row, but neither valid nor analyzed
         data = analyze(grid)
         if data["valid"]:
             n_valid += 1
@@ -317,15 +565,38 @@ def cmd_stats_file(ns: argparse.Namespace) -> int:
         givens.append(int(data["givens"]))
         diffs.append(float(data["difficulty"]))
         ms_list.append(float(data["stats"]["ms"]))
-    if len(lines) == 0:
+
+    # without --sample every row is analyzed as it streams by; with it, a reservoir sample is
+    # kept and analyzed at the end. Malformed txt rows are kept so they still count.
+    sample_k = ns.sample if ns.sample and ns.sample > 0 else 0
+    rng = random.Random(1337)
+    lines: list[str] = []
+    rows = iter_grids(ns.in_path, ns.in_format, strict=False, shard=ns.shard, keep_malformed=True)
+    for s in rows:
+        if ns.limit and processed >= ns.limit:
+            break
+        processed += 1
+        if sample_k == 0:
+            tally(s)
+        elif len(lines) < sample_k:
+            lines.append(s)
+        else:
+            j = rng.randrange(1, processed + 1)
+            if j <= sample_k:
+                lines[j - 1] = s
+    for s in lines:
+        tally(s)
+    count = len(lines) if sample_k else processed
+    if count == 0:
         print("no puzzles read", file=sys.stderr)
         return 2
     elapsed = (time.perf_counter() - t0) * 1000.0
+    diffs.sort()
     report = {
-        "count": len(lines),
-        "valid_pct": round(100.0 * n_valid / len(lines), 2),
-        "solvable_pct": round(100.0 * n_solvable / len(lines), 2),
-        "unique_pct": round(100.0 * n_unique / len(lines), 2),
+        "count": count,
+        "valid_pct": round(100.0 * n_valid / count, 2),
+        "solvable_pct": round(100.0 * n_solvable / count, 2),
+        "unique_pct": round(100.0 * n_unique / count, 2),
         "givens_mean": round(mean(givens), 2),
         "givens_min": min(givens),
         "givens_max": max(givens),
@@ -367,37 +638,154 @@ def cmd_stats_file(ns: argparse.Namespace) -> int:
                 )
     return 0
 
+def _dedupe_prefiltered(grids: Iterable[str], *, keep_original: bool = False) -> Iterator[str]:
+    """
+    Yield one puzzle per isomorphism class as ``grids`` streams in: its canonical
+    form, or with ``keep_original`` the first original seen.
+
+    A puzzle whose invariant fingerprint is new is unique without further work;
+    canonical forms are only compared when fingerprints collide (and computed for
+    every kept puzzle unless ``keep_original``). Unparsable rows are skipped.
+    """
+    from .api import from_string, to_string
+    from .canonical import canonical_form, invariant_fingerprint
+
+    # fingerprint -> [[grid, canonical or None], ...] of kept puzzles
+    buckets: dict[tuple, list[list]] = {}
+    for s in grids:
+        try:
+            grid = from_string(s)
+        except Exception:
+            continue
+        fp = invariant_fingerprint(grid)
+        bucket = buckets.get(fp)
+        if bucket is None:
+            canon = None if keep_original else canonical_form(grid)
+            buckets[fp] = [[grid, canon]]
+            yield to_string(grid) if canon is None else canon
+            continue
+        canon = canonical_form(grid)
+        duplicate = False
+        for entry in bucket:
+            if entry[1] is None:
+                entry[1] = canonical_form(entry[0])
+            if entry[1] == canon:
+                duplicate = True
+                break
+        if not duplicate:
+            bucket.append([grid, canon])
+            yield to_string(grid) if keep_original else canon
+
+
 def cmd_dedupe(ns: argparse.Namespace) -> int:
-    inp = pathlib.Path(ns.in_path)
-    outp = pathlib.Path(ns.out_path)
-    seen: set[str] = set()
-    uniq: list[str] = []
-    with inp.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            s = "".join(ch for ch in line.strip() if not ch.isspace())
-            if not s:
-                continue
-            try:
-                grid = from_string(s)
-            except Exception:
-                continue
-            canon = canonical_form(grid)
-            if canon not in seen:
-                seen.add(canon)
-                uniq.append(canon)
-    outp.parent.mkdir(parents=True, exist_ok=True)
-    with outp.open("w", encoding="utf-8") as handle:
-        for value in uniq:
-            handle.write(value + "\n")
-    print(f"# unique: {len(uniq)}", file=sys.stderr)
+    from .formats import GridWriter, iter_grids
+
+    grids = iter_grids(ns.in_path, ns.in_format, strict=False, shard=ns.shard)
+    with GridWriter(ns.out_path, compresslevel=ns.compress_level) as writer:
+        writer.write_many(_dedupe_prefiltered(grids, keep_original=ns.keep_original))
+    print(f"# unique: {writer.count}", file=sys.stderr)
     return 0
 
 
-def main(argv: Optional[list[str]] = None) -> int:
+def _parse_shard(text: str) -> tuple[int, int]:
+    """argparse type for INDEX/COUNT, e.g. 0/4."""
+    try:
+        index_s, count_s = text.split("/")
+        index, count = int(index_s), int(count_s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, got {text!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in [0, {count}), got {text!r}")
+    return index, count
+
+
+def _parse_techniques(text: str) -> list[str]:
+    from .strategies import resolve_ladder
+
+    names = [t.strip() for t in text.split(",") if t.strip()]
+    try:
+        resolve_ladder(names)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+    return names
+
+
+def _parse_upto(text: str) -> str:
+    # validated here rather than with ``choices`` so building the parser never loads strategies
+    from .strategies import LADDER, TECHNIQUE_GROUPS
+
+    if text not in LADDER and text not in TECHNIQUE_GROUPS:
+        choices = ", ".join([*LADDER, *TECHNIQUE_GROUPS])
+        raise argparse.ArgumentTypeError(f"invalid choice: {text!r} (choose from {choices})")
+    return text
+
+
+def _add_ladder(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--techniques",
+        type=_parse_techniques,
+        default=None,
+        metavar="LIST",
+        help="comma-separated strategies/groups in priority order (e.g. singles,locked_candidates)",
+    )
+    p.add_argument(
+        "--upto",
+        type=_parse_upto,
+        default=None,
+        metavar="NAME",
+        help="stop the ladder after this technique or group",
+    )
+
+
+def _add_rate_method(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--method",
+        choices=["dlx", "strategies"],
+        default="dlx",
+        help="dlx: search effort (canonicalized); strategies: hardest human technique needed (fast)",
+    )
+
+
+def _add_shard(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--shard",
+        type=_parse_shard,
+        default=None,
+        metavar="INDEX/COUNT",
+        help="process only slice INDEX of COUNT (e.g. 0/4) of the input or seed space",
+    )
+
+
+def _add_compress_level(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--compress-level",
+        dest="compress_level",
+        type=int,
+        default=None,
+        help="compression level when --out ends in .gz/.bz2/.xz (codec default if omitted)",
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         prog="sudoku-dlx",
         description="Sudoku DLX: solve, rate, and generate puzzles.",
     )
+    parser.add_argument(
+        "--profile",
+        dest="profile_path",
+        default=None,
+        metavar="PATH",
+        help="cProfile the command (and --parallel workers, merged) and write pstats to PATH",
+    )
+    parser.add_argument(
+        "--profile-top",
+        dest="profile_top",
+        type=int,
+        default=0,
+        metavar="N",
+        help="print the N most expensive calls by cumulative time to stderr (implies profiling)",
+    )
     sub = parser.add_subparsers(dest="cmd")
 
     solve_parser = sub.add_parser("solve", help="solve a puzzle")
@@ -406,12 +794,24 @@ def main(argv: Optional[list[str]] = None) -> int:
     solve_parser.add_argument("--pretty", action="store_true", help="print 9x9 grid format")
     solve_parser.add_argument("--stats", action="store_true", help="print timing & node stats to stderr")
     solve_parser.add_argument("--trace", help="write a solution-reveal trace JSON to this path")
+    solve_parser.add_argument(
+        "--trace-kind",
+        choices=["reveal", "dlx"],
+        default="reveal",
+        help="reveal: row-major fill JSON (visualizer); dlx: the real search as NDJSON",
+    )
+    solve_parser.add_argument("--trace-sample", type=int, default=1, help="dlx trace: keep every Nth event")
+    solve_parser.add_argument("--trace-max-depth", type=int, default=None, help="dlx trace: drop deeper events")
+    solve_parser.add_argument(
+        "--trace-max-events", type=int, default=100_000, help="dlx trace: stop writing after N events (0 = no cap)"
+    )
     solve_parser.add_argument("--crosscheck", choices=["sat"], help="verify solution with external solver")
     solve_parser.set_defaults(func=cmd_solve)
 
     rate_parser = sub.add_parser("rate", help="estimate difficulty in [0,10]")
     rate_parser.add_argument("--grid", help="81-char string; 0/./- for blanks")
     rate_parser.add_argument("--file", help="path to a file with 9 lines of 9 chars")
+    _add_rate_method(rate_parser)
     rate_parser.set_defaults(func=cmd_rate)
 
     check_parser = sub.add_parser(
@@ -422,24 +822,50 @@ def main(argv: Optional[list[str]] = None) -> int:
     check_parser.add_argument("--json", action="store_true", help="output JSON")
     check_parser.set_defaults(func=cmd_check)
 
-    convert_parser = sub.add_parser("convert", help="convert between txt/csv/jsonl formats")
+    convert_parser = sub.add_parser("convert", help="convert between txt/csv/jsonl/bin formats")
     convert_parser.add_argument("--in", dest="in_path", required=True)
     convert_parser.add_argument("--out", dest="out_path", required=True)
-    convert_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl"])
-    convert_parser.add_argument("--out-format", dest="out_format", choices=["txt", "csv", "jsonl"])
+    convert_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl", "bin"])
+    convert_parser.add_argument("--out-format", dest="out_format", choices=["txt", "csv", "jsonl", "bin"])
+    _add_compress_level(convert_parser)
     convert_parser.set_defaults(func=cmd_convert)
 
-    tocnf_parser = sub.add_parser("to-cnf", help="export one puzzle to DIMACS CNF")
+    tocnf_parser = sub.add_parser("to-cnf", help="export puzzles to DIMACS CNF")
     tocnf_parser.add_argument("--grid", help="81-char string; 0/./- for blanks")
     tocnf_parser.add_argument("--file", help="path to a file with 9 lines of 9 chars")
+    tocnf_parser.add_argument(
+        "--in", dest="in_path", help="puzzle file; writes one CNF per puzzle into --out (a directory)"
+    )
+    tocnf_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl", "bin"])
     tocnf_parser.add_argument("--out", dest="out_path", required=True)
+    tocnf_parser.add_argument(
+        "--simplify",
+        action="store_true",
+        help="propagate givens, drop decided clauses/literals, renumber variables (writes OUT.map.json)",
+    )
+    tocnf_parser.add_argument(
+        "--singles",
+        action="store_true",
+        help="also place naked/hidden singles before encoding (implies --simplify)",
+    )
     tocnf_parser.set_defaults(func=cmd_to_cnf)
 
     explainf_parser = sub.add_parser("explain-file", help="explain many puzzles into NDJSON")
     explainf_parser.add_argument("--in", dest="in_path", required=True)
     explainf_parser.add_argument("--out", dest="out_path", required=True)
-    explainf_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl"])
+    explainf_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl", "bin"])
     explainf_parser.add_argument("--max-steps", type=int, default=200)
+    explainf_parser.add_argument(
+        "--bulk-singles", action="store_true", help="place all singles per round as one batch step"
+    )
+    _add_ladder(explainf_parser)
+    explainf_parser.add_argument(
+        "--strategy-profile",
+        action="store_true",
+        help="count calls/hits/time/open candidates per strategy and print a report",
+    )
+    _add_compress_level(explainf_parser)
+    _add_shard(explainf_parser)
     explainf_parser.set_defaults(func=cmd_explain_file)
 
     explain_parser = sub.add_parser(
@@ -449,6 +875,15 @@ def main(argv: Optional[list[str]] = None) -> int:
     explain_parser.add_argument("--file", help="path to a file with 9 lines of 9 chars")
     explain_parser.add_argument("--json", action="store_true")
     explain_parser.add_argument("--max-steps", type=int, default=200)
+    explain_parser.add_argument(
+        "--bulk-singles", action="store_true", help="place all singles per round as one batch step"
+    )
+    _add_ladder(explain_parser)
+    explain_parser.add_argument(
+        "--strategy-profile",
+        action="store_true",
+        help="count calls/hits/time/open candidates per strategy and print a report",
+    )
     explain_parser.set_defaults(func=cmd_explain)
 
     canon_parser = sub.add_parser(
@@ -468,6 +903,14 @@ def main(argv: Optional[list[str]] = None) -> int:
     dedupe_parser.add_argument(
         "--out", dest="out_path", required=True, help="output file for unique canonical grids"
     )
+    dedupe_parser.add_argument(
+        "--keep-original",
+        action="store_true",
+        help="write the first original of each class; only fingerprint collisions are canonicalized",
+    )
+    dedupe_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl", "bin"])
+    _add_compress_level(dedupe_parser)
+    _add_shard(dedupe_parser)
     dedupe_parser.set_defaults(func=cmd_dedupe)
 
     genb_parser = sub.add_parser("gen-batch", help="generate N unique puzzles to a file")
@@ -482,14 +925,88 @@ def main(argv: Optional[list[str]] = None) -> int:
     genb_parser.add_argument("--min-givens", type=int, default=0, help="keep only puzzles with >= this many givens")
     genb_parser.add_argument("--max-givens", type=int, default=81, help="keep only puzzles with <= this many givens")
     genb_parser.add_argument("--parallel", type=int, default=1, help="processes for generation (default 1)")
+    _add_compress_level(genb_parser)
+    _add_shard(genb_parser)
     genb_parser.set_defaults(func=cmd_gen_batch)
 
+    bench_parser = sub.add_parser(
+        "bench", help="run the built-in benchmark suite (JSON results, optional baseline gate)"
+    )
+    bench_parser.add_argument(
+        "--tiers", type=_comma_list, default=None, help="easy,medium,hard,minimal (default: all)"
+    )
+    bench_parser.add_argument(
+        "--ops",
+        type=_comma_list,
+        default=None,
+        help="solve,count,canonical,rate,explain,generate (default: all)",
+    )
+    bench_parser.add_argument("--limit", type=int, default=10, help="puzzles per tier (0 = whole corpus)")
+    bench_parser.add_argument("--repeat", type=int, default=1, help="passes over each tier")
+    bench_parser.add_argument("--out", dest="out_path", help="write JSON here instead of stdout")
+    bench_parser.add_argument("--baseline", help="results JSON to compare against; exit 1 on regression")
+    bench_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="allowed slowdown vs baseline (default 0.10 = 10%%)"
+    )
+    bench_parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="trace allocations instead of timing (ops: count,canonical,rate,explain,read_grids,iter_grids,gen_batch)",
+    )
+    bench_parser.add_argument(
+        "--metric",
+        choices=["p50_ms", "p95_ms", "p99_ms", "peak_kib_max", "peak_kib_p50", "retained_kib_per_call"],
+        default=None,
+        help="value compared against --baseline (default p50_ms, or peak_kib_max with --memory)",
+    )
+    bench_parser.add_argument("--quiet", action="store_true", help="no per-benchmark progress on stderr")
+    bench_parser.set_defaults(func=cmd_bench)
+
+    serve_parser = sub.add_parser(
+        "serve", help="HTTP/JSON solver service backed by a warm worker pool"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: CPU count; 0 = in-process)"
+    )
+    serve_parser.add_argument("--budget-ms", type=int, default=10_000, help="per-request time budget (504 beyond)")
+    serve_parser.add_argument("--max-batch", type=int, default=256, help="most requests accepted by /batch")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    xcheck_parser = sub.add_parser(
+        "crosscheck-file", help="differential check of solver engines over a file (exit 1 on mismatch)"
+    )
+    xcheck_parser.add_argument("--in", dest="in_path", required=True)
+    xcheck_parser.add_argument(
+        "--out", dest="out_path", required=True, help="NDJSON: mismatches, per-engine latency, summary"
+    )
+    xcheck_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl", "bin"])
+    xcheck_parser.add_argument(
+        "--engines",
+        type=lambda text: [e.strip() for e in text.split(",") if e.strip()],
+        default=None,
+        metavar="LIST",
+        help=(
+            "comma-separated engines to compare (default: all available, e.g. dlx,sat); "
+            "module:function paths are imported, engines added with register_engine() "
+            "are only seen in-process"
+        ),
+    )
+    xcheck_parser.add_argument("--parallel", type=int, default=1, help="worker processes (default 1)")
+    _add_compress_level(xcheck_parser)
+    _add_shard(xcheck_parser)
+    xcheck_parser.set_defaults(func=cmd_crosscheck_file)
+
     ratef_parser = sub.add_parser("rate-file", help="rate each puzzle in a file")
     ratef_parser.add_argument("--in", dest="in_path", required=True)
     ratef_parser.add_argument(
         "--csv", dest="csv_path", help="optional CSV output path"
     )
     ratef_parser.add_argument("--json", action="store_true", help="print one JSON object per line to stdout")
+    ratef_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl", "bin"])
+    _add_rate_method(ratef_parser)
+    _add_shard(ratef_parser)
     ratef_parser.set_defaults(func=cmd_rate_file)
 
     stats_parser = sub.add_parser("stats-file", help="summarize a file of puzzles")
@@ -505,6 +1022,8 @@ def main(argv: Optional[list[str]] = None) -> int:
     )
     stats_parser.add_argument("--limit", type=int, default=0, help="process at most N lines (0 = no limit)")
     stats_parser.add_argument("--sample", type=int, default=0, help="reservoir sample K lines (0 = no sampling)")
+    stats_parser.add_argument("--in-format", dest="in_format", choices=["txt", "csv", "jsonl", "bin"])
+    _add_shard(stats_parser)
     stats_parser.set_defaults(func=cmd_stats_file)
 
     gen_parser = sub.add_parser("gen", help="generate a puzzle")
@@ -528,6 +1047,13 @@ def main(argv: Optional[list[str]] = None) -> int:
     if not hasattr(args, "func"):
         parser.print_help()
         return 2
+    if args.profile_path or args.profile_top:
+        if args.profile_top < 0:
+            parser.error("--profile-top must be >= 0")
+        from .profiling import Profiler
+
+        with Profiler(args.profile_path, top=args.profile_top):
+            return args.func(args)
     return args.func(args)
 
 
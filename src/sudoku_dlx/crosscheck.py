@@ -1,11 +1,33 @@
 from __future__ import annotations
 
-"""SAT cross-check utilities using python-sat (optional extra)."""
+"""SAT cross-check utilities using python-sat (optional extra).
 
-from typing import Iterable, List, Optional
+The grid-independent Sudoku clauses are built once (:func:`_base_cnf`); puzzles
+only add their givens. :class:`SatSolver` keeps one incremental Minisat22
+instance loaded with the base CNF and passes the givens as assumptions, so it
+can be reused for any number of puzzles (batch cross-checks, uniqueness counts).
+
+:func:`simplify_cnf` propagates the givens (optionally singles too) into the base
+CNF and renumbers the surviving variables densely for compact DIMACS exports.
+
+:func:`crosscheck_grid` runs engines (``dlx``, ``sat``, any added with
+:func:`register_engine`, or a ``"module:function"`` import path) on one grid and
+classifies disagreements.
+"""
+
+import importlib
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .strategies import CandidateState, apply_all_singles
 
 Grid = List[List[int]]
 
+_NUM_VARS = 9 * 9 * 9
+
 
 def _var(r: int, c: int, d: int) -> int:
     """Map (row, col, digit) triples to CNF variables in [1, 729]."""
@@ -13,86 +35,388 @@ def _var(r: int, c: int, d: int) -> int:
     return r * 81 + c * 9 + d + 1
 
 
-def _encode_cnf(grid: Grid) -> list[list[int]]:
-    cnf: list[list[int]] = []
+def _exactly_one(lits: List[int]) -> List[Tuple[int, ...]]:
+    return [tuple(lits)] + [(-a, -b) for a, b in combinations(lits, 2)]
+
+
+@lru_cache(maxsize=None)
+def _base_cnf() -> Tuple[Tuple[int, ...], ...]:
+    """The 11,988 grid-independent clauses (built on first use, then shared)."""
+    cnf: List[Tuple[int, ...]] = []
     # 1) Each cell has at least one digit
-    for r in range(9):
-        for c in range(9):
-            cnf.append([_var(r, c, d) for d in range(9)])
+    cnf.extend(tuple(_var(r, c, d) for d in range(9)) for r in range(9) for c in range(9))
     # 2) Each cell has at most one digit
     for r in range(9):
         for c in range(9):
-            for d1 in range(9):
-                for d2 in range(d1 + 1, 9):
-                    cnf.append([-_var(r, c, d1), -_var(r, c, d2)])
-    # 3) Rows: each digit appears exactly once
+            cnf.extend((-a, -b) for a, b in combinations([_var(r, c, d) for d in range(9)], 2))
+    # 3) Rows / 4) columns / 5) boxes: each digit appears exactly once
     for r in range(9):
         for d in range(9):
-            cnf.append([_var(r, c, d) for c in range(9)])
-            for c1 in range(9):
-                for c2 in range(c1 + 1, 9):
-                    cnf.append([-_var(r, c1, d), -_var(r, c2, d)])
-    # 4) Columns: each digit appears exactly once
+            cnf.extend(_exactly_one([_var(r, c, d) for c in range(9)]))
     for c in range(9):
         for d in range(9):
-            cnf.append([_var(r, c, d) for r in range(9)])
-            for r1 in range(9):
-                for r2 in range(r1 + 1, 9):
-                    cnf.append([-_var(r1, c, d), -_var(r2, c, d)])
-    # 5) Boxes: each digit appears exactly once
+            cnf.extend(_exactly_one([_var(r, c, d) for r in range(9)]))
     for br in range(0, 9, 3):
         for bc in range(0, 9, 3):
             cells = [(r, c) for r in range(br, br + 3) for c in range(bc, bc + 3)]
             for d in range(9):
-                cnf.append([_var(r, c, d) for (r, c) in cells])
-                for i in range(9):
-                    for j in range(i + 1, 9):
-                        r1, c1 = cells[i]
-                        r2, c2 = cells[j]
-                        cnf.append([-_var(r1, c1, d), -_var(r2, c2, d)])
+                cnf.extend(_exactly_one([_var(r, c, d) for (r, c) in cells]))
+    return tuple(cnf)
+
+
+def _given_literals(grid: Grid) -> List[int]:
+    return [_var(r, c, grid[r][c] - 1) for r in range(9) for c in range(9) if grid[r][c]]
+
+
+def _encode_cnf(grid: Grid) -> list[list[int]]:
+    cnf = [list(clause) for clause in _base_cnf()]
     # 6) Givens
+    cnf.extend([lit] for lit in _given_literals(grid))
+    return cnf
+
+
+def _decode(model: Iterable[int]) -> Grid:
+    solved: Grid = [[0] * 9 for _ in range(9)]
+    for lit in model:
+        if 0 < lit <= _NUM_VARS:
+            r, rem = divmod(lit - 1, 81)
+            c, d = divmod(rem, 9)
+            solved[r][c] = d + 1
+    return solved
+
+
+@dataclass
+class SimplifiedCNF:
+    """
+    Base CNF with the givens (and optionally singles) propagated away.
+
+    ``clauses`` use dense variables ``1..len(var_cells)``; variable ``i`` means
+    "cell ``var_cells[i-1][:2]`` holds digit ``var_cells[i-1][2]``". ``fixed`` is the
+    grid after propagation. An empty clause means the givens are contradictory.
+    """
+
+    clauses: List[Tuple[int, ...]]
+    var_cells: List[Tuple[int, int, int]]
+    fixed: Grid
+
+    @property
+    def num_vars(self) -> int:
+        return len(self.var_cells)
+
+    def dimacs_lines(self) -> Iterable[str]:
+        yield f"p cnf {self.num_vars} {len(self.clauses)}"
+        for clause in self.clauses:
+            yield " ".join(map(str, (*clause, 0)))
+
+    def mapping(self) -> Dict[str, Any]:
+        """JSON-ready variable map: ``vars[i-1] == [row, col, digit]`` for variable ``i``."""
+        return {
+            "version": "cnf-map-1",
+            "fixed": "".join(str(v) if v else "." for row in self.fixed for v in row),
+            "vars": [list(cell) for cell in self.var_cells],
+        }
+
+    def decode(self, model: Iterable[int]) -> Grid:
+        """Full grid from a model of the simplified CNF (positive literals)."""
+        out = [row[:] for row in self.fixed]
+        for lit in model:
+            if 0 < lit <= self.num_vars:
+                r, c, d = self.var_cells[lit - 1]
+                out[r][c] = d
+        return out
+
+
+def simplify_cnf(grid: Grid, *, singles: bool = False) -> SimplifiedCNF:
+    """
+    Encode ``grid`` with every variable the givens decide substituted away.
+
+    Clauses containing a true literal are dropped and false literals removed; the
+    remaining open (cell, digit) candidates are renumbered densely in
+    ``(row, col, digit)`` order. ``singles=True`` first places all naked/hidden
+    singles, which fixes more variables.
+    """
+    state = CandidateState([row[:] for row in grid])
+    if singles:
+        while apply_all_singles(state.grid, state.cand):
+            pass
+    fixed, cand = state.grid, state.cand
+    # value[v]: True/False when decided, else the dense variable number
+    value: List[Any] = [None] * (_NUM_VARS + 1)
+    var_cells: List[Tuple[int, int, int]] = []
     for r in range(9):
         for c in range(9):
-            v = grid[r][c]
-            if v:
-                cnf.append([_var(r, c, v - 1)])
-    return cnf
+            given = fixed[r][c]
+            for d in range(9):
+                v = _var(r, c, d)
+                if given:
+                    value[v] = given == d + 1
+                elif d + 1 in cand[r][c]:
+                    var_cells.append((r, c, d + 1))
+                    value[v] = len(var_cells)
+                else:
+                    value[v] = False
+    clauses: List[Tuple[int, ...]] = []
+    for clause in _base_cnf():
+        out: List[int] = []
+        for lit in clause:
+            val = value[abs(lit)]
+            if val is True or val is False:
+                if val == (lit > 0):
+                    break  # clause satisfied
+                continue  # literal falsified
+            out.append(val if lit > 0 else -val)
+        else:
+            clauses.append(tuple(out))
+    return SimplifiedCNF(clauses=clauses, var_cells=var_cells, fixed=fixed)
+
 
+def cnf_dimacs_lines(grid: Grid, *, simplify: bool = False, singles: bool = False) -> Iterable[str]:
+    """
+    Yield DIMACS CNF lines for ``grid`` using variables in ``[1, 729]``.
+
+    ``simplify=True`` yields the propagated, densely renumbered encoding of
+    :func:`simplify_cnf` instead (``singles`` is passed through); use that
+    function directly to get the variable mapping as well.
+    """
+
+    if simplify or singles:
+        yield from simplify_cnf(grid, singles=singles).dimacs_lines()
+        return
+    base = _base_cnf()
+    givens = _given_literals(grid)
+    yield f"p cnf {_NUM_VARS} {len(base) + len(givens)}"
+    for clause in base:
+        yield " ".join(map(str, clause)) + " 0"
+    for lit in givens:
+        yield f"{lit} 0"
+
+
+class SatSolver:
+    """
+    Reusable incremental SAT backend (requires python-sat).
+
+    The base CNF is loaded once; each query passes the givens as assumptions.
+    :meth:`count` blocks solutions with clauses guarded by a fresh selector
+    variable and retires the selector afterwards; retired selectors and their
+    blocking clauses stay in the solver, so after ``max_selectors`` counts the
+    Minisat instance is rebuilt from the base CNF. That bounds the leftovers to
+    ``max_selectors * limit`` blocking clauses. Not thread-safe; use one instance
+    per thread or process.
+    """
+
+    def __init__(self, *, max_selectors: int = 1000) -> None:
+        if max_selectors < 1:
+            raise ValueError("max_selectors must be >= 1")
+        self.max_selectors = max_selectors
+        self._solver = self._fresh()
+        self._next_var = _NUM_VARS + 1
+
+    @staticmethod
+    def _fresh() -> Any:
+        from pysat.solvers import Minisat22  # type: ignore import-not-found
+
+        return Minisat22(bootstrap_with=_base_cnf())
+
+    def solve(self, grid: Grid) -> Optional[Grid]:
+        """Solved grid, or ``None`` if the givens are unsatisfiable."""
+        if not self._solver.solve(assumptions=_given_literals(grid)):
+            return None
+        return _decode(self._solver.get_model())
 
-def cnf_dimacs_lines(grid: Grid) -> Iterable[str]:
-    """Yield DIMACS CNF lines for ``grid`` using variables in ``[1, 729]``."""
+    def count(self, grid: Grid, limit: int = 2) -> int:
+        """Number of solutions, stopping at ``limit``."""
+        return self.count_first(grid, limit)[0]
 
-    cnf = _encode_cnf(grid)
-    num_vars = 9 * 9 * 9
-    num_clauses = len(cnf)
-    yield f"p cnf {num_vars} {num_clauses}"
-    for clause in cnf:
-        literals = " ".join(str(int(lit)) for lit in clause)
-        yield f"{literals} 0"
+    def count_first(self, grid: Grid, limit: int = 2) -> Tuple[int, Optional[Grid]]:
+        """``(solutions up to limit, first solution or None)`` in one pass."""
+        givens = _given_literals(grid)
+        if self._next_var > _NUM_VARS + self.max_selectors:
+            self._solver.delete()
+            self._solver = self._fresh()
+            self._next_var = _NUM_VARS + 1
+        selector = self._next_var
+        self._next_var += 1
+        assumptions = givens + [selector]
+        fixed = {abs(lit) for lit in givens}
+        found = 0
+        first: Optional[Grid] = None
+        try:
+            while found < limit and self._solver.solve(assumptions=assumptions):
+                found += 1
+                model = self._solver.get_model()
+                if first is None:
+                    first = _decode(model)
+                # forbid this assignment of the open cells while the selector is on
+                block = [-lit for lit in model if 0 < lit <= _NUM_VARS and lit not in fixed]
+                self._solver.add_clause([-selector] + block)
+        finally:
+            self._solver.add_clause([-selector])  # switch the blocking clauses off for good
+        return found, first
+
+    def close(self) -> None:
+        self._solver.delete()
+
+    def __enter__(self) -> "SatSolver":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+_SHARED: Optional[SatSolver] = None
+
+
+def _shared_solver() -> Optional[SatSolver]:
+    global _SHARED
+    if _SHARED is None:
+        try:
+            _SHARED = SatSolver()
+        except Exception:
+            return None
+    return _SHARED
 
 
 def sat_solve(grid: Grid) -> Optional[Grid]:
     """Solve a Sudoku grid via SAT; returns the solved grid or ``None`` if unavailable."""
 
+    solver = _shared_solver()
+    if solver is None:
+        return None
+    return solver.solve(grid)
+
+
+def sat_count(grid: Grid, limit: int = 2) -> Optional[int]:
+    """Count solutions up to ``limit`` via SAT; ``None`` if python-sat is unavailable."""
+
+    solver = _shared_solver()
+    if solver is None:
+        return None
+    return solver.count(grid, limit=limit)
+
+
+# ----- Differential cross-check ------------------------------------------------------------------
+
+# An engine maps a grid to (first solution or None, number of solutions found up to 2).
+Engine = Callable[[Grid], Tuple[Optional[Grid], int]]
+
+_ENGINES: Dict[str, Engine] = {}
+
+
+def register_engine(name: str, fn: Engine) -> None:
+    """
+    Make ``fn`` available to :func:`crosscheck_grid` and ``crosscheck-file`` under ``name``.
+
+    Registration is only honoured in this process (and workers forked from it); pool
+    workers started with spawn re-import the package and do not see it. Pass the engine
+    as a ``"module:function"`` path (see :func:`resolve_engine`) to reach any worker.
+    """
+    _ENGINES[name] = fn
+
+
+def resolve_engine(name: str) -> Engine:
+    """
+    Registered engine ``name``, or the function a ``"module:function"`` path names.
+
+    Import paths resolve in whichever process runs the check, so they work in
+    ``crosscheck-file --parallel`` workers under any start method. Raises
+    ``ValueError`` for unknown names and paths that do not import.
+    """
+    fn = _ENGINES.get(name)
+    if fn is not None:
+        return fn
+    module, sep, attr = name.partition(":")
+    if not (sep and module and attr):
+        raise ValueError(f"unknown engine: {name!r}")
     try:
-        from pysat.solvers import Minisat22  # type: ignore import-not-found
-    except Exception:
+        fn = getattr(importlib.import_module(module), attr)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"cannot import engine {name!r}: {exc}") from exc
+    _ENGINES[name] = fn
+    return fn
+
+
+def available_engines() -> List[str]:
+    """Registered engine names whose backend can run here (``sat`` needs python-sat)."""
+    return [name for name in _ENGINES if name != "sat" or _shared_solver() is not None]
+
+
+def _dlx_engine(grid: Grid) -> Tuple[Optional[Grid], int]:
+    from .solver import SOLVER, grid_clues
+
+    count, solved = SOLVER.count_solutions(grid_clues(grid), limit=2)
+    return (solved if count else None), count
+
+
+def _sat_engine(grid: Grid) -> Tuple[Optional[Grid], int]:
+    solver = _shared_solver()
+    if solver is None:
+        raise RuntimeError("SAT engine unavailable (install optional extra: pip install -e '.[sat]')")
+    count, solved = solver.count_first(grid, limit=2)
+    return solved, count
+
+
+register_engine("dlx", _dlx_engine)
+register_engine("sat", _sat_engine)
+
+
+def _to_str(grid: Optional[Grid]) -> Optional[str]:
+    if grid is None:
         return None
+    return "".join(str(v) if v else "." for row in grid for v in row)
 
-    cnf = _encode_cnf(grid)
-    with Minisat22(bootstrap_with=cnf) as solver:
-        if not solver.solve():
-            return None
-        model = solver.get_model()
 
-    solved: Grid = [[0] * 9 for _ in range(9)]
-    for r in range(9):
-        for c in range(9):
-            for d in range(9):
-                if _var(r, c, d) in model:
-                    solved[r][c] = d + 1
-                    break
-    return solved
+def _is_completion(grid: Grid, solved: Grid) -> bool:
+    rows = [set(row) for row in solved]
+    cols = [{solved[r][c] for r in range(9)} for c in range(9)]
+    boxes = [
+        {solved[r][c] for r in range(br, br + 3) for c in range(bc, bc + 3)}
+        for br in range(0, 9, 3)
+        for bc in range(0, 9, 3)
+    ]
+    full = set(range(1, 10))
+    if any(u != full for u in rows + cols + boxes):
+        return False
+    return all(not grid[r][c] or grid[r][c] == solved[r][c] for r in range(9) for c in range(9))
+
+
+def crosscheck_grid(grid: Grid, engines: Sequence[str]) -> Dict[str, Any]:
+    """
+    Run every engine on ``grid`` and compare the verdicts.
+
+    Returns ``{"engines": {name: {"solution", "count", "ms"}}, "mismatch": kind | None}``
+    where ``kind`` is ``"invalid_solution"`` (a solution that is not a completion of
+    the givens), ``"uniqueness"`` (engines disagree on 0 / 1 / 2+ solutions) or
+    ``"solution"`` (both say unique but the solutions differ).
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in engines:
+        fn = resolve_engine(name)
+        t0 = perf_counter()
+        solved, count = fn([row[:] for row in grid])
+        ms = (perf_counter() - t0) * 1000.0
+        results[name] = {"solution": solved, "count": min(count, 2), "ms": ms}
+    mismatch: Optional[str] = None
+    if any(r["solution"] is not None and not _is_completion(grid, r["solution"]) for r in results.values()):
+        mismatch = "invalid_solution"
+    elif len({r["count"] for r in results.values()}) > 1:
+        mismatch = "uniqueness"
+    elif all(r["count"] == 1 for r in results.values()):
+        if len({_to_str(r["solution"]) for r in results.values()}) > 1:
+            mismatch = "solution"
+    for r in results.values():
+        r["solution"] = _to_str(r["solution"])
+    return {"engines": results, "mismatch": mismatch}
 
 
-__all__ = ["sat_solve", "cnf_dimacs_lines"]
+__all__ = [
+    "SatSolver",
+    "SimplifiedCNF",
+    "sat_solve",
+    "sat_count",
+    "simplify_cnf",
+    "cnf_dimacs_lines",
+    "register_engine",
+    "resolve_engine",
+    "available_engines",
+    "crosscheck_grid",
+]
@@ -4,17 +4,25 @@ import random
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
+from .grid81 import Grid81
 from .solver import SOLVER, grid_clues
 
 Grid = List[List[int]]
 
 
-def build_ec_rows_from_grid(grid: Grid) -> Grid:
-    """Return a copy of the grid used by the compatibility engine."""
+def build_ec_rows_from_grid(grid: Grid | Grid81) -> Grid | Grid81:
+    """Return a copy of the grid used by the compatibility engine (a Grid81 is only read, not copied)."""
+    if isinstance(grid, Grid81):
+        return grid
     return [row[:] for row in grid]
 
 
-def apply_solution_to_grid(grid: Grid, sol_rows: List[Tuple[int, int, int]]) -> None:
+def apply_solution_to_grid(grid: Grid | Grid81, sol_rows: List[Tuple[int, int, int]]) -> None:
+    if isinstance(grid, Grid81):
+        cells = grid.cells
+        for r, c, d in sol_rows:
+            cells[r * 9 + c] = d + 1
+        return
     for r, c, d in sol_rows:
         grid[r][c] = d + 1
 
@@ -31,22 +39,30 @@ class DLXEngine:
         self.header = Column()
         self.nodes = 0
         self.backtracks = 0
-
-    def solve_first(self, rows: Grid) -> Optional[List[Tuple[int, int, int]]]:
+        self.dead_ends = 0
+        self.failed_columns = 0
+        self.max_depth = 0
+        self.branching: List[float] = []
+
+    def _take_stats(self) -> None:
+        stats = SOLVER.stats
+        self.nodes = stats.nodes
+        self.backtracks = stats.backtracks
+        self.dead_ends = stats.dead_ends
+        self.failed_columns = stats.failed_columns
+        self.max_depth = stats.max_depth
+        self.branching = stats.branching()
+
+    def solve_first(self, rows: Grid | Grid81) -> Optional[List[Tuple[int, int, int]]]:
         count, solved = SOLVER.count_solutions(grid_clues(rows), limit=1)
-        self.nodes = SOLVER.stats.nodes
-        # Approximate backtracks using branches statistic when available
-        branches = getattr(SOLVER.stats, "branches", 0)
-        self.backtracks = max(branches - count, 0)
+        self._take_stats()
         if count == 0 or solved is None:
             return None
         return [(r, c, solved[r][c] - 1) for r in range(9) for c in range(9)]
 
-    def count(self, rows: Grid, limit: int = 2) -> int:
+    def count(self, rows: Grid | Grid81, limit: int = 2) -> int:
         count, _ = SOLVER.count_solutions(grid_clues(rows), limit=limit)
-        self.nodes = SOLVER.stats.nodes
-        branches = getattr(SOLVER.stats, "branches", 0)
-        self.backtracks = max(branches - count, 0)
+        self._take_stats()
         return count
 
 
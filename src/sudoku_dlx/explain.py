@@ -1,9 +1,72 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
-from .api import Grid, to_string, solve
-from .strategies import step_once
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Union
+from time import perf_counter
 
-def explain(grid: Grid, max_steps: int = 200) -> Dict[str, Any]:
+from . import metrics as _metrics
+from .api import Grid, to_string, solve, is_valid
+from .grid81 import Grid81, to_rows
+from .strategies import CandidateState, StrategyProfile, step_once
+
+
+def _iter_steps(
+    state: CandidateState,
+    max_steps: Optional[int],
+    bulk_singles: bool,
+    profile: Optional[StrategyProfile] = None,
+    techniques: Optional[Sequence[str]] = None,
+    upto: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    taken = 0
+    while max_steps is None or taken < max_steps:
+        m = step_once(
+            state.grid,
+            state,
+            bulk_singles=bulk_singles,
+            profile=profile,
+            techniques=techniques,
+            upto=upto,
+        )
+        if not m:
+            return
+        taken += 1
+        yield m
+        # If we ever complete, stop early
+        if state.is_solved():
+            return
+
+
+def iter_explain(
+    grid: Grid | Grid81,
+    max_steps: Optional[int] = None,
+    *,
+    bulk_singles: bool = False,
+    profile: Optional[StrategyProfile] = None,
+    techniques: Optional[Sequence[str]] = None,
+    upto: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield the moves explain() would report, one per step.
+
+    Work is done only as moves are consumed, so taking the next hint costs one
+    step rather than the whole path; no solve is run. ``grid`` is not modified.
+    Strategy counters accumulate into ``profile`` when one is given;
+    ``techniques``/``upto`` restrict the ladder as in step_once().
+    """
+    # candidates persist across steps, so eliminations are never rediscovered
+    state = CandidateState(to_rows(grid))
+    return _iter_steps(state, max_steps, bulk_singles, profile, techniques, upto)
+
+
+def explain(
+    grid: Grid | Grid81,
+    max_steps: int = 200,
+    *,
+    bulk_singles: bool = False,
+    profile: Union[bool, StrategyProfile] = False,
+    techniques: Optional[Sequence[str]] = None,
+    upto: Optional[str] = None,
+    solution: bool = True,
+) -> Dict[str, Any]:
     """
     Try to solve using human strategies (naked/hidden singles, locked candidates).
     Returns:
@@ -15,29 +78,57 @@ def explain(grid: Grid, max_steps: int = 200) -> Dict[str, Any]:
         "solution": "<81-char>" | None
       }
     Deterministic order and moves.
+
+    bulk_singles=True places all available singles per round as one
+    {"type": "place_batch", "strategy": "singles", "placements": [...]} step
+    (each placement carries its own strategy). Same end state for a
+    technique profile, far fewer scans; max_steps counts batches.
+
+    profile=True adds "profile": per-strategy calls, hits, seconds and
+    open candidates (see StrategyProfile.as_dict). Passing a StrategyProfile
+    instead accumulates into it, e.g. across a whole file. Off by default, and
+    then the strategy ladder runs without any timing calls.
+
+    techniques/upto choose which strategies run and in what order, e.g.
+    upto="locked_candidates" stops after singles and locked candidates
+    (see strategies.resolve_ladder); steps end at the first stall.
+
+    "solution" comes from the finished progress when the steps solve the
+    puzzle, and from a DLX solve otherwise. solution=False skips that solve
+    and reports None, for callers that only want the steps (hints).
     """
-    g = [row[:] for row in grid]
-    steps: List[Dict[str, Any]] = []
-    for _ in range(max_steps):
-        m = step_once(g)
-        if not m:
-            break
-        steps.append(m)
-        # If we ever complete, stop early
-        if all(g[r][c] != 0 for r in range(9) for c in range(9)):
-            break
-    progress = to_string(g)
+    reg = _metrics.ACTIVE
+    t0 = perf_counter() if reg is not None else 0.0
+    prof: Optional[StrategyProfile] = None
+    if isinstance(profile, StrategyProfile):
+        prof = profile
+    elif profile:
+        prof = StrategyProfile()
+    state = CandidateState(to_rows(grid))
+    steps: List[Dict[str, Any]] = list(
+        _iter_steps(state, max_steps, bulk_singles, prof, techniques, upto)
+    )
+    progress = to_string(state.grid)
+    solved = progress.find(".") == -1
     # For convenience include full solution if solvable
     solved_out: Optional[str] = None
-    sres = solve([row[:] for row in grid])
-    if sres is not None:
-        solved_out = to_string(sres.grid)
-    return {
+    if solved and is_valid(state.grid):
+        solved_out = progress  # sound steps filled a valid grid: that is the solution
+    elif solution:
+        sres = solve(grid)
+        if sres is not None:
+            solved_out = to_string(sres.grid)
+    out: Dict[str, Any] = {
         "version": "explain-1",
         "steps": steps,
         "progress": progress,
-        "solved": progress.find(".") == -1,
+        "solved": solved,
         "solution": solved_out,
     }
+    if prof is not None:
+        out["profile"] = prof.as_dict()
+    if reg is not None:
+        reg.observe_call("explain", perf_counter() - t0)
+    return out
 
-__all__ = ["explain"]
+__all__ = ["explain", "iter_explain"]
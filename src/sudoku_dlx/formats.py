@@ -1,13 +1,52 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from typing import IO, Any, Iterable, Iterator, List, Optional, Tuple
+import bz2
 import csv
+import gzip
+import itertools
 import json
+import lzma
+import mmap
+import os
 import pathlib
+import struct
 
+from .grid81 import parse_many
 
 # All “grid strings” are 81 chars, dots for blanks.
 
+# Lines of a txt file parsed per parse_many call.
+_TXT_BLOCK_LINES = 32
+
+# Bytes of a CSV file handed to csv.Sniffer; enough for a header and a few rows.
+_SNIFF_CHARS = 4096
+
+
+# Binary container ("bin", *.sdkb): 16-byte header, then fixed-size records.
+#   header: magic b"SDKB", version u8, flags u8, record size u16, 8 reserved bytes
+#   record: 81 cells packed 4 bits each (41 bytes, high nibble first, 0 = blank)
+#           + optional column: flags u8, score u16 (hundredths) when _BIN_HAS_SCORE
+_BIN_MAGIC = b"SDKB"
+_BIN_VERSION = 1
+_BIN_HEADER = struct.Struct("<4sBBH8x")
+_BIN_CELLS = 41
+_BIN_EXTRA = struct.Struct("<BH")
+_BIN_HAS_SCORE = 0x01
+
+_BIN_REC_SIZES = (_BIN_CELLS, _BIN_CELLS + _BIN_EXTRA.size)
+
+_GRID_CHARS = b".0-_123456789"
+_NIBBLE_OF = bytes.maketrans(_GRID_CHARS, bytes([0, 0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9]))
+_CELL_CHARS = ".123456789??????"
+_PAIR_OF = [_CELL_CHARS[b >> 4] + _CELL_CHARS[b & 0x0F] for b in range(256)]
+
+_FORMATS = {"txt", "csv", "jsonl", "bin"}
+
+# Compressed variants are recognised by a trailing suffix, e.g. puzzles.txt.gz.
+_COMPRESSORS: dict[str, Any] = {"gz": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
 def _strip_grid_line(s: str) -> str:
     return "".join(ch for ch in s.strip() if not ch.isspace())
 
@@ -16,8 +55,46 @@ def _is_81(s: str) -> bool:
     return len(s) == 81
 
 
+def compression_of(path: str) -> Optional[str]:
+    """Return "gz", "bz2" or "xz" when ``path`` names a compressed file, else None."""
+    ext = pathlib.Path(path).suffix.lower().lstrip(".")
+    return ext if ext in _COMPRESSORS else None
+
+
+def open_path(
+    path: str,
+    mode: str = "r",
+    *,
+    compresslevel: Optional[int] = None,
+    newline: Optional[str] = None,
+) -> IO[Any]:
+    """
+    Open ``path`` for reading or writing, streaming through gzip/bz2/lzma when the
+    suffix asks for it. Text modes use UTF-8. Writers create parent directories.
+    """
+    p = pathlib.Path(path)
+    if "w" in mode:
+        p.parent.mkdir(parents=True, exist_ok=True)
+    binary = "b" in mode
+    kind = compression_of(path)
+    if kind is None:
+        if binary:
+            return p.open(mode)
+        return p.open(mode, encoding="utf-8", newline=newline)
+    opener = _COMPRESSORS[kind]
+    cmode = mode if binary else mode.rstrip("t") + "t"
+    kwargs: dict[str, Any] = {}
+    if not binary:
+        kwargs.update(encoding="utf-8", newline=newline)
+    if compresslevel is not None and "w" in mode:
+        kwargs["preset" if kind == "xz" else "compresslevel"] = compresslevel
+    return opener(p, cmode, **kwargs)
+
+
 def detect_format(path: str) -> str:
     p = pathlib.Path(path)
+    if compression_of(path) is not None:
+        p = p.with_suffix("")
     ext = p.suffix.lower().lstrip(".")
     if ext in {"txt", "sdk"}:
         return "txt"
@@ -25,74 +102,366 @@ def detect_format(path: str) -> str:
         return "csv"
     if ext in {"jsonl", "ndjson"}:
         return "jsonl"
+    if ext in {"sdkb"}:
+        return "bin"
     # default: try txt
     return "txt"
 
 
-def read_grids(path: str, fmt: Optional[str] = None) -> List[str]:
-    fmt = fmt or detect_format(path)
-    p = pathlib.Path(path)
-    if fmt == "txt":
-        out: List[str] = []
-        for line in p.read_text(encoding="utf-8").splitlines():
+def _iter_txt(f: Iterable[str], strict: bool, keep_malformed: bool = False) -> Iterator[str]:
+    # Blocks of lines go through parse_many (one translate + split per block); a block with
+    # a line it rejects is redone line by line so errors and kept rejects match the input.
+    lines = iter(f)
+    while True:
+        block = list(itertools.islice(lines, _TXT_BLOCK_LINES))
+        if not block:
+            return
+        grids = parse_many("".join(block), strict=False)
+        if len(grids) == sum(1 for line in block if line and not line.isspace()):
+            for g in grids:
+                yield g.to_string()
+            continue
+        for line in block:
             s = _strip_grid_line(line)
             if not s:
                 continue
             if not _is_81(s):
-                raise ValueError(f"bad grid length (expected 81): {s!r}")
-            out.append(s)
-        return out
-    if fmt == "csv":
-        out: List[str] = []
-        with p.open("r", encoding="utf-8", newline="") as f:
-            sniffer = csv.Sniffer()
-            text = f.read()
-            f.seek(0)
-            try:
-                dialect = sniffer.sniff(text)
-            except Exception:
-                dialect = csv.excel
-            reader = csv.DictReader(f, dialect=dialect)
-            if reader.fieldnames is None or len(reader.fieldnames) == 0:
-                raise ValueError("CSV missing header row")
-            field = "grid" if "grid" in reader.fieldnames else reader.fieldnames[0]
-            for row in reader:
-                cell = row.get(field, "")
-                s = _strip_grid_line(cell)
-                if _is_81(s):
-                    out.append(s)
-        return out
-    if fmt == "jsonl":
-        out: List[str] = []
-        with p.open("r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                obj = json.loads(line)
-                s = _strip_grid_line(obj.get("grid", ""))
-                if _is_81(s):
-                    out.append(s)
-        return out
-    raise ValueError(f"unknown format: {fmt}")
-
-
-def write_grids(path: str, grids: Iterable[str], fmt: Optional[str] = None) -> None:
-    fmt = fmt or detect_format(path)
-    p = pathlib.Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    if fmt == "txt":
-        p.write_text("\n".join(grids) + "\n", encoding="utf-8")
+                if strict:
+                    raise ValueError(f"bad grid length (expected 81): {s!r}")
+                if keep_malformed:
+                    yield s
+                continue
+            parsed = parse_many(s, strict=False)
+            yield parsed[0].to_string() if parsed else s
+
+
+def _iter_csv(f: IO[str]) -> Iterator[str]:
+    sample = f.read(_SNIFF_CHARS)
+    f.seek(0)
+    if len(sample) == _SNIFF_CHARS and "\n" in sample:
+        # whole lines only: a row cut mid-field can fool the sniffer
+        sample = sample[: sample.rindex("\n") + 1]
+    try:
+        dialect = csv.Sniffer().sniff(sample)
+    except Exception:
+        dialect = csv.excel
+    reader = csv.DictReader(f, dialect=dialect)
+    if reader.fieldnames is None or len(reader.fieldnames) == 0:
+        raise ValueError("CSV missing header row")
+    field = "grid" if "grid" in reader.fieldnames else reader.fieldnames[0]
+    for row in reader:
+        cell = row.get(field, "")
+        s = _strip_grid_line(cell or "")
+        if _is_81(s):
+            yield s
+
+
+def _iter_jsonl(f: Iterable[str]) -> Iterator[str]:
+    for line in f:
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        s = _strip_grid_line(obj.get("grid", ""))
+        if _is_81(s):
+            yield s
+
+
+def _iter_bin_stream(f: IO[bytes]) -> Iterator[str]:
+    # sequential decoder for binary containers that cannot be memory-mapped
+    header = f.read(_BIN_HEADER.size)
+    if len(header) < _BIN_HEADER.size:
+        raise ValueError("not a binary grid file")
+    magic, version, _flags, rec_size = _BIN_HEADER.unpack(header)
+    if magic != _BIN_MAGIC or version != _BIN_VERSION:
+        raise ValueError("not a binary grid file")
+    if rec_size not in _BIN_REC_SIZES:
+        raise ValueError(f"bad record size in binary grid file: {rec_size}")
+    while True:
+        rec = f.read(rec_size)
+        if len(rec) < rec_size:
+            return
+        yield unpack_grid(rec[:_BIN_CELLS])
+
+
+def pack_grid(grid: str) -> bytes:
+    """Pack an 81-char grid string (digits, blanks as ``.0-_``) into 41 bytes (4 bits per cell)."""
+    if not _is_81(grid):
+        raise ValueError(f"bad grid length (expected 81): {grid!r}")
+    raw = (grid + ".").encode("ascii", "replace")
+    if raw.translate(None, _GRID_CHARS):
+        raise ValueError(f"bad grid characters: {grid!r}")
+    nibbles = raw.translate(_NIBBLE_OF)
+    return bytes((hi << 4) | lo for hi, lo in zip(nibbles[0::2], nibbles[1::2]))
+
+
+def unpack_grid(data: bytes) -> str:
+    """Inverse of :func:`pack_grid`."""
+    return "".join([_PAIR_OF[b] for b in data])[:81]
+
+
+class GridArray:
+    """
+    Random-access view over a binary grid container, backed by ``mmap``.
+
+    ``arr[i]`` decodes only record ``i``; nothing else in the file is parsed.
+    Compressed containers cannot be mapped; stream them with :func:`iter_grids`.
+    """
+
+    def __init__(self, path: str) -> None:
+        if compression_of(path) is not None:
+            raise ValueError(f"cannot memory-map a compressed file: {path}")
+        self.path = pathlib.Path(path)
+        self._file = self.path.open("rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"not a binary grid file: {path}") from None
+        if len(self._mm) < _BIN_HEADER.size:
+            self.close()
+            raise ValueError(f"not a binary grid file: {path}")
+        magic, version, flags, rec_size = _BIN_HEADER.unpack_from(self._mm, 0)
+        if magic != _BIN_MAGIC or version != _BIN_VERSION:
+            self.close()
+            raise ValueError(f"not a binary grid file: {path}")
+        if rec_size not in _BIN_REC_SIZES:
+            self.close()
+            raise ValueError(f"bad record size in binary grid file {path}: {rec_size}")
+        self.has_scores = bool(flags & _BIN_HAS_SCORE)
+        self.record_size = rec_size
+        self._count = (len(self._mm) - _BIN_HEADER.size) // rec_size
+
+    def __enter__(self) -> "GridArray":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _offset(self, i: int) -> int:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("record index out of range")
+        return _BIN_HEADER.size + i * self.record_size
+
+    def __getitem__(self, i: int) -> str:
+        off = self._offset(i)
+        return unpack_grid(self._mm[off : off + _BIN_CELLS])
+
+    def __iter__(self) -> Iterator[str]:
+        mm = self._mm
+        size = self.record_size
+        off = _BIN_HEADER.size
+        for _ in range(self._count):
+            yield unpack_grid(mm[off : off + _BIN_CELLS])
+            off += size
+
+    def flags(self, i: int) -> int:
+        if not self.has_scores:
+            return 0
+        flags, _ = _BIN_EXTRA.unpack_from(self._mm, self._offset(i) + _BIN_CELLS)
+        return int(flags)
+
+    def score(self, i: int) -> Optional[float]:
+        if not self.has_scores:
+            return None
+        _, score = _BIN_EXTRA.unpack_from(self._mm, self._offset(i) + _BIN_CELLS)
+        return score / 100.0
+
+    def close(self) -> None:
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None  # type: ignore[assignment]
+        self._file.close()
+
+
+def _iter_all(path: str, fmt: str, strict: bool, keep_malformed: bool = False) -> Iterator[str]:
+    if fmt == "bin":
+        if compression_of(path) is not None:
+            with open_path(path, "rb") as fb:
+                yield from _iter_bin_stream(fb)
+            return
+        with GridArray(path) as arr:
+            yield from arr
         return
-    if fmt == "csv":
-        with p.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["grid"])
-            for s in grids:
-                writer.writerow([s])
+    newline = "" if fmt == "csv" else None
+    with open_path(path, "r", newline=newline) as f:
+        if fmt == "txt":
+            yield from _iter_txt(f, strict, keep_malformed)
+        elif fmt == "csv":
+            yield from _iter_csv(f)
+        else:
+            yield from _iter_jsonl(f)
+
+
+def _iter_line_range(path: str, index: int, count: int) -> Iterator[str]:
+    # Byte range [start, end) of the file; a line belongs to the shard holding its first byte.
+    size = os.path.getsize(path)
+    start = size * index // count
+    end = size * (index + 1) // count
+    with open(path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()  # finish the line owned by the previous shard
+        pos = f.tell()
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line.decode("utf-8")
+
+
+def _iter_shard(
+    path: str, fmt: str, strict: bool, index: int, count: int, keep_malformed: bool = False
+) -> Iterator[str]:
+    compressed = compression_of(path) is not None
+    if fmt == "bin" and not compressed:
+        with GridArray(path) as arr:
+            n = len(arr)
+            for i in range(n * index // count, n * (index + 1) // count):
+                yield arr[i]
         return
-    if fmt == "jsonl":
-        with p.open("w", encoding="utf-8") as f:
-            for s in grids:
-                f.write(json.dumps({"grid": s}, separators=(",", ":")) + "\n")
+    if fmt in {"txt", "jsonl"} and not compressed:
+        lines = _iter_line_range(path, index, count)
+        yield from _iter_txt(lines, strict, keep_malformed) if fmt == "txt" else _iter_jsonl(lines)
         return
-    raise ValueError(f"unknown format: {fmt}")
+    # csv and compressed inputs cannot be split by offset: take every count-th record
+    yield from itertools.islice(_iter_all(path, fmt, strict, keep_malformed), index, None, count)
+
+
+def iter_grids(
+    path: str,
+    fmt: Optional[str] = None,
+    *,
+    strict: bool = True,
+    shard: Optional[Tuple[int, int]] = None,
+    keep_malformed: bool = False,
+) -> Iterator[str]:
+    """
+    Lazily yield 81-char grid strings from ``path`` in constant memory.
+
+    ``strict`` only affects txt input: when False, lines that are not 81 chars
+    are skipped instead of raising (csv/jsonl always skip them), or yielded as-is
+    with ``keep_malformed=True`` for callers that count the rejects. Txt lines are
+    parsed in blocks by :func:`~sudoku_dlx.grid81.parse_many`, so valid grids come
+    out with ``.`` blanks whatever blank character the file used.
+
+    ``shard=(index, count)`` yields only that slice of the file. Uncompressed
+    txt/jsonl files are split into newline-aligned byte ranges and binary
+    containers into record ranges, so each shard reads only its own part and
+    concatenating shards 0..count-1 restores the input order. CSV and compressed
+    inputs fall back to every ``count``-th record starting at ``index``.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in _FORMATS:
+        raise ValueError(f"unknown format: {fmt}")
+    if shard is None:
+        yield from _iter_all(path, fmt, strict, keep_malformed)
+        return
+    index, count = shard
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"bad shard {index}/{count}")
+    yield from _iter_shard(path, fmt, strict, index, count, keep_malformed)
+
+
+def read_grids(path: str, fmt: Optional[str] = None) -> List[str]:
+    return list(iter_grids(path, fmt))
+
+
+class GridWriter:
+    """
+    Streaming grid writer for txt/csv/jsonl/bin; use as a context manager.
+
+        with GridWriter("out.csv") as w:
+            for s in grids:
+                w.write(s)
+
+    ``scores=True`` adds the per-record flags/score column to binary output;
+    text formats ignore ``score`` and ``flags``. A .gz/.bz2/.xz suffix compresses
+    the output at ``compresslevel`` (codec default when None).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fmt: Optional[str] = None,
+        *,
+        scores: bool = False,
+        compresslevel: Optional[int] = None,
+    ) -> None:
+        self.fmt = fmt or detect_format(path)
+        if self.fmt not in _FORMATS:
+            raise ValueError(f"unknown format: {self.fmt}")
+        self.path = pathlib.Path(path)
+        self.scores = scores
+        self.compresslevel = compresslevel
+        self.count = 0
+        self._handle: Any = None
+        self._csv: Any = None
+
+    def __enter__(self) -> "GridWriter":
+        self.open()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def open(self) -> None:
+        path = str(self.path)
+        if self.fmt == "bin":
+            self._handle = open_path(path, "wb", compresslevel=self.compresslevel)
+            rec_size = _BIN_CELLS + (_BIN_EXTRA.size if self.scores else 0)
+            flags = _BIN_HAS_SCORE if self.scores else 0
+            self._handle.write(_BIN_HEADER.pack(_BIN_MAGIC, _BIN_VERSION, flags, rec_size))
+            return
+        newline = "" if self.fmt == "csv" else None
+        self._handle = open_path(
+            path, "w", compresslevel=self.compresslevel, newline=newline
+        )
+        if self.fmt == "csv":
+            self._csv = csv.writer(self._handle)
+            self._csv.writerow(["grid"])
+
+    def write(self, grid: str, *, score: Optional[float] = None, flags: int = 0) -> None:
+        f = self._handle
+        if f is None:
+            raise ValueError("GridWriter is not open")
+        if self.fmt == "bin":
+            f.write(pack_grid(grid))
+            if self.scores:
+                centi = 0 if score is None else int(round(score * 100))
+                f.write(_BIN_EXTRA.pack(flags & 0xFF, max(0, min(centi, 0xFFFF))))
+        elif self.fmt == "txt":
+            f.write(grid + "\n")
+        elif self.fmt == "csv":
+            self._csv.writerow([grid])
+        else:
+            f.write(json.dumps({"grid": grid}, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def write_many(self, grids: Iterable[str]) -> None:
+        for s in grids:
+            self.write(s)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._csv = None
+
+
+def write_grids(
+    path: str,
+    grids: Iterable[str],
+    fmt: Optional[str] = None,
+    *,
+    compresslevel: Optional[int] = None,
+) -> None:
+    with GridWriter(path, fmt, compresslevel=compresslevel) as writer:
+        writer.write_many(grids)
+        if writer.fmt == "txt" and writer.count == 0:
+            writer._handle.write("\n")  # an empty txt list has always been one blank line
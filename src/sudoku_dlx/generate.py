@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import random
+from time import perf_counter
 from typing import Optional, Union
 
+from . import metrics as _metrics
 from .api import Grid, count_solutions, is_valid, solve
+from .grid81 import to_rows
 
 Symmetry = str  # "none" | "rot180" | "mix"
 
@@ -38,7 +41,7 @@ def _random_full_solution(seed: Optional[int]) -> Grid:
     result = solve(grid)
     if result is None:
         raise RuntimeError("Failed to construct a full solution")
-    return result.grid
+    return to_rows(result.grid)
 
 
 def _rot180(r: int, c: int) -> tuple[int, int]:
@@ -162,6 +165,8 @@ def generate(
     - symmetry: "none" | "rot180" | "mix"
     """
 
+    reg = _metrics.ACTIVE
+    t0 = perf_counter() if reg is not None else 0.0
     rng = random.Random(seed)
     full = _random_full_solution(seed)
     puzzle = [row[:] for row in full]
@@ -192,6 +197,8 @@ def generate(
 
     if minimal:
         _make_minimal(puzzle)
+    if reg is not None:
+        reg.observe_call("generate", perf_counter() - t0)
     return puzzle
 
 
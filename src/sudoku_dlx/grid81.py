@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+"""Compact grid: 81 cell values (0 = blank) in one byte buffer.
+
+:class:`Grid81` wraps any bytes-like object of 81 cell values without copying it
+(``bytes``, ``bytearray``, ``array('B')``, ``mmap`` or a ``memoryview`` slice of a larger
+buffer), so a batch of puzzles can live in one buffer and be handed out grid by grid.
+It also reads like the list form: ``grid[r][c]``, ``for row in grid`` and ``len(grid) == 9``
+all work, rows being ``memoryview`` slices. :func:`~sudoku_dlx.api.solve`,
+:func:`~sudoku_dlx.api.count_solutions`, :func:`~sudoku_dlx.canonical.canonical_form`,
+:func:`~sudoku_dlx.rating.rate` and :func:`~sudoku_dlx.explain.explain` accept either form;
+solve returns a ``Grid81`` solution for a ``Grid81`` puzzle.
+
+The text helpers here are the package's parsers: :func:`text_to_cells` (behind
+``from_string``) and :func:`parse_many` translate whole strings or read buffers with
+``bytes.translate`` tables instead of walking characters, and :func:`rows_to_text` formats.
+"""
+
+from itertools import chain
+from typing import Iterator, List, Sequence, Tuple, Union
+
+Text = Union[str, bytes, bytearray, memoryview]
+
+
+def _cell_table(blanks: bytes, keep: bytes = b"") -> bytes:
+    """bytes.translate table: digits 1-9 -> 1..9, ``blanks`` -> 0, ``keep`` unchanged, else 0xFF."""
+    table = bytearray(b"\xff" * 256)
+    for ch in blanks:
+        table[ch] = 0
+    for ch in b"123456789":
+        table[ch] = ch - 48
+    for ch in keep:
+        table[ch] = ch
+    return bytes(table)
+
+
+# ASCII text -> cell values (".0-_" = blank); anything else maps to 0xFF and is rejected
+_CELL_OF = _cell_table(b".0-_")
+# the same for parse_many, which keeps newlines as line separators (10 is not a cell value)
+_BULK_OF = _cell_table(b".0-_", keep=b"\n")
+_SPACES = b" \t\r\f\v"
+# cell values -> ASCII text (blanks as ".")
+_TEXT_OF = bytes.maketrans(bytes(range(10)), b".123456789")
+
+
+def text_to_cells(text: Text, table: bytes = _CELL_OF) -> bytes:
+    """
+    81 cell values from an 81-character grid (1-9, or . 0 - _ for blanks; whitespace ignored).
+
+    One ``bytes.translate`` plus a scan for rejected characters; whitespace is only stripped
+    when the fast path fails. Raises ValueError like :func:`~sudoku_dlx.api.from_string`.
+    """
+    data = text.encode("ascii", "replace") if isinstance(text, str) else bytes(text)
+    cells = data.translate(table)
+    if len(cells) == 81 and cells.find(b"\xff") == -1:
+        return cells
+    if isinstance(text, str):
+        text = "".join(text.split())
+        data = text.encode("ascii", "replace")
+    else:
+        data = b"".join(data.split())
+        text = data.decode("latin-1")
+    if len(data) != 81:
+        raise ValueError("grid string must be 81 characters")
+    out = bytearray(data.translate(table))
+    bad = out.find(0xFF)
+    while bad != -1:
+        ch = text[bad]
+        if not ch.isdigit():
+            raise ValueError(f"bad char at {bad}: {ch!r}")
+        value = int(ch)  # non-ASCII decimal digits, as str.isdigit/int accept them
+        if not 1 <= value <= 9:
+            raise ValueError("digits must be 1..9")
+        out[bad] = value
+        bad = out.find(0xFF, bad + 1)
+    return bytes(out)
+
+
+def rows_to_text(grid: Sequence[Sequence[int]]) -> str:
+    """81-char string of a 9x9 grid of ints (dots for blanks) via one ``bytes.translate``."""
+    try:
+        cells = bytes(chain.from_iterable(grid))
+    except (TypeError, ValueError):
+        cells = b""
+    if len(cells) == 81 and max(cells) <= 9:
+        return cells.translate(_TEXT_OF).decode("ascii")
+    # unusual cells (str digits, values > 9): the per-cell formatting
+    return "".join(str(x) if x != 0 else "." for row in grid for x in row)
+
+
+# flat index -> (r, c)
+_RC: Tuple[Tuple[int, int], ...] = tuple(divmod(i, 9) for i in range(81))
+
+
+class Grid81:
+    """81 cell values in a byte buffer, viewed zero-copy; see the module docstring."""
+
+    __slots__ = ("cells",)
+
+    def __init__(self, cells: Union[bytes, bytearray, memoryview, None] = None) -> None:
+        """
+        Wrap ``cells`` (81 values 0..9, any bytes-like object) without copying.
+
+        The grid is writable exactly when the buffer is; ``Grid81()`` is an empty, writable grid.
+        """
+        view = memoryview(bytearray(81) if cells is None else cells).cast("B")
+        if len(view) != 81:
+            raise ValueError(f"expected 81 cells, got {len(view)}")
+        if max(view) > 9:
+            raise ValueError("cell values must be 0..9")
+        self.cells = view
+
+    @classmethod
+    def from_text(cls, text: Text) -> "Grid81":
+        """Parse 81 characters (1-9, or . 0 - _ for blanks) with one ``bytes.translate``."""
+        return cls._wrap(text_to_cells(text))
+
+    @classmethod
+    def _wrap(cls, cells: bytes) -> "Grid81":
+        # cells already validated (81 values 0..9)
+        grid = cls.__new__(cls)
+        grid.cells = memoryview(cells)
+        return grid
+
+    @classmethod
+    def from_grid(cls, grid: Union[Sequence[Sequence[int]], "Grid81"]) -> "Grid81":
+        """Copy a 9x9 list grid (or another Grid81) into a new, writable Grid81."""
+        if isinstance(grid, Grid81):
+            return grid.copy()
+        return cls(bytearray(v for row in grid for v in row))
+
+    def copy(self) -> "Grid81":
+        """Writable copy with its own buffer."""
+        return Grid81(bytearray(self.cells))
+
+    def to_string(self) -> str:
+        return self.cells.tobytes().translate(_TEXT_OF).decode("ascii")
+
+    def to_grid(self) -> List[List[int]]:
+        """New 9x9 list grid."""
+        cells = self.cells
+        return [list(cells[i : i + 9]) for i in range(0, 81, 9)]
+
+    def clues(self) -> List[Tuple[int, int, int]]:
+        """``(r, c, v)`` for every filled cell, row-major (as ``solver.grid_clues``)."""
+        return [(*_RC[i], v) for i, v in enumerate(self.cells) if v]
+
+    def givens(self) -> int:
+        return 81 - self.cells.tobytes().count(0)
+
+    def __bytes__(self) -> bytes:
+        return self.cells.tobytes()
+
+    def __len__(self) -> int:
+        return 9
+
+    def __getitem__(self, r: int) -> memoryview:
+        if not -9 <= r < 9:
+            raise IndexError("row index out of range")
+        r %= 9
+        return self.cells[r * 9 : r * 9 + 9]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        cells = self.cells
+        for i in range(0, 81, 9):
+            yield cells[i : i + 9]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Grid81):
+            return self.cells == other.cells
+        if isinstance(other, list):
+            return self.to_grid() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]  # may be backed by a writable buffer
+
+    def __repr__(self) -> str:
+        return f"Grid81({self.to_string()!r})"
+
+
+def parse_many(buffer: Text, *, strict: bool = True) -> List[Grid81]:
+    """
+    Parse a whole buffer of newline-separated grids (e.g. one ``read()`` of a txt file).
+
+    The buffer is translated to cell values in a single ``bytes.translate`` (which also drops
+    spaces, tabs and ``\\r``) and split once; blank lines are skipped. A line that is not 81
+    valid cells raises ValueError naming its line number, or is skipped when ``strict`` is False.
+    """
+    if isinstance(buffer, str):
+        data = buffer.encode("ascii", "replace")
+    else:
+        data = buffer if isinstance(buffer, bytes) else bytes(buffer)
+    wrap = Grid81._wrap
+    out: List[Grid81] = []
+    for n, line in enumerate(data.translate(_BULK_OF, _SPACES).split(b"\n"), 1):
+        if len(line) == 81 and 255 not in line:
+            out.append(wrap(line))
+        elif line and strict:
+            what = f"{len(line)} cells" if len(line) != 81 else "a bad character"
+            raise ValueError(f"line {n}: expected 81 grid characters, got {what}")
+    return out
+
+
+def to_rows(grid: Union[Sequence[Sequence[int]], Grid81]) -> List[List[int]]:
+    """Fresh 9x9 list copy of either grid form (for code that mutates its working grid)."""
+    if isinstance(grid, Grid81):
+        return grid.to_grid()
+    return [list(row) for row in grid]
+
+
+__all__ = ["Grid81", "parse_many", "rows_to_text", "text_to_cells", "to_rows"]
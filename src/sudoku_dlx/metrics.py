@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+"""Optional in-process metrics with Prometheus text exposition.
+
+Metrics are off by default: :data:`ACTIVE` is ``None`` and instrumented calls pay one attribute
+check. :func:`enable_metrics` installs a :class:`MetricsRegistry` that records
+
+- ``sudoku_dlx_calls_total{op}`` and ``sudoku_dlx_call_seconds{op}`` (histogram) for
+  solve, count, rate, canonical, explain and generate
+- ``sudoku_dlx_search_nodes_total{op}`` and ``sudoku_dlx_search_nodes{op}`` (histogram)
+  for the DLX searches behind solve and count
+- ``sudoku_dlx_cache_total{cache, result}`` (rating cache hits and misses)
+- ``sudoku_dlx_budget_timeouts_total{endpoint}`` (``serve`` requests over budget)
+
+and :func:`dump_metrics` renders them in the Prometheus text format.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+NODE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+LabelKey = Tuple[str, ...]
+
+
+def _fmt(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _percentile(xs: Sequence[float], p: float) -> float:
+    """Linear-interpolated percentile of sorted ``xs`` (0.0 when empty)."""
+    if not xs:
+        return 0.0
+    k = (len(xs) - 1) * p
+    f = int(k)
+    c = min(f + 1, len(xs) - 1)
+    return xs[f] + (xs[c] - xs[f]) * (k - f)
+
+
+def _labels(names: Sequence[str], values: LabelKey, extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        for key in sorted(self._values):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_fmt(self._values[key])}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label key: [bucket counts..., sum, count]
+        self._values: Dict[LabelKey, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        row = self._values.get(labels)
+        return int(row[-1]) if row else 0
+
+    def samples(self) -> Iterable[str]:
+        for key in sorted(self._values):
+            row = self._values[key]
+            running = 0.0
+            for bound, n in zip(self.buckets, row):
+                running += n
+                le = f'le="{_fmt(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {_fmt(running)}"
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {_fmt(row[-1])}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(row[-2])}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {_fmt(row[-1])}"
+
+
+class MetricsRegistry:
+    """Named counters and histograms plus the package's standard series."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self.calls = self.counter("sudoku_dlx_calls_total", "Calls by operation.", ("op",))
+        self.call_seconds = self.histogram(
+            "sudoku_dlx_call_seconds", "Call latency in seconds by operation.", ("op",)
+        )
+        self.nodes_total = self.counter(
+            "sudoku_dlx_search_nodes_total", "DLX search nodes visited by operation.", ("op",)
+        )
+        self.nodes = self.histogram(
+            "sudoku_dlx_search_nodes", "DLX search nodes per call by operation.", ("op",), NODE_BUCKETS
+        )
+        self.cache = self.counter(
+            "sudoku_dlx_cache_total", "Cache lookups by cache and result (hit/miss).", ("cache", "result")
+        )
+        self.timeouts = self.counter(
+            "sudoku_dlx_budget_timeouts_total", "Requests that exceeded their time budget.", ("endpoint",)
+        )
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Counter(name, help, labelnames)
+        if not isinstance(metric, Counter):
+            raise ValueError(f"{name} is already registered as a {metric.kind}")  # type: ignore[attr-defined]
+        return metric
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Histogram(name, help, labelnames, buckets)
+        if not isinstance(metric, Histogram):
+            raise ValueError(f"{name} is already registered as a {metric.kind}")  # type: ignore[attr-defined]
+        return metric
+
+    def observe_call(self, op: str, seconds: float, nodes: Optional[int] = None) -> None:
+        self.calls.inc(1, op)
+        self.call_seconds.observe(seconds, op)
+        if nodes is not None:
+            self.nodes_total.inc(nodes, op)
+            self.nodes.observe(nodes, op)
+
+    def exposition(self) -> str:
+        """All series in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")  # type: ignore[attr-defined]
+            lines.append(f"# TYPE {name} {metric.kind}")  # type: ignore[attr-defined]
+            lines.extend(metric.samples())  # type: ignore[attr-defined]
+        return "\n".join(lines) + "\n"
+
+
+# The registry instrumented calls report to; None = metrics disabled (the default).
+ACTIVE: Optional[MetricsRegistry] = None
+
+
+def enable_metrics(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """Start recording into ``registry`` (a fresh one by default) and return it."""
+    global ACTIVE
+    ACTIVE = registry if registry is not None else MetricsRegistry()
+    return ACTIVE
+
+
+def disable_metrics() -> None:
+    """Stop recording; instrumented calls go back to a single attribute check."""
+    global ACTIVE
+    ACTIVE = None
+
+
+def dump_metrics() -> str:
+    """Text exposition of the active registry ("" when metrics are disabled)."""
+    return ACTIVE.exposition() if ACTIVE is not None else ""
+
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "LATENCY_BUCKETS",
+    "NODE_BUCKETS",
+    "enable_metrics",
+    "disable_metrics",
+    "dump_metrics",
+]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+"""cProfile for whole CLI runs, including ``--parallel`` pool workers (``sudoku-dlx --profile``).
+
+:class:`Profiler` profiles the calling process while active and is published as :data:`ACTIVE`;
+pools created through :func:`worker_pool` then start a profiler in every worker, which writes
+its stats to a scratch directory when the worker exits (normally or via ``Pool.terminate``).
+On exit the parent and worker stats are merged into one pstats file and, optionally, a top-N
+summary sorted by cumulative time is printed.
+"""
+
+import cProfile
+import multiprocessing as mp
+import os
+import pstats
+import shutil
+import signal
+import sys
+import tempfile
+from typing import IO, Any, List, Optional, Tuple
+
+# The profiler of the running CLI command; None = profiling disabled (the default).
+ACTIVE: Optional["Profiler"] = None
+
+# (profile, stats path) of a profiled pool worker
+_WORKER: Optional[Tuple[cProfile.Profile, str]] = None
+
+
+def _dump_worker() -> None:
+    global _WORKER
+    if _WORKER is None:
+        return
+    # a worker may finish normally while terminate() is already on its way; don't die mid-write
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    (prof, path), _WORKER = _WORKER, None
+    prof.disable()
+    prof.dump_stats(path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def _on_sigterm(signum: int, frame: Any) -> None:
+    _dump_worker()
+    os._exit(0)
+
+
+def _init_worker(out_dir: str) -> None:
+    global _WORKER
+    if ACTIVE is not None:  # forked copy of the parent's profiler, still enabled
+        ACTIVE.profile.disable()
+    from multiprocessing.util import Finalize
+
+    path = os.path.join(out_dir, f"worker-{os.getpid()}.prof")
+    # close()/join() lets workers run their finalizers; terminate() sends SIGTERM
+    Finalize(None, _dump_worker, exitpriority=100)
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    prof = cProfile.Profile()
+    _WORKER = prof, path
+    prof.enable()
+
+
+def worker_pool(processes: int) -> Any:
+    """``multiprocessing.Pool(processes)`` whose workers are profiled while :data:`ACTIVE` is set."""
+    if ACTIVE is None:
+        return mp.Pool(processes=processes)
+    return mp.Pool(processes=processes, initializer=_init_worker, initargs=(ACTIVE.worker_dir,))
+
+
+class Profiler:
+    """
+    Profile the current process (and :func:`worker_pool` workers) between enter and exit.
+
+    ``path`` receives the merged pstats (``python -m pstats PATH``); ``top`` > 0 prints the
+    ``top`` entries by cumulative time to ``stream`` (stderr by default).
+    """
+
+    def __init__(self, path: Optional[str] = None, *, top: int = 0, stream: Optional[IO[str]] = None) -> None:
+        if top < 0:
+            raise ValueError("top must be >= 0")
+        self.path = path
+        self.top = top
+        self.stream = stream
+        self.profile = cProfile.Profile()
+        self.worker_dir = ""
+        self.workers = 0
+        self.stats: Optional[pstats.Stats] = None
+
+    def __enter__(self) -> "Profiler":
+        global ACTIVE
+        if ACTIVE is not None:
+            raise ValueError("a Profiler is already active")
+        self.worker_dir = tempfile.mkdtemp(prefix="sudoku-dlx-prof-")
+        ACTIVE = self
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        global ACTIVE
+        self.profile.disable()
+        ACTIVE = None
+        try:
+            self.stats = self._merge()
+        finally:
+            shutil.rmtree(self.worker_dir, ignore_errors=True)
+        if self.path:
+            self.stats.dump_stats(self.path)
+        if self.top:
+            self.report(self.top)
+
+    def _merge(self) -> pstats.Stats:
+        stats = pstats.Stats(self.profile)
+        files: List[str] = sorted(f for f in os.listdir(self.worker_dir) if f.endswith(".prof"))
+        for name in files:
+            stats.add(os.path.join(self.worker_dir, name))
+        self.workers = len(files)
+        return stats
+
+    def report(self, top: int) -> None:
+        """Print the ``top`` entries by cumulative time (after exit)."""
+        stream = self.stream if self.stream is not None else sys.stderr
+        if self.stats is None:
+            raise ValueError("profile not finished yet")
+        where = f" -> {self.path}" if self.path else ""
+        print(f"# profile: parent + {self.workers} worker(s){where}", file=stream)
+        self.stats.stream = stream  # type: ignore[attr-defined]
+        self.stats.files = []  # type: ignore[attr-defined]  # worker scratch files are gone
+        self.stats.sort_stats("cumulative").print_stats(top)
+
+
+__all__ = ["Profiler", "worker_pool"]
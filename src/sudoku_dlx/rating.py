@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import math
 from itertools import permutations, product
+from time import perf_counter
+
+from . import metrics as _metrics
 from .api import Grid, solve, to_string, is_valid, from_string
 from .canonical import canonical_form
+from .grid81 import Grid81, to_rows
+from .strategies import apply_all_eliminations, apply_all_singles, candidates
 
 
-def _clone(grid: Grid) -> Grid:
-    return [row[:] for row in grid]
+def _clone(grid: Grid | Grid81) -> Grid:
+    return to_rows(grid)
 
 
 def _rot90(g: Grid) -> Grid:
@@ -53,6 +58,24 @@ _PERM3 = list(permutations((0, 1, 2)))
 
 _RATING_CACHE: dict[str, float] = {}
 
+_METHODS = ("dlx", "strategies")
+
+# Elimination rungs of the strategy ladder with their base score; singles score
+# 1.0 (naked) / 1.5 (hidden) and a puzzle the ladder cannot finish starts at _BEYOND_LADDER.
+_SINGLE_LEVEL = {"naked_single": 1.0, "hidden_single": 1.5}
+_RUNGS = (
+    ("locked_candidates_pointing", 2.5),
+    ("box_line_claiming", 2.8),
+    ("naked_pair", 3.2),
+    ("hidden_pair", 3.6),
+    ("x_wing", 4.2),
+    ("naked_triple", 4.4),
+    ("hidden_triple", 4.8),
+    ("swordfish", 5.4),
+    ("simple_coloring", 6.0),
+)
+_BEYOND_LADDER = 7.0
+
 
 def _canonical_signature(grid: Grid) -> str:
     """Stable key despite canonical_form cycling on unsolved puzzles."""
@@ -149,9 +172,62 @@ def _find_valid_isomorph(grid: Grid) -> Grid | None:
     return None
 
 
-def rate(grid: Grid) -> float:
+def _rate_strategies(grid: Grid | Grid81) -> float:
+    """Score from the hardest ladder technique needed plus the number of rounds."""
+    if not is_valid(grid):
+        return 10.0
+    g = _clone(grid)
+    empties = sum(1 for row in g for v in row if v == 0)
+    if empties == 0:
+        return 0.0
+    cand = candidates(g)
+    hardest = 0.0
+    sweeps = 0
+    rounds = 0
+    # Every round works on one candidates snapshot so the counts are free of scan order
+    # (and hence of cell positions): a sweep places every single of the snapshot, otherwise
+    # the lowest rung that applies removes all of its eliminations at once.
+    while True:
+        m = apply_all_singles(g, cand)
+        if m:
+            sweeps += 1
+            for p in m["placements"]:
+                hardest = max(hardest, _SINGLE_LEVEL[p["strategy"]])
+            continue
+        for name, level in _RUNGS:
+            if apply_all_eliminations(name, g, cand):
+                rounds += 1
+                hardest = max(hardest, level)
+                break
+        else:
+            break
+    left = sum(1 for r in range(9) for c in range(9) if g[r][c] == 0)
+    if any(g[r][c] == 0 and not cand[r][c] for r in range(9) for c in range(9)) or not is_valid(g):
+        return 10.0  # the givens contradict each other
+    if left:
+        score = _BEYOND_LADDER + 3.0 * left / empties
+    else:
+        # both terms stay below 1.0 so tiers never overlap
+        score = (
+            hardest
+            + 0.5 * min(sweeps / 30.0, 1.0)
+            + 0.5 * min(math.log1p(rounds) / math.log1p(20), 1.0)
+        )
+    return round(min(score, 10.0), 1)
+
+
+def rate(grid: Grid | Grid81, method: str = "dlx") -> float:
     """
     Difficulty v2 (deterministic, invariant under isomorphisms), range [0,10].
+
+    ``method="dlx"`` (default) scores the DLX search effort described below.
+    ``method="strategies"`` scores the human-strategy ladder instead: the hardest
+    technique needed sets the tier (singles ~1-2, locked candidates/pairs ~3-4,
+    fish/triples ~4-6, coloring ~6-7, beyond the ladder 7-10), and the number of
+    singles sweeps and elimination rounds refines it within the tier. Each sweep or round
+    applies everything one candidates snapshot allows, which keeps the score invariant
+    under isomorphisms without computing a canonical form.
+
     Features:
       - f_gaps:    Empties proportion (81 - givens)
       - f_nodes:   log-scaled node count from the DLX search
@@ -162,10 +238,26 @@ def rate(grid: Grid) -> float:
       - We avoid timing-based features (ms) for stability across machines.
       - If unsolvable, return 10.0.
     """
+    if method not in _METHODS:
+        raise ValueError(f"unknown rating method: {method!r} (expected one of {', '.join(_METHODS)})")
+    rate_fn = _rate_strategies if method == "strategies" else _rate_dlx
+    reg = _metrics.ACTIVE
+    if reg is None:
+        return rate_fn(grid)
+    t0 = perf_counter()
+    score = rate_fn(grid)
+    reg.observe_call("rate", perf_counter() - t0)
+    return score
+
+
+def _rate_dlx(grid: Grid | Grid81) -> float:
     # Copy grid for safety; compute givens/empties
     g = _clone(grid)
     signature = _canonical_signature(g)
     cached = _RATING_CACHE.get(signature)
+    reg = _metrics.ACTIVE
+    if reg is not None:
+        reg.cache.inc(1, "rating", "miss" if cached is None else "hit")
     if cached is not None:
         return cached
     givens = sum(1 for r in range(9) for c in range(9) if g[r][c] != 0)
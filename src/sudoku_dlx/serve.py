@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+"""Local solver service (``sudoku-dlx serve``): HTTP/JSON over asyncio with a warm worker pool.
+
+Endpoints (JSON bodies, JSON responses):
+
+- ``POST /solve``     ``{"grid"}`` -> ``{"solution", "stats"}``
+- ``POST /count``     ``{"grid", "limit"=2}`` -> ``{"count"}``
+- ``POST /analyze``   ``{"grid"}`` -> :func:`~sudoku_dlx.api.analyze` dict
+- ``POST /rate``      ``{"grid", "method"="dlx"}`` -> ``{"score"}``
+- ``POST /canonical`` ``{"grid"}`` -> ``{"canonical"}``
+- ``POST /explain``   ``{"grid", "max_steps"=200, "bulk_singles"=false, "solution"=true}``
+  -> explain dict
+- ``POST /generate``  ``{"seed", "givens"=28, "minimal"=false, "symmetry"="mix"}`` -> ``{"grid"}``
+- ``POST /batch``     ``{"requests": [{"op", ...}, ...]}`` -> ``{"results": [...]}`` (same order)
+- ``GET /health``     -> ``{"ok", "workers", "version"}``
+- ``GET /metrics``    -> Prometheus text: requests, latency, budget timeouts, worker restarts
+
+Requests run on worker processes that are started and warmed (imports, solver tables, a first
+solve) before the socket opens. Each request gets a wall-clock budget, both to wait for a free
+worker and to run on it: past either it is a 504, and a worker still busy with it is killed and
+replaced by a fresh warm one. ``count``/``explain``/batch sizes are capped.
+Bad input is a 400 with ``{"error"}``; any other failure is a 500 with the same body.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import os
+import signal
+import sys
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics import MetricsRegistry
+
+if TYPE_CHECKING:
+    from .api import Grid
+
+SERVE_VERSION = "serve-1"
+
+MAX_BODY = 1 << 20
+MAX_COUNT_LIMIT = 1000
+MAX_EXPLAIN_STEPS = 1000
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+# ------------------------------ worker side ------------------------------
+
+def _grid_arg(payload: Dict[str, Any]) -> Grid:
+    from .api import from_string, is_valid
+
+    text = payload.get("grid")
+    if not isinstance(text, str):
+        raise ValueError("'grid' must be an 81-char string")
+    grid = from_string(text)
+    if not is_valid(grid):
+        raise ValueError("invalid grid (duplicate in row/col/box)")
+    return grid
+
+
+def _int_arg(payload: Dict[str, Any], key: str, default: int, lo: int, hi: int) -> int:
+    value = payload.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not lo <= value <= hi:
+        raise ValueError(f"'{key}' must be an integer in [{lo}, {hi}]")
+    return value
+
+
+def _bool_arg(payload: Dict[str, Any], key: str, default: bool) -> bool:
+    value = payload.get(key, default)
+    if not isinstance(value, bool):
+        raise ValueError(f"'{key}' must be true or false")
+    return value
+
+
+def dispatch(op: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one service operation in this process; raises ValueError for bad input."""
+    from .api import analyze, count_solutions, solve, to_string
+    from .canonical import canonical_form
+    from .explain import explain
+    from .generate import generate
+    from .rating import rate
+
+    if op == "solve":
+        res = solve(_grid_arg(payload))
+        if res is None:
+            return {"solution": None, "stats": None}
+        st = res.stats
+        return {
+            "solution": to_string(res.grid),
+            "stats": {"ms": round(st.ms, 3), "nodes": st.nodes, "backtracks": st.backtracks},
+        }
+    if op == "count":
+        limit = _int_arg(payload, "limit", 2, 1, MAX_COUNT_LIMIT)
+        return {"count": count_solutions(_grid_arg(payload), limit=limit)}
+    if op == "analyze":
+        # invalid grids are rejected up front: analyze() would search them to exhaustion
+        return analyze(_grid_arg(payload))
+    if op == "rate":
+        return {"score": rate(_grid_arg(payload), method=payload.get("method", "dlx"))}
+    if op == "canonical":
+        return {"canonical": canonical_form(_grid_arg(payload))}
+    if op == "explain":
+        steps = _int_arg(payload, "max_steps", 200, 1, MAX_EXPLAIN_STEPS)
+        return explain(
+            _grid_arg(payload),
+            max_steps=steps,
+            bulk_singles=_bool_arg(payload, "bulk_singles", False),
+            solution=_bool_arg(payload, "solution", True),
+        )
+    if op == "generate":
+        seed = payload.get("seed")
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+            raise ValueError("'seed' must be an integer")
+        symmetry = payload.get("symmetry", "mix")
+        if symmetry not in ("none", "rot180", "mix"):
+            raise ValueError("'symmetry' must be one of none, rot180, mix")
+        grid = generate(
+            seed=seed,
+            target_givens=_int_arg(payload, "givens", 28, 17, 81),
+            minimal=_bool_arg(payload, "minimal", False),
+            symmetry=symmetry,
+        )
+        return {"grid": to_string(grid)}
+    raise ValueError(f"unknown op: {op!r}")
+
+
+OPS = ("solve", "count", "analyze", "rate", "canonical", "explain", "generate")
+
+
+def _internal_error(exc: BaseException) -> Dict[str, Any]:
+    return {"error": f"internal error: {type(exc).__name__}"}
+
+
+def _run(op: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    try:
+        return 200, dispatch(op, payload)
+    except ValueError as exc:
+        return 400, {"error": str(exc)}
+    except Exception as exc:  # a bug or resource error must not take the connection down
+        return 500, _internal_error(exc)
+
+
+def _run_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for item in items:
+        status, body = _run(str(item.get("op")), item)
+        out.append(body if status == 200 else {"error": body["error"]})
+    return out
+
+
+def _warm_worker() -> None:
+    # pay for imports, the exact-cover tables and first-call caches once per worker
+    from .api import from_string, solve
+    from .canonical import canonical_form
+
+    grid = from_string("53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79")
+    solve(grid)
+    canonical_form(grid)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# ------------------------------ server side ------------------------------
+
+class _Worker:
+    """One warm worker: a single-process executor (or the thread of ``workers=0``) and its pid."""
+
+    __slots__ = ("executor", "pid")
+
+    def __init__(self, executor: concurrent.futures.Executor, pid: Optional[int]) -> None:
+        self.executor = executor
+        self.pid = pid
+
+
+class SolverServer:
+    """
+    asyncio HTTP/1.1 (keep-alive) JSON server in front of a pool of warm worker processes.
+
+    Each worker is its own one-process executor, handed to one request at a time. A request
+    that runs past the budget gets a 504 and its worker is killed and replaced by a freshly
+    warmed one, so runaway requests cannot pile up on the pool. ``workers=0`` runs requests
+    on one thread in the server process instead (tests, debugging); that thread cannot be
+    killed, so there the budget only bounds how long the client waits.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        *,
+        workers: Optional[int] = None,
+        budget_ms: int = 10_000,
+        max_batch: int = 256,
+    ) -> None:
+        if workers is not None and workers < 0:
+            raise ValueError("workers must be >= 0")
+        if budget_ms <= 0:
+            raise ValueError("budget_ms must be > 0")
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.host = host
+        self.port = port
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.budget_s = budget_ms / 1000.0
+        self.max_batch = max_batch
+        self._idle: Optional[asyncio.Queue[_Worker]] = None
+        self._live: set[_Worker] = set()
+        self._respawns: set[asyncio.Task[None]] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        # request-level series, measured in the server process
+        self.metrics = MetricsRegistry()
+        self._requests = self.metrics.counter(
+            "sudoku_dlx_requests_total", "HTTP requests by endpoint and status.", ("endpoint", "status")
+        )
+        self._request_seconds = self.metrics.histogram(
+            "sudoku_dlx_request_seconds", "HTTP request latency in seconds by endpoint.", ("endpoint",)
+        )
+        self._restarts = self.metrics.counter(
+            "sudoku_dlx_worker_restarts_total", "Workers replaced after exceeding the budget."
+        )
+
+    async def _spawn(self) -> _Worker:
+        loop = asyncio.get_running_loop()
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=1, initializer=_warm_worker)
+        # start and warm the process now rather than on first use
+        worker = _Worker(executor, await loop.run_in_executor(executor, _ping))
+        self._live.add(worker)
+        return worker
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._idle = asyncio.Queue()
+        if self.workers == 0:
+            thread = _Worker(concurrent.futures.ThreadPoolExecutor(max_workers=1), None)
+            await loop.run_in_executor(thread.executor, _warm_worker)
+            self._live.add(thread)
+            self._idle.put_nowait(thread)
+        else:
+            for worker in await asyncio.gather(*(self._spawn() for _ in range(self.workers))):
+                self._idle.put_nowait(worker)
+        self._server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in self._respawns:
+            task.cancel()
+        for worker in self._live:
+            worker.executor.shutdown(wait=False, cancel_futures=True)
+        self._live.clear()
+        self._idle = None
+
+    def _retire(self, worker: _Worker) -> None:
+        """Kill a worker that is stuck on an over-budget call and start its replacement."""
+        if worker.pid is None:  # the workers=0 thread cannot be stopped; keep using it
+            if self._idle is not None:
+                self._idle.put_nowait(worker)
+            return
+        self._live.discard(worker)
+        try:
+            os.kill(worker.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        worker.executor.shutdown(wait=False, cancel_futures=True)
+        self._restarts.inc()
+        task = asyncio.get_running_loop().create_task(self._respawn())
+        self._respawns.add(task)
+        task.add_done_callback(self._respawns.discard)
+
+    async def _respawn(self) -> None:
+        worker = await self._spawn()
+        if self._idle is None:  # closed meanwhile
+            worker.executor.shutdown(wait=False, cancel_futures=True)
+            return
+        self._idle.put_nowait(worker)
+
+    async def _call(
+        self, fn: Callable[..., Any], *args: Any, deadline: Optional[float] = None
+    ) -> Tuple[int, Any]:
+        """
+        Run ``fn(*args)`` on an idle worker: wait for one until ``deadline`` (default: one
+        budget from now), then let the call run for at most one budget before killing it.
+        Running time gets its own budget so a request that queued for a while does not get
+        a healthy worker killed moments after starting on it.
+        """
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = loop.time() + self.budget_s
+        timed_out = 504, {"error": f"budget of {self.budget_s * 1000:.0f} ms exceeded"}
+        idle = self._idle
+        if idle is None:
+            return 503, {"error": "worker pool unavailable"}
+        try:
+            worker = await asyncio.wait_for(idle.get(), timeout=max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            return timed_out
+        try:
+            fut = loop.run_in_executor(worker.executor, fn, *args)
+            result = await asyncio.wait_for(fut, timeout=self.budget_s)
+        except asyncio.TimeoutError:
+            self._retire(worker)
+            return timed_out
+        except concurrent.futures.BrokenExecutor:
+            self._retire(worker)
+            return 503, {"error": "worker pool unavailable"}
+        except BaseException:
+            idle.put_nowait(worker)
+            raise
+        idle.put_nowait(worker)
+        return 200, result
+
+    async def _route(self, method: str, name: str, body: bytes) -> Tuple[int, Any]:
+        if name == "health":
+            return 200, {"ok": True, "workers": self.workers, "version": SERVE_VERSION}
+        if name == "metrics":
+            return 200, self.metrics.exposition()
+        if name not in OPS and name != "batch":
+            return 404, {"error": f"unknown endpoint: /{name}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"{}")
+        except (ValueError, RecursionError):  # RecursionError: absurdly deep nesting
+            return 400, {"error": "body must be JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "body must be a JSON object"}
+        if name == "batch":
+            items = payload.get("requests")
+            if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+                return 400, {"error": "'requests' must be a list of objects"}
+            if len(items) > self.max_batch:
+                return 413, {"error": f"batch larger than {self.max_batch}"}
+            # spread the batch over the pool in chunks
+            n = max(1, self.workers)
+            size = -(-len(items) // n) if items else 1
+            chunks = [items[i : i + size] for i in range(0, len(items), size)]
+            # one wait deadline for all chunks; each chunk then runs under its own budget
+            deadline = asyncio.get_running_loop().time() + self.budget_s
+            calls = await asyncio.gather(*(self._call(_run_batch, c, deadline=deadline) for c in chunks))
+            for status, outcome in calls:
+                if status != 200:
+                    return status, outcome
+            return 200, {"results": [r for _, part in calls for r in part]}
+        status, outcome = await self._call(_run, name, payload)
+        # outcome is _run's (status, body) unless the call itself failed
+        return outcome if status == 200 else (status, outcome)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.decode("latin-1").split()
+                if len(parts) != 3:
+                    break
+                method, path, version = parts
+                headers: Dict[str, str] = {}
+                result: Any  # a JSON body, or exposition text (str) for /metrics
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = h.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                if length > MAX_BODY:
+                    status, result = 413, {"error": f"body larger than {MAX_BODY} bytes"}
+                    keep = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    name = path.split("?", 1)[0].strip("/")
+                    t0 = perf_counter()
+                    try:
+                        status, result = await self._route(method.upper(), name, body)
+                    except Exception as exc:
+                        status, result = 500, _internal_error(exc)
+                    endpoint = name if name in OPS or name in ("batch", "health", "metrics") else "other"
+                    self._requests.inc(1, endpoint, str(status))
+                    self._request_seconds.observe(perf_counter() - t0, endpoint)
+                    if status == 504:
+                        self.metrics.timeouts.inc(1, endpoint)
+                    conn = headers.get("connection", "").lower()
+                    keep = conn != "close" and (version == "HTTP/1.1" or conn == "keep-alive")
+                if isinstance(result, str):
+                    data, ctype = result.encode("utf-8"), "text/plain; version=0.0.4"
+                else:
+                    data, ctype = json.dumps(result, separators=(",", ":")).encode("utf-8"), "application/json"
+                head = (
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: {ctype}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + data)
+                await writer.drain()
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    *,
+    workers: Optional[int] = None,
+    budget_ms: int = 10_000,
+    max_batch: int = 256,
+) -> None:
+    """Run the service until interrupted (Ctrl-C or SIGTERM)."""
+    server = SolverServer(host, port, workers=workers, budget_ms=budget_ms, max_batch=max_batch)
+
+    async def main() -> None:
+        await server.start()
+        print(f"# serving on http://{server.host}:{server.port} ({server.workers} workers)", file=sys.stderr)
+        stop = asyncio.Event()
+        try:
+            # SIGTERM shuts down like Ctrl-C, so pool workers are not left behind
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        except (NotImplementedError, AttributeError):  # pragma: no cover - Windows
+            pass
+        try:
+            await stop.wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = ["SERVE_VERSION", "OPS", "SolverServer", "dispatch", "serve"]
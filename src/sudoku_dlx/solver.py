@@ -3,9 +3,14 @@ from __future__ import annotations
 
 import random
 from copy import deepcopy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple, Iterable, Optional
 
+from .grid81 import Grid81, _cell_table, rows_to_text, text_to_cells
+
+# legacy parser: only "." and "0" are blanks
+_LEGACY_CELL_OF = _cell_table(b".0")
+
 # ----------------------- Exact-cover mapping -----------------------
 def col_cell(r: int, c: int) -> int: return r * 9 + c                 # 0..80
 def col_row(r: int, v: int) -> int:  return 81 + r * 9 + (v - 1)      # 81..161
@@ -13,27 +18,35 @@ def col_col(c: int, v: int) -> int:  return 162 + c * 9 + (v - 1)     # 162..242
 def col_box(b: int, v: int) -> int:  return 243 + b * 9 + (v - 1)     # 243..323
 def box_of(r: int, c: int) -> int:   return (r // 3) * 3 + (c // 3)
 
+# Built on first search (see _precompute_matrix) so importing the package stays cheap.
 ROW_COLS: List[List[int]] = []
 ROW_PAYLOAD: List[Tuple[int, int, int]] = []
 COL_ROWS_BITS: List[int] = [0] * 324
 RCV_TO_ROWIDX: dict[Tuple[int, int, int], int] = {}
 
 def _precompute_matrix() -> None:
+    """Fill the exact-cover tables in place (idempotent); ROW_COLS is filled last and is the ready flag."""
+    rows: List[List[int]] = []
+    payload: List[Tuple[int, int, int]] = []
+    bits = [0] * 324
+    index: dict[Tuple[int, int, int], int] = {}
     idx = 0
     for r in range(9):
         for c in range(9):
             b = box_of(r, c)
             for v in range(1, 10):
                 cols = [col_cell(r, c), col_row(r, v), col_col(c, v), col_box(b, v)]
-                ROW_COLS.append(cols)
-                ROW_PAYLOAD.append((r, c, v))
-                RCV_TO_ROWIDX[(r, c, v)] = idx
+                rows.append(cols)
+                payload.append((r, c, v))
+                index[(r, c, v)] = idx
                 mask = 1 << idx
                 for col in cols:
-                    COL_ROWS_BITS[col] |= mask
+                    bits[col] |= mask
                 idx += 1
-
-_precompute_matrix()
+    ROW_PAYLOAD[:] = payload
+    COL_ROWS_BITS[:] = bits
+    RCV_TO_ROWIDX.update(index)
+    ROW_COLS[:] = rows
 
 ALL_ROWS_MASK = (1 << 729) - 1
 ALL_COLS_MASK = (1 << 324) - 1
@@ -53,17 +66,54 @@ def clear_bit(x: int, i: int) -> int:
     return x & ~(1 << i)
 
 # --------------------------- Stats ---------------------------
+# the search places at most 81 rows, so depths stay in 0..81
+_MAX_DEPTH = 82
+
 @dataclass
 class Stats:
     nodes: int = 0        # recursion frames visited
     branches: int = 0     # choices made
     max_depth: int = 0
     solutions: int = 0
+    backtracks: int = 0      # rows taken back after their subtree failed
+    dead_ends: int = 0       # chosen columns with no candidate rows left
+    failed_columns: int = 0  # chosen columns whose candidates were all tried without success
+    depth_nodes: list[int] = field(default_factory=lambda: [0] * _MAX_DEPTH)
+    depth_branches: list[int] = field(default_factory=lambda: [0] * _MAX_DEPTH)
+
+    def branching(self) -> list[float]:
+        """Average rows tried per node at each depth 0..max_depth."""
+        return [
+            round(b / n, 3) if n else 0.0
+            for n, b in zip(self.depth_nodes[: self.max_depth + 1], self.depth_branches)
+        ]
+
+# --------------------------- Tracing hooks ---------------------------
+class SearchTracer:
+    """
+    No-op base for BitDLX search hooks; override the events you need.
+
+    Depth 0 covers are the givens (plus prepass singles) applied before the search.
+    Passing a tracer selects a separate traced search loop, so untraced solves pay nothing.
+    """
+
+    def on_choose_col(self, depth: int, col: int, size: int) -> None:
+        """Column ``col`` with ``size`` candidate rows was picked (size 0 = dead end)."""
+
+    def on_cover(self, depth: int, row_idx: int) -> None:
+        """Row ``row_idx`` (see ``ROW_PAYLOAD``) was placed."""
+
+    def on_backtrack(self, depth: int, row_idx: int) -> None:
+        """Row ``row_idx`` was taken back after its subtree failed."""
+
+    def on_solution(self, depth: int, count: int) -> None:
+        """Solution number ``count`` was reached."""
 
 # --------------------------- Bit-DLX core --------------------------
 class BitDLX:
     def __init__(self) -> None:
         self.stats: Stats = Stats()
+        self._first: list[int] = []  # row indices of the first solution found
 
     def _choose_col(self, rows_mask: int, cols_mask: int) -> int | None:
         best_col = None
@@ -102,13 +152,18 @@ class BitDLX:
         found: list[int],
         depth: int = 0,
     ) -> bool:
-        self.stats.nodes += 1
-        if depth > self.stats.max_depth:
-            self.stats.max_depth = depth
+        stats = self.stats
+        stats.nodes += 1
+        stats.depth_nodes[depth] += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
 
         if cols_mask == 0:
             found[0] += 1
-            self.stats.solutions = found[0]
+            stats.solutions = found[0]
+            if keep_one and found[0] == 1:
+                # the path is unwound if the search goes on looking for more solutions
+                self._first = list(collect_sol)
             return found[0] >= limit
 
         c = self._choose_col(rows_mask, cols_mask)
@@ -116,16 +171,70 @@ class BitDLX:
             return False
         cand = COL_ROWS_BITS[c] & rows_mask
         if cand == 0:
+            stats.dead_ends += 1
             return False
+        stats.depth_branches[depth] += cand.bit_count()
         for r in iter_set_bits(cand):
-            self.stats.branches += 1
+            stats.branches += 1
             rows2, cols2 = self._cover_row(rows_mask, cols_mask, r)
             if keep_one:
                 collect_sol.append(r)
             if self._search(rows2, cols2, limit, keep_one, collect_sol, found, depth + 1):
+                # rows after r were never tried
+                stats.depth_branches[depth] -= (cand >> r).bit_count() - 1
                 return True
+            stats.backtracks += 1
             if keep_one:
                 collect_sol.pop()
+        stats.failed_columns += 1
+        return False
+
+    def _search_traced(
+        self,
+        rows_mask: int,
+        cols_mask: int,
+        limit: int,
+        collect_sol: list[int],
+        found: list[int],
+        tracer: SearchTracer,
+        depth: int = 0,
+    ) -> bool:
+        # mirror of _search (keep_one=True) with tracer calls; kept separate so the hot loop stays bare
+        stats = self.stats
+        stats.nodes += 1
+        stats.depth_nodes[depth] += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+
+        if cols_mask == 0:
+            found[0] += 1
+            stats.solutions = found[0]
+            tracer.on_solution(depth, found[0])
+            if found[0] == 1:
+                self._first = list(collect_sol)
+            return found[0] >= limit
+
+        c = self._choose_col(rows_mask, cols_mask)
+        if c is None:
+            return False
+        cand = COL_ROWS_BITS[c] & rows_mask
+        tracer.on_choose_col(depth, c, cand.bit_count())
+        if cand == 0:
+            stats.dead_ends += 1
+            return False
+        stats.depth_branches[depth] += cand.bit_count()
+        for r in iter_set_bits(cand):
+            stats.branches += 1
+            rows2, cols2 = self._cover_row(rows_mask, cols_mask, r)
+            collect_sol.append(r)
+            tracer.on_cover(depth + 1, r)
+            if self._search_traced(rows2, cols2, limit, collect_sol, found, tracer, depth + 1):
+                stats.depth_branches[depth] -= (cand >> r).bit_count() - 1
+                return True
+            stats.backtracks += 1
+            collect_sol.pop()
+            tracer.on_backtrack(depth + 1, r)
+        stats.failed_columns += 1
         return False
 
     def count_solutions(
@@ -134,8 +243,12 @@ class BitDLX:
         limit: int = 2,
         *,
         prepass: bool = True,
+        tracer: SearchTracer | None = None,
     ):
-        """Return (count, solution_or_None). prepass=True adds naked-singles propagation."""
+        """
+        Return (count, first_solution_or_None). prepass=True adds naked-singles propagation;
+        ``tracer`` receives the search events (see :class:`SearchTracer`).
+        """
         self.stats = Stats()
         base_clues = clues
 
@@ -146,6 +259,8 @@ class BitDLX:
             if extra:
                 base_clues = clues + extra
 
+        if not ROW_COLS:
+            _precompute_matrix()
         rows_mask = ALL_ROWS_MASK
         cols_mask = ALL_COLS_MASK
         for (r, c, v) in base_clues:
@@ -153,10 +268,16 @@ class BitDLX:
             if row_idx is None or not is_bit_set(rows_mask, row_idx):
                 return 0, None
             rows_mask, cols_mask = self._cover_row(rows_mask, cols_mask, row_idx)
+            if tracer is not None:
+                tracer.on_cover(0, row_idx)
 
         found = [0]
         collect: list[int] = []
-        self._search(rows_mask, cols_mask, limit, keep_one=True, collect_sol=collect, found=found)
+        self._first = []
+        if tracer is None:
+            self._search(rows_mask, cols_mask, limit, keep_one=True, collect_sol=collect, found=found)
+        else:
+            self._search_traced(rows_mask, cols_mask, limit, collect, found, tracer)
 
         if found[0] == 0:
             return 0, None
@@ -164,7 +285,7 @@ class BitDLX:
         grid = [[0] * 9 for _ in range(9)]
         for (rr, cc, vv) in base_clues:
             grid[rr][cc] = vv
-        for row_idx in collect:
+        for row_idx in self._first:
             rr, cc, vv = ROW_PAYLOAD[row_idx]
             grid[rr][cc] = vv
         return found[0], grid
@@ -180,6 +301,8 @@ class BitDLX:
             if extra:
                 base_clues = clues + extra
 
+        if not ROW_COLS:
+            _precompute_matrix()
         rows_mask = ALL_ROWS_MASK
         cols_mask = ALL_COLS_MASK
         for (r, c, v) in base_clues:
@@ -256,7 +379,9 @@ def permute_complete(grid: list[list[int]], *, rng: Optional[random.Random] = No
 def random_complete(*, rng: Optional[random.Random] = None) -> list[list[int]]:
     return permute_complete(latin_base(), rng=rng)
 
-def grid_clues(grid: list[list[int]]) -> list[tuple[int, int, int]]:
+def grid_clues(grid: list[list[int]] | Grid81) -> list[tuple[int, int, int]]:
+    if isinstance(grid, Grid81):
+        return grid.clues()
     return [(r, c, grid[r][c]) for r in range(9) for c in range(9) if grid[r][c] != 0]
 
 def print_grid(g: list[list[int]]):
@@ -268,17 +393,16 @@ def print_grid(g: list[list[int]]):
             print("+-------+-------+-------+")
 
 def from_string(s: str) -> list[list[int]]:
-    s = "".join(ch for ch in s if not ch.isspace())
-    if len(s) != 81:
-        raise ValueError("Grid must be 81 characters (digits 1-9 or . for empty)")
-    g = [[0]*9 for _ in range(9)]
-    for i, ch in enumerate(s):
-        r, c = divmod(i, 9)
-        g[r][c] = 0 if ch == "." else int(ch)
-    return g
+    try:
+        cells = text_to_cells(s, _LEGACY_CELL_OF)
+    except ValueError as exc:
+        if "81 characters" in str(exc):
+            raise ValueError("Grid must be 81 characters (digits 1-9 or . for empty)") from None
+        raise
+    return [list(cells[i:i + 9]) for i in range(0, 81, 9)]
 
 def to_string(g: list[list[int]]) -> str:
-    return "".join("." if g[r][c] == 0 else str(g[r][c]) for r in range(9) for c in range(9))
+    return rows_to_text(g)
 
 def validate_grid(g: list[list[int]]) -> bool:
     rows = [set() for _ in range(9)]
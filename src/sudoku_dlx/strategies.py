@@ -2,8 +2,10 @@ from __future__ import annotations
 
 """Lightweight human strategies:
  - candidates() snapshot
+ - CandidateState (candidates persisted and updated incrementally across steps)
  - naked_single
  - hidden_single (row/col/box)
+ - all singles in one sweep (bulk mode: one batch step per round)
  - locked candidates (pointing: box -> line)
  - box-line claiming (line -> box)
  - naked_pair (row/col/box)
@@ -13,14 +15,25 @@ from __future__ import annotations
  - x_wing (rows/cols)
  - swordfish (rows/cols)
  - simple_coloring (Rule 2 style, one elimination)
+ - all eliminations of one strategy from one snapshot (order-independent, for rating)
+ - StrategyProfile (opt-in per-strategy counters for step_once)
+ - configurable ladder (strategy set/order/cap) and is_solvable_with()
 Deterministic scan order for reproducible explanations.
+
+Kernels work on 9-bit digit masks per cell (bit d-1 = digit d) and 9-bit position
+masks per unit, using precomputed unit/peer tables. The public functions still take
+and mutate the ``cand`` sets, so move dicts are identical to the set-based scans.
 """
 
 import itertools
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from functools import lru_cache
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 Grid = List[List[int]]
 Cand = List[List[Set[int]]]
+# (r, c, digit, move) found by an elimination kernel
+Elimination = Tuple[int, int, int, Dict]
 
 
 def _box_id(r: int, c: int) -> int:
@@ -38,16 +51,89 @@ def _unit_cells(kind: str, idx: int) -> List[Tuple[int, int]]:
     raise ValueError(f"unknown unit kind: {kind}")
 
 
-def _unit_cells_row(r: int) -> List[Tuple[int, int]]:
-    return _unit_cells("row", r)
+def _peers_of(r: int, c: int) -> Tuple[Tuple[int, int], ...]:
+    cells = set(_unit_cells("row", r)) | set(_unit_cells("col", c)) | set(_unit_cells("box", _box_id(r, c)))
+    cells.discard((r, c))
+    return tuple(sorted(cells))
+
+
+# ----- Precomputed tables -----------------------------------------------------------------------
+
+_KINDS = ("row", "col", "box")
+
+# kind -> unit index -> cells of the unit, as (r, c) and as flat r*9+c indices
+_UNIT_CELLS: Dict[str, Tuple[Tuple[Tuple[int, int], ...], ...]] = {
+    kind: tuple(tuple(_unit_cells(kind, i)) for i in range(9)) for kind in _KINDS
+}
+_UNIT_FLAT: Dict[str, Tuple[Tuple[int, ...], ...]] = {
+    kind: tuple(tuple(r * 9 + c for (r, c) in cells) for cells in _UNIT_CELLS[kind])
+    for kind in _KINDS
+}
+
+# flat cell -> (row, col, box) unit membership
+_CELL_UNITS: Tuple[Tuple[int, int, int], ...] = tuple(
+    (i // 9, i % 9, _box_id(i // 9, i % 9)) for i in range(81)
+)
 
+# 20 peers per cell, row-major
+_PEERS: List[List[Tuple[Tuple[int, int], ...]]] = [[_peers_of(r, c) for c in range(9)] for r in range(9)]
+
+# 9-bit mask -> set bit positions (0-based) / digits (1-based), ascending
+_BITS_OF: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(k for k in range(9) if (m >> k) & 1) for m in range(512)
+)
+_DIGITS_OF: Tuple[Tuple[int, ...], ...] = tuple(tuple(k + 1 for k in bits) for bits in _BITS_OF)
+
+# position masks of the three lines inside a box / the three boxes along a line
+_TRIAD = (0b000000111, 0b000111000, 0b111000000)
+_BOX_COL = (0b001001001, 0b010010010, 0b100100100)
+
+
+def _cell_masks(grid: Grid, cand: Cand) -> List[int]:
+    """Flat 81-entry digit masks; filled cells are 0 regardless of ``cand``."""
+    masks = [0] * 81
+    i = 0
+    for r in range(9):
+        grow = grid[r]
+        crow = cand[r]
+        for c in range(9):
+            if grow[c] == 0:
+                m = 0
+                for d in crow[c]:
+                    m |= 1 << (d - 1)
+                masks[i] = m
+            i += 1
+    return masks
 
-def _unit_cells_col(c: int) -> List[Tuple[int, int]]:
-    return _unit_cells("col", c)
 
+def _unit_positions(masks: List[int], flat: Tuple[int, ...]) -> List[int]:
+    """Digit (1..9) -> 9-bit mask of positions within the unit holding that candidate."""
+    pos = [0] * 10
+    for k, i in enumerate(flat):
+        m = masks[i]
+        while m:
+            low = m & -m
+            pos[low.bit_length()] |= 1 << k
+            m ^= low
+    return pos
 
-def _unit_cells_box(b: int) -> List[Tuple[int, int]]:
-    return _unit_cells("box", b)
+
+def _unit_once(masks: List[int], flat: Tuple[int, ...]) -> int:
+    """Digit mask of candidates occurring in exactly one cell of the unit."""
+    once = twice = 0
+    for i in flat:
+        m = masks[i]
+        twice |= once & m
+        once |= m
+    return once & ~twice
+
+
+def _single_triad(pm: int, triads: Tuple[int, int, int]) -> int:
+    """Index of the triad containing every bit of ``pm``, or -1."""
+    for k, t in enumerate(triads):
+        if pm & ~t == 0:
+            return k
+    return -1
 
 
 def candidates(grid: Grid) -> Cand:
@@ -61,94 +147,229 @@ def candidates(grid: Grid) -> Cand:
             if v:
                 rows[r].add(v)
                 cols[c].add(v)
-                boxes[_box_id(r, c)].add(v)
+                boxes[_CELL_UNITS[r * 9 + c][2]].add(v)
     out: Cand = [[set() for _ in range(9)] for _ in range(9)]
     allv = set(range(1, 10))
     for r in range(9):
         for c in range(9):
             if grid[r][c] == 0:
-                out[r][c] = allv - rows[r] - cols[c] - boxes[_box_id(r, c)]
+                out[r][c] = allv - rows[r] - cols[c] - boxes[_CELL_UNITS[r * 9 + c][2]]
     return out
 
 
+class CandidateState:
+    """
+    Grid plus candidate sets that persist across steps.
+
+    Built once with a full :func:`candidates` scan, then kept current by
+    :meth:`place` (clears the cell and removes the digit from its 20 peers) and
+    :meth:`eliminate`. Eliminations found by the ``apply_*`` strategies mutate
+    ``cand`` in place, so they are remembered by later steps instead of being
+    rediscovered from a fresh snapshot.
+    """
+
+    __slots__ = ("grid", "cand")
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        self.cand = candidates(grid)
+
+    def place(self, r: int, c: int, v: int) -> None:
+        self.grid[r][c] = v
+        cand = self.cand
+        cand[r][c].clear()
+        for rr, cc in _PEERS[r][c]:
+            cand[rr][cc].discard(v)
+
+    def eliminate(self, r: int, c: int, v: int) -> None:
+        self.cand[r][c].discard(v)
+
+    def is_solved(self) -> bool:
+        return all(v != 0 for row in self.grid for v in row)
+
+
+class StrategyProfile:
+    """
+    Per-strategy counters filled by ``step_once(..., profile=...)``.
+
+    For every ``apply_*`` call: number of calls, hits (calls that returned a move),
+    cumulative seconds, and the open candidates on the board when the strategy ran
+    (the board size it faced, not how much of it the kernel read before its first hit).
+    ``steps``/``seconds`` cover whole ``step_once`` calls. Keys are strategy names
+    without the ``apply_`` prefix, in ladder order.
+    """
+
+    __slots__ = ("steps", "seconds", "calls", "hits", "times", "open_cands")
+
+    def __init__(self) -> None:
+        self.steps = 0
+        self.seconds = 0.0
+        self.calls: Dict[str, int] = {}
+        self.hits: Dict[str, int] = {}
+        self.times: Dict[str, float] = {}
+        self.open_cands: Dict[str, int] = {}
+
+    def record(self, name: str, hit: bool, seconds: float, open_cands: int) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.hits[name] = self.hits.get(name, 0) + int(hit)
+        self.times[name] = self.times.get(name, 0.0) + seconds
+        self.open_cands[name] = self.open_cands.get(name, 0) + open_cands
+
+    def merge(self, other: "StrategyProfile") -> None:
+        self.steps += other.steps
+        self.seconds += other.seconds
+        for name, calls in other.calls.items():
+            self.calls[name] = self.calls.get(name, 0) + calls
+            self.hits[name] = self.hits.get(name, 0) + other.hits[name]
+            self.times[name] = self.times.get(name, 0.0) + other.times[name]
+            self.open_cands[name] = self.open_cands.get(name, 0) + other.open_cands[name]
+
+    def as_dict(self) -> Dict:
+        return {
+            "steps": self.steps,
+            "seconds": self.seconds,
+            "strategies": {
+                name: {
+                    "calls": calls,
+                    "hits": self.hits[name],
+                    "seconds": self.times[name],
+                    "open_candidates": self.open_cands[name],
+                }
+                for name, calls in self.calls.items()
+            },
+        }
+
+    def report(self) -> str:
+        """Plain-text table, most expensive strategy first."""
+        lines = [
+            f"{'strategy':<28}{'calls':>9}{'hits':>8}{'hit%':>7}{'ms':>10}{'us/call':>9}{'open/call':>11}"
+        ]
+        for name in sorted(self.calls, key=lambda n: -self.times[n]):
+            calls = self.calls[name]
+            hits = self.hits[name]
+            ms = self.times[name] * 1000.0
+            lines.append(
+                f"{name:<28}{calls:>9}{hits:>8}{100.0 * hits / calls:>6.1f}%{ms:>10.2f}"
+                f"{1000.0 * ms / calls:>9.1f}{self.open_cands[name] / calls:>11.1f}"
+            )
+        lines.append(f"steps: {self.steps}  total ms: {self.seconds * 1000.0:.2f}")
+        return "\n".join(lines)
+
+
 # ----- Moves ------------------------------------------------------------------------------------
 
 
-def apply_naked_single(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_naked_single(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
     """If any cell has exactly one candidate, place it."""
-    for r in range(9):
-        for c in range(9):
-            if grid[r][c] == 0 and len(cand[r][c]) == 1:
-                v = next(iter(cand[r][c]))
-                grid[r][c] = v
-                return {"type": "place", "strategy": "naked_single", "r": r, "c": c, "v": v}
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    for i, m in enumerate(masks):
+        if m and m & (m - 1) == 0:
+            r, c = divmod(i, 9)
+            v = m.bit_length()
+            grid[r][c] = v
+            return {"type": "place", "strategy": "naked_single", "r": r, "c": c, "v": v}
     return None
 
 
-def _hidden_single_in_unit(
-    grid: Grid, cand: Cand, cells: List[Tuple[int, int]], unit_kind: str, unit_idx: int
-) -> Optional[Dict]:
-    # map digit -> cells where it can go
-    places: Dict[int, List[Tuple[int, int]]] = {d: [] for d in range(1, 10)}
-    for (r, c) in cells:
-        if grid[r][c] != 0:
-            continue
-        for d in cand[r][c]:
-            places[d].append((r, c))
-    for d in range(1, 10):
-        locs = places[d]
-        if len(locs) == 1:
-            r, c = locs[0]
-            grid[r][c] = d
-            return {
-                "type": "place",
-                "strategy": "hidden_single",
-                "unit": unit_kind,
-                "unit_index": unit_idx,
-                "r": r,
-                "c": c,
-                "v": d,
-            }
+def apply_hidden_single(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    for kind in _KINDS:
+        for idx in range(9):
+            flat = _UNIT_FLAT[kind][idx]
+            single = _unit_once(masks, flat)
+            if single:
+                bit = single & -single
+                d = bit.bit_length()
+                k = next(k for k, i in enumerate(flat) if masks[i] & bit)
+                r, c = _UNIT_CELLS[kind][idx][k]
+                grid[r][c] = d
+                return {
+                    "type": "place",
+                    "strategy": "hidden_single",
+                    "unit": kind,
+                    "unit_index": idx,
+                    "r": r,
+                    "c": c,
+                    "v": d,
+                }
     return None
 
 
-def apply_hidden_single(grid: Grid, cand: Cand) -> Optional[Dict]:
-    # rows
-    for r in range(9):
-        move = _hidden_single_in_unit(grid, cand, _unit_cells("row", r), "row", r)
-        if move:
-            return move
-    # cols
-    for c in range(9):
-        move = _hidden_single_in_unit(grid, cand, _unit_cells("col", c), "col", c)
-        if move:
-            return move
-    # boxes
-    for b in range(9):
-        move = _hidden_single_in_unit(grid, cand, _unit_cells("box", b), "box", b)
-        if move:
-            return move
+def apply_all_singles(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
+    """
+    Place every naked and hidden single visible in the current candidates in one sweep.
+
+    Singles are collected from one snapshot (naked row-major, then hidden by rows,
+    cols, boxes and digit) and placed in that order; ``cand`` is updated for each
+    placement (cell cleared, digit removed from its peers), and a single that an
+    earlier placement invalidated is skipped. Returns one batch move or None.
+    """
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    found: List[Tuple[int, int, int, str]] = []
+    for i, m in enumerate(masks):
+        if m and m & (m - 1) == 0:
+            found.append((i // 9, i % 9, m.bit_length(), "naked_single"))
+    for kind in _KINDS:
+        for idx in range(9):
+            flat = _UNIT_FLAT[kind][idx]
+            single = _unit_once(masks, flat)
+            while single:
+                bit = single & -single
+                single ^= bit
+                k = next(k for k, i in enumerate(flat) if masks[i] & bit)
+                r, c = _UNIT_CELLS[kind][idx][k]
+                found.append((r, c, bit.bit_length(), "hidden_single"))
+    placements: List[Dict] = []
+    for r, c, v, strategy in found:
+        if grid[r][c] != 0 or v not in cand[r][c]:
+            continue
+        grid[r][c] = v
+        cand[r][c].clear()
+        for rr, cc in _PEERS[r][c]:
+            cand[rr][cc].discard(v)
+        placements.append({"strategy": strategy, "r": r, "c": c, "v": v})
+    if not placements:
+        return None
+    return {"type": "place_batch", "strategy": "singles", "placements": placements}
+
+
+def _first(found: Iterator[Elimination], cand: Cand) -> Optional[Dict]:
+    """Apply the first elimination a kernel finds and return its move (the ``apply_*`` contract)."""
+    for r, c, v, move in found:
+        cand[r][c].remove(v)
+        return move
     return None
 
 
-def apply_locked_candidates_pointing(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_locked_candidates_pointing(
+    grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None
+) -> Optional[Dict]:
     """Pointing: in a 3x3 box, if all candidates for digit d lie in the same row/col, eliminate outside."""
+    return _first(_pointing(grid, cand, masks), cand)
+
+
+def _pointing(grid: Grid, cand: Cand, masks: Optional[List[int]]) -> Iterator[Elimination]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
     for b in range(9):
-        cells = _unit_cells("box", b)
+        br, bc = (b // 3) * 3, (b % 3) * 3
+        pos = _unit_positions(masks, _UNIT_FLAT["box"][b])
         for d in range(1, 10):
-            locs = [(r, c) for (r, c) in cells if grid[r][c] == 0 and d in cand[r][c]]
-            if len(locs) < 2:
+            pm = pos[d]
+            if pm.bit_count() < 2:
                 continue
-            rows = {r for (r, _) in locs}
-            cols = {c for (_, c) in locs}
-            if len(rows) == 1:
-                r = next(iter(rows))
+            bit = 1 << (d - 1)
+            k = _single_triad(pm, _TRIAD)
+            if k >= 0:
+                r = br + k
                 for c in range(9):
-                    if _box_id(r, c) == b:
+                    if bc <= c < bc + 3:
                         continue
-                    if grid[r][c] == 0 and d in cand[r][c]:
-                        cand[r][c].remove(d)
-                        return {
+                    if masks[r * 9 + c] & bit:
+                        yield r, c, d, {
                             "type": "eliminate",
                             "strategy": "locked_pointing_row",
                             "box": b,
@@ -156,14 +377,14 @@ def apply_locked_candidates_pointing(grid: Grid, cand: Cand) -> Optional[Dict]:
                             "c": c,
                             "v": d,
                         }
-            if len(cols) == 1:
-                c = next(iter(cols))
+            k = _single_triad(pm, _BOX_COL)
+            if k >= 0:
+                c = bc + k
                 for r in range(9):
-                    if _box_id(r, c) == b:
+                    if br <= r < br + 3:
                         continue
-                    if grid[r][c] == 0 and d in cand[r][c]:
-                        cand[r][c].remove(d)
-                        return {
+                    if masks[r * 9 + c] & bit:
+                        yield r, c, d, {
                             "type": "eliminate",
                             "strategy": "locked_pointing_col",
                             "box": b,
@@ -171,215 +392,222 @@ def apply_locked_candidates_pointing(grid: Grid, cand: Cand) -> Optional[Dict]:
                             "c": c,
                             "v": d,
                         }
-    return None
 
 
-def apply_box_line_claiming(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_box_line_claiming(
+    grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None
+) -> Optional[Dict]:
     """Claiming: if in a row/col all candidates for d lie in one box, eliminate d elsewhere in that box."""
+    return _first(_claiming(grid, cand, masks), cand)
+
+
+def _claiming(grid: Grid, cand: Cand, masks: Optional[List[int]]) -> Iterator[Elimination]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
     # rows -> box
     for r in range(9):
-        cells = _unit_cells("row", r)
+        pos = _unit_positions(masks, _UNIT_FLAT["row"][r])
         for d in range(1, 10):
-            locs = [(r, c) for (_, c) in cells if grid[r][c] == 0 and d in cand[r][c]]
-            if len(locs) < 2:
+            pm = pos[d]
+            if pm.bit_count() < 2:
                 continue
-            boxes = {_box_id(rr, cc) for (rr, cc) in locs}
-            if len(boxes) == 1:
-                box = boxes.pop()
-                for (rr, cc) in _unit_cells("box", box):
-                    if rr == r:
-                        continue
-                    if grid[rr][cc] == 0 and d in cand[rr][cc]:
-                        cand[rr][cc].remove(d)
-                        return {
-                            "type": "eliminate",
-                            "strategy": "box_line_row",
-                            "box": box,
-                            "unit": "row",
-                            "unit_index": r,
-                            "r": rr,
-                            "c": cc,
-                            "v": d,
-                        }
+            k = _single_triad(pm, _TRIAD)
+            if k < 0:
+                continue
+            box = _box_id(r, k * 3)
+            bit = 1 << (d - 1)
+            for (rr, cc) in _UNIT_CELLS["box"][box]:
+                if rr == r:
+                    continue
+                if masks[rr * 9 + cc] & bit:
+                    yield rr, cc, d, {
+                        "type": "eliminate",
+                        "strategy": "box_line_row",
+                        "box": box,
+                        "unit": "row",
+                        "unit_index": r,
+                        "r": rr,
+                        "c": cc,
+                        "v": d,
+                    }
     # cols -> box
     for c in range(9):
-        cells = _unit_cells("col", c)
+        pos = _unit_positions(masks, _UNIT_FLAT["col"][c])
         for d in range(1, 10):
-            locs = [(r, c) for (r, _) in cells if grid[r][c] == 0 and d in cand[r][c]]
-            if len(locs) < 2:
+            pm = pos[d]
+            if pm.bit_count() < 2:
                 continue
-            boxes = {_box_id(rr, cc) for (rr, cc) in locs}
-            if len(boxes) == 1:
-                box = boxes.pop()
-                for (rr, cc) in _unit_cells("box", box):
-                    if cc == c:
-                        continue
-                    if grid[rr][cc] == 0 and d in cand[rr][cc]:
-                        cand[rr][cc].remove(d)
-                        return {
-                            "type": "eliminate",
-                            "strategy": "box_line_col",
-                            "box": box,
-                            "unit": "col",
-                            "unit_index": c,
-                            "r": rr,
-                            "c": cc,
-                            "v": d,
-                        }
-    return None
+            k = _single_triad(pm, _TRIAD)
+            if k < 0:
+                continue
+            box = _box_id(k * 3, c)
+            bit = 1 << (d - 1)
+            for (rr, cc) in _UNIT_CELLS["box"][box]:
+                if cc == c:
+                    continue
+                if masks[rr * 9 + cc] & bit:
+                    yield rr, cc, d, {
+                        "type": "eliminate",
+                        "strategy": "box_line_col",
+                        "box": box,
+                        "unit": "col",
+                        "unit_index": c,
+                        "r": rr,
+                        "c": cc,
+                        "v": d,
+                    }
 
 
-def apply_naked_pair(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_naked_pair(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
     """Naked pair: if two cells share the same pair, remove from others in unit."""
-    for kind in ("row", "col", "box"):
+    return _first(_naked_pair(grid, cand, masks), cand)
+
+
+def _naked_pair(grid: Grid, cand: Cand, masks: Optional[List[int]]) -> Iterator[Elimination]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    for kind in _KINDS:
         for idx in range(9):
-            cells = _unit_cells(kind, idx)
-            seen: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
-            for (r, c) in cells:
-                if grid[r][c] != 0:
+            flat = _UNIT_FLAT[kind][idx]
+            seen: Dict[int, List[int]] = {}
+            for k, i in enumerate(flat):
+                m = masks[i]
+                if m.bit_count() == 2:
+                    seen.setdefault(m, []).append(k)
+            for pair_mask, ks in seen.items():
+                if len(ks) != 2:
                     continue
-                if len(cand[r][c]) == 2:
-                    key = tuple(sorted(cand[r][c]))
-                    seen.setdefault(key, []).append((r, c))
-            for pair, locs in seen.items():
-                if len(locs) == 2:
-                    pair_set = set(pair)
-                    for (r, c) in cells:
-                        if (r, c) in locs or grid[r][c] != 0:
-                            continue
-                        inter = cand[r][c] & pair_set
-                        if inter:
-                            v = sorted(inter)[0]
-                            cand[r][c].remove(v)
-                            return {
-                                "type": "eliminate",
-                                "strategy": "naked_pair",
-                                "unit": kind,
-                                "unit_index": idx,
-                                "r": r,
-                                "c": c,
-                                "remove": v,
-                                "pair": list(pair),
-                            }
-    return None
+                for k, i in enumerate(flat):
+                    if k in ks:
+                        continue
+                    r, c = _UNIT_CELLS[kind][idx][k]
+                    for v in _DIGITS_OF[masks[i] & pair_mask]:
+                        yield r, c, v, {
+                            "type": "eliminate",
+                            "strategy": "naked_pair",
+                            "unit": kind,
+                            "unit_index": idx,
+                            "r": r,
+                            "c": c,
+                            "remove": v,
+                            "pair": list(_DIGITS_OF[pair_mask]),
+                        }
+
 
+def _places(cells: Tuple[Tuple[int, int], ...], pm: int) -> List[Tuple[int, int]]:
+    return [cells[k] for k in _BITS_OF[pm]]
 
-def apply_hidden_pair(grid: Grid, cand: Cand) -> Optional[Dict]:
+
+def apply_hidden_pair(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
     """Hidden pair: if two digits only appear in the same two cells, eliminate other digits there."""
-    for kind in ("row", "col", "box"):
-        for idx in range(9):
-            cells = _unit_cells(kind, idx)
-            places: Dict[int, List[Tuple[int, int]]] = {d: [] for d in range(1, 10)}
-            for (r, c) in cells:
-                if grid[r][c] != 0:
-                    continue
-                for d in cand[r][c]:
-                    places[d].append((r, c))
-            digits = [d for d in range(1, 10) if 1 <= len(places[d]) <= 2]
-            for a, b in itertools.combinations(digits, 2):
-                locs = set(places[a]) | set(places[b])
-                if len(locs) == 2 and places[a] and places[b]:
-                    for (r, c) in locs:
-                        extras = [x for x in cand[r][c] if x not in (a, b)]
-                        if extras:
-                            x = extras[0]
-                            cand[r][c].remove(x)
-                            return {
-                                "type": "eliminate",
-                                "strategy": "hidden_pair",
-                                "unit": kind,
-                                "unit_index": idx,
-                                "r": r,
-                                "c": c,
-                                "remove": x,
-                                "pair": [a, b],
-                            }
-    return None
+    return _first(_hidden_pair(grid, cand, masks), cand)
 
 
-def _triples(
-    iterable: Sequence[Tuple[int, int]]
-) -> Iterable[Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]]:
-    return itertools.combinations(iterable, 3)
+def _hidden_pair(grid: Grid, cand: Cand, masks: Optional[List[int]]) -> Iterator[Elimination]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    for kind in _KINDS:
+        for idx in range(9):
+            pos = _unit_positions(masks, _UNIT_FLAT[kind][idx])
+            digits = [d for d in range(1, 10) if 1 <= pos[d].bit_count() <= 2]
+            for a, b in itertools.combinations(digits, 2):
+                if (pos[a] | pos[b]).bit_count() != 2:
+                    continue
+                cells = _UNIT_CELLS[kind][idx]
+                # same set construction as the scan order of the original set-based rule
+                locs = set(_places(cells, pos[a])) | set(_places(cells, pos[b]))
+                for (r, c) in locs:
+                    for x in [x for x in cand[r][c] if x not in (a, b)]:
+                        yield r, c, x, {
+                            "type": "eliminate",
+                            "strategy": "hidden_pair",
+                            "unit": kind,
+                            "unit_index": idx,
+                            "r": r,
+                            "c": c,
+                            "remove": x,
+                            "pair": [a, b],
+                        }
 
 
-def apply_naked_triple(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_naked_triple(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
     """
     If three cells in a unit collectively contain exactly three digits (each cell ⊆ that set, sizes 2–3),
     eliminate those three digits from all other cells in the unit. One elimination per call.
     """
-    for kind in ("row", "col", "box"):
+    return _first(_naked_triple(grid, cand, masks), cand)
+
+
+def _naked_triple(grid: Grid, cand: Cand, masks: Optional[List[int]]) -> Iterator[Elimination]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    for kind in _KINDS:
         for idx in range(9):
-            cells = _unit_cells(kind, idx)
-            small = [
-                (r, c)
-                for (r, c) in cells
-                if grid[r][c] == 0 and 1 < len(cand[r][c]) <= 3
-            ]
-            for (a, b, c) in _triples(small):
-                r1, c1 = a
-                r2, c2 = b
-                r3, c3 = c
-                union = cand[r1][c1] | cand[r2][c2] | cand[r3][c3]
-                if 2 <= len(union) <= 3 and cand[r1][c1] <= union and cand[r2][c2] <= union and cand[r3][c3] <= union:
-                    for (r, c) in cells:
-                        if (r, c) in (a, b, c) or grid[r][c] != 0:
-                            continue
-                        inter = cand[r][c] & union
-                        if inter:
-                            v = sorted(inter)[0]
-                            cand[r][c].remove(v)
-                            return {
-                                "type": "eliminate",
-                                "strategy": "naked_triple",
-                                "unit": kind,
-                                "unit_index": idx,
-                                "r": r,
-                                "c": c,
-                                "v": v,
-                                "triple": sorted(union),
-                            }
-    return None
+            flat = _UNIT_FLAT[kind][idx]
+            small = [k for k, i in enumerate(flat) if 1 < masks[i].bit_count() <= 3]
+            for trio in itertools.combinations(small, 3):
+                ka, kb, kc = trio
+                union = masks[flat[ka]] | masks[flat[kb]] | masks[flat[kc]]
+                if not 2 <= union.bit_count() <= 3:
+                    continue
+                for k, i in enumerate(flat):
+                    if k in trio:
+                        continue
+                    r, c = _UNIT_CELLS[kind][idx][k]
+                    for v in _DIGITS_OF[masks[i] & union]:
+                        yield r, c, v, {
+                            "type": "eliminate",
+                            "strategy": "naked_triple",
+                            "unit": kind,
+                            "unit_index": idx,
+                            "r": r,
+                            "c": c,
+                            "v": v,
+                            "triple": list(_DIGITS_OF[union]),
+                        }
 
 
-def apply_hidden_triple(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_hidden_triple(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
     """
     If exactly three digits appear as candidates in exactly three cells of a unit,
     restrict those three cells' candidates to that set (drop any extras). One elimination per call.
     """
-    for kind in ("row", "col", "box"):
+    return _first(_hidden_triple(grid, cand, masks), cand)
+
+
+def _hidden_triple(grid: Grid, cand: Cand, masks: Optional[List[int]]) -> Iterator[Elimination]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    for kind in _KINDS:
         for idx in range(9):
-            cells = _unit_cells(kind, idx)
-            places: Dict[int, List[Tuple[int, int]]] = {d: [] for d in range(1, 10)}
-            for (r, c) in cells:
-                if grid[r][c] != 0:
-                    continue
-                for d in cand[r][c]:
-                    places[d].append((r, c))
-            digits = [d for d in range(1, 10) if 1 <= len(places[d]) <= 3]
+            pos = _unit_positions(masks, _UNIT_FLAT[kind][idx])
+            digits = [d for d in range(1, 10) if 1 <= pos[d].bit_count() <= 3]
             for a, b, c in itertools.combinations(digits, 3):
+                if (pos[a] | pos[b] | pos[c]).bit_count() != 3:
+                    continue
+                cells = _UNIT_CELLS[kind][idx]
                 triple = {a, b, c}
-                locs = set(places[a]) | set(places[b]) | set(places[c])
-                if len(locs) == 3:
-                    for (r, c2) in locs:
-                        extras = [x for x in cand[r][c2] if x not in triple]
-                        if extras:
-                            x = extras[0]
-                            cand[r][c2].remove(x)
-                            return {
-                                "type": "eliminate",
-                                "strategy": "hidden_triple",
-                                "unit": kind,
-                                "unit_index": idx,
-                                "r": r,
-                                "c": c2,
-                                "remove": x,
-                                "triple": sorted(triple),
-                            }
-    return None
+                locs = set(_places(cells, pos[a])) | set(_places(cells, pos[b])) | set(_places(cells, pos[c]))
+                for (r, c2) in locs:
+                    for x in [x for x in cand[r][c2] if x not in triple]:
+                        yield r, c2, x, {
+                            "type": "eliminate",
+                            "strategy": "hidden_triple",
+                            "unit": kind,
+                            "unit_index": idx,
+                            "r": r,
+                            "c": c2,
+                            "remove": x,
+                            "triple": sorted(triple),
+                        }
+
+
+def _line_positions(masks: List[int], kind: str) -> List[List[int]]:
+    """line index -> digit -> 9-bit mask of positions along that row/col."""
+    return [_unit_positions(masks, _UNIT_FLAT[kind][i]) for i in range(9)]
 
 
-def apply_x_wing(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_x_wing(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
     """
     X-Wing (size-2 fish) on rows and columns.
     - Rows: if for a digit d, exactly two rows each have candidates only in the same two columns {c1,c2},
@@ -387,88 +615,96 @@ def apply_x_wing(grid: Grid, cand: Cand) -> Optional[Dict]:
     - Columns: symmetric.
     One elimination per call (first found in deterministic order).
     """
+    return _first(_x_wing(grid, cand, masks), cand)
+
+
+def _x_wing(grid: Grid, cand: Cand, masks: Optional[List[int]]) -> Iterator[Elimination]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    row_pos = _line_positions(masks, "row")
     for d in range(1, 10):
-        row_cols: List[Tuple[int, Tuple[int, int]]] = []
+        bit = 1 << (d - 1)
+        by_pair: Dict[int, List[int]] = {}
         for r in range(9):
-            cols = tuple(sorted([c for c in range(9) if grid[r][c] == 0 and d in cand[r][c]]))
-            if len(cols) == 2:
-                row_cols.append((r, (cols[0], cols[1])))
-        by_pair: Dict[Tuple[int, int], List[int]] = {}
-        for r, pair in row_cols:
-            by_pair.setdefault(pair, []).append(r)
-        for (c1, c2), rows2 in by_pair.items():
-            if len(rows2) == 2:
-                r1, r2 = rows2
-                for rr in range(9):
-                    if rr in (r1, r2):
-                        continue
-                    for cc in (c1, c2):
-                        if grid[rr][cc] == 0 and d in cand[rr][cc]:
-                            cand[rr][cc].remove(d)
-                            return {
-                                "type": "eliminate",
-                                "strategy": "x_wing_row",
-                                "digit": d,
-                                "rows": [r1, r2],
-                                "cols": [c1, c2],
-                                "r": rr,
-                                "c": cc,
-                            }
+            pm = row_pos[r][d]
+            if pm.bit_count() == 2:
+                by_pair.setdefault(pm, []).append(r)
+        for pm, rows2 in by_pair.items():
+            if len(rows2) != 2:
+                continue
+            r1, r2 = rows2
+            c1, c2 = _BITS_OF[pm]
+            for rr in range(9):
+                if rr in (r1, r2):
+                    continue
+                for cc in (c1, c2):
+                    if masks[rr * 9 + cc] & bit:
+                        yield rr, cc, d, {
+                            "type": "eliminate",
+                            "strategy": "x_wing_row",
+                            "digit": d,
+                            "rows": [r1, r2],
+                            "cols": [c1, c2],
+                            "r": rr,
+                            "c": cc,
+                        }
+    col_pos = _line_positions(masks, "col")
     for d in range(1, 10):
-        col_rows: List[Tuple[int, Tuple[int, int]]] = []
+        bit = 1 << (d - 1)
+        by_pair = {}
         for c in range(9):
-            rows = tuple(sorted([r for r in range(9) if grid[r][c] == 0 and d in cand[r][c]]))
-            if len(rows) == 2:
-                col_rows.append((c, (rows[0], rows[1])))
-        by_pair: Dict[Tuple[int, int], List[int]] = {}
-        for c, pair in col_rows:
-            by_pair.setdefault(pair, []).append(c)
-        for (r1, r2), cols2 in by_pair.items():
-            if len(cols2) == 2:
-                c1, c2 = cols2
-                for cc in range(9):
-                    if cc in (c1, c2):
-                        continue
-                    for rr in (r1, r2):
-                        if grid[rr][cc] == 0 and d in cand[rr][cc]:
-                            cand[rr][cc].remove(d)
-                            return {
-                                "type": "eliminate",
-                                "strategy": "x_wing_col",
-                                "digit": d,
-                                "rows": [r1, r2],
-                                "cols": [c1, c2],
-                                "r": rr,
-                                "c": cc,
-                            }
-    return None
+            pm = col_pos[c][d]
+            if pm.bit_count() == 2:
+                by_pair.setdefault(pm, []).append(c)
+        for pm, cols2 in by_pair.items():
+            if len(cols2) != 2:
+                continue
+            c1, c2 = cols2
+            r1, r2 = _BITS_OF[pm]
+            for cc in range(9):
+                if cc in (c1, c2):
+                    continue
+                for rr in (r1, r2):
+                    if masks[rr * 9 + cc] & bit:
+                        yield rr, cc, d, {
+                            "type": "eliminate",
+                            "strategy": "x_wing_col",
+                            "digit": d,
+                            "rows": [r1, r2],
+                            "cols": [c1, c2],
+                            "r": rr,
+                            "c": cc,
+                        }
 
 
-def apply_swordfish(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_swordfish(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
     """
     Swordfish (size-3 fish) on rows and columns.
     Rows: for digit d, find three rows where d appears only in the same three columns {c1,c2,c3};
           eliminate d from those columns in all other rows. Columns follow symmetrically.
     Returns after the first deterministic elimination.
     """
+    return _first(_swordfish(grid, cand, masks), cand)
+
 
+def _swordfish(grid: Grid, cand: Cand, masks: Optional[List[int]]) -> Iterator[Elimination]:
+    if masks is None:
+        masks = _cell_masks(grid, cand)
+    row_pos = _line_positions(masks, "row")
     for d in range(1, 10):
-        row_cols: List[Tuple[int, Tuple[int, ...]]] = []
-        for r in range(9):
-            cols = tuple(sorted(c for c in range(9) if grid[r][c] == 0 and d in cand[r][c]))
-            if 2 <= len(cols) <= 3:
-                row_cols.append((r, cols))
-        for (r1, cset1), (r2, cset2), (r3, cset3) in itertools.combinations(row_cols, 3):
-            cols_union = sorted(set(cset1) | set(cset2) | set(cset3))
-            if len(cols_union) != 3:
+        bit = 1 << (d - 1)
+        row_cols = [(r, row_pos[r][d]) for r in range(9) if 2 <= row_pos[r][d].bit_count() <= 3]
+        for (r1, m1), (r2, m2), (r3, m3) in itertools.combinations(row_cols, 3):
+            union = m1 | m2 | m3
+            if union.bit_count() != 3:
                 continue
+            cols_union = list(_BITS_OF[union])
             for rr in range(9):
                 if rr in (r1, r2, r3):
                     continue
                 for cc in cols_union:
-                    if grid[rr][cc] == 0 and d in cand[rr][cc]:
-                        cand[rr][cc].remove(d)
-                        return {
+                    if masks[rr * 9 + cc] & bit:
+                        yield rr, cc, d, {
                             "type": "eliminate",
                             "strategy": "swordfish_row",
                             "digit": d,
@@ -477,23 +713,21 @@ def apply_swordfish(grid: Grid, cand: Cand) -> Optional[Dict]:
                             "r": rr,
                             "c": cc,
                         }
+    col_pos = _line_positions(masks, "col")
     for d in range(1, 10):
-        col_rows: List[Tuple[int, Tuple[int, ...]]] = []
-        for c in range(9):
-            rows = tuple(sorted(r for r in range(9) if grid[r][c] == 0 and d in cand[r][c]))
-            if 2 <= len(rows) <= 3:
-                col_rows.append((c, rows))
-        for (c1, rset1), (c2, rset2), (c3, rset3) in itertools.combinations(col_rows, 3):
-            rows_union = sorted(set(rset1) | set(rset2) | set(rset3))
-            if len(rows_union) != 3:
+        bit = 1 << (d - 1)
+        col_rows = [(c, col_pos[c][d]) for c in range(9) if 2 <= col_pos[c][d].bit_count() <= 3]
+        for (c1, m1), (c2, m2), (c3, m3) in itertools.combinations(col_rows, 3):
+            union = m1 | m2 | m3
+            if union.bit_count() != 3:
                 continue
+            rows_union = list(_BITS_OF[union])
             for cc in range(9):
                 if cc in (c1, c2, c3):
                     continue
                 for rr in rows_union:
-                    if grid[rr][cc] == 0 and d in cand[rr][cc]:
-                        cand[rr][cc].remove(d)
-                        return {
+                    if masks[rr * 9 + cc] & bit:
+                        yield rr, cc, d, {
                             "type": "eliminate",
                             "strategy": "swordfish_col",
                             "digit": d,
@@ -502,19 +736,23 @@ def apply_swordfish(grid: Grid, cand: Cand) -> Optional[Dict]:
                             "r": rr,
                             "c": cc,
                         }
-    return None
 
 
-def apply_simple_coloring(grid: Grid, cand: Cand) -> Optional[Dict]:
+def apply_simple_coloring(grid: Grid, cand: Cand, *, masks: Optional[List[int]] = None) -> Optional[Dict]:
     """
     Simple coloring (Rule 2) on conjugate links for each digit d:
       - Build graph where nodes are candidate cells, edges connect two cells in a unit that contains
         exactly two candidates for d (conjugate link).
       - Two-color each connected component. If a color appears twice in the same unit, that color is
         impossible there; eliminate the first deterministic cell.
-    Returns one elimination per call.
+    Returns one elimination per call. ``masks`` is accepted for a uniform ladder call and unused.
     """
+    return _first(_simple_coloring(grid, cand), cand)
 
+
+def _simple_coloring(
+    grid: Grid, cand: Cand, masks: Optional[List[int]] = None
+) -> Iterator[Elimination]:
     for d in range(1, 10):
         nodes = [(r, c) for r in range(9) for c in range(9) if grid[r][c] == 0 and d in cand[r][c]]
         if not nodes:
@@ -522,7 +760,7 @@ def apply_simple_coloring(grid: Grid, cand: Cand) -> Optional[Dict]:
         idx = {rc: i for i, rc in enumerate(nodes)}
         adj: List[List[int]] = [[] for _ in nodes]
 
-        def add_links(cells: List[Tuple[int, int]]) -> None:
+        def add_links(cells: Sequence[Tuple[int, int]]) -> None:
             locs = [(r, c) for (r, c) in cells if grid[r][c] == 0 and d in cand[r][c]]
             if len(locs) == 2:
                 a, b = idx[locs[0]], idx[locs[1]]
@@ -530,11 +768,11 @@ def apply_simple_coloring(grid: Grid, cand: Cand) -> Optional[Dict]:
                 adj[b].append(a)
 
         for r in range(9):
-            add_links(_unit_cells_row(r))
+            add_links(_UNIT_CELLS["row"][r])
         for c in range(9):
-            add_links(_unit_cells_col(c))
+            add_links(_UNIT_CELLS["col"][c])
         for b in range(9):
-            add_links(_unit_cells_box(b))
+            add_links(_UNIT_CELLS["box"][b])
 
         color: List[Optional[int]] = [None] * len(nodes)
         component: List[Optional[int]] = [None] * len(nodes)
@@ -558,7 +796,7 @@ def apply_simple_coloring(grid: Grid, cand: Cand) -> Optional[Dict]:
             for unit_idx in range(9):
                 cells = [
                     (r, c)
-                    for (r, c) in _unit_cells(unit_kind, unit_idx)
+                    for (r, c) in _UNIT_CELLS[unit_kind][unit_idx]
                     if grid[r][c] == 0 and d in cand[r][c] and (r, c) in idx
                 ]
                 if len(cells) < 2:
@@ -572,71 +810,225 @@ def apply_simple_coloring(grid: Grid, cand: Cand) -> Optional[Dict]:
                         continue
                     by_color.setdefault((comp, col), []).append((r, c))
                 for (comp, col_value), positions in sorted(by_color.items()):
-                    if len(positions) >= 2:
-                        r, c = positions[0]
-                        if d in cand[r][c]:
-                            cand[r][c].remove(d)
-                            return {
-                                "type": "eliminate",
-                                "strategy": "simple_coloring",
-                                "digit": d,
-                                "unit": unit_kind,
-                                "unit_index": unit_idx,
-                                "component": comp,
-                                "color": col_value,
-                                "r": r,
-                                "c": c,
-                            }
-    return None
+                    if len(positions) < 2:
+                        continue
+                    for r, c in positions:
+                        yield r, c, d, {
+                            "type": "eliminate",
+                            "strategy": "simple_coloring",
+                            "digit": d,
+                            "unit": unit_kind,
+                            "unit_index": unit_idx,
+                            "component": comp,
+                            "color": col_value,
+                            "r": r,
+                            "c": c,
+                        }
+
+
+# ----- Ladder -----------------------------------------------------------------------------------
+
+_STRATEGY_FUNCS = {
+    "naked_single": apply_naked_single,
+    "hidden_single": apply_hidden_single,
+    "locked_candidates_pointing": apply_locked_candidates_pointing,
+    "box_line_claiming": apply_box_line_claiming,
+    "naked_pair": apply_naked_pair,
+    "hidden_pair": apply_hidden_pair,
+    "x_wing": apply_x_wing,
+    "naked_triple": apply_naked_triple,
+    "hidden_triple": apply_hidden_triple,
+    "swordfish": apply_swordfish,
+    "simple_coloring": apply_simple_coloring,
+}
+
+# Elimination strategy -> kernel yielding every elimination visible in one candidates snapshot
+_Kernel = Callable[[Grid, Cand, Optional[List[int]]], Iterator[Elimination]]
+_ELIMINATION_KERNELS: Dict[str, _Kernel] = {
+    "locked_candidates_pointing": _pointing,
+    "box_line_claiming": _claiming,
+    "naked_pair": _naked_pair,
+    "hidden_pair": _hidden_pair,
+    "x_wing": _x_wing,
+    "naked_triple": _naked_triple,
+    "hidden_triple": _hidden_triple,
+    "swordfish": _swordfish,
+    "simple_coloring": _simple_coloring,
+}
 
 
-def step_once(grid: Grid) -> Optional[Dict]:
+def apply_all_eliminations(name: str, grid: Grid, cand: Cand) -> int:
+    """
+    Apply every elimination strategy ``name`` finds in the current candidates at once.
+
+    All eliminations are collected from one snapshot before any is applied, so the result
+    does not depend on scan order (unlike repeated ``apply_*`` calls, where each elimination
+    can change what the next scan finds). Returns the number of candidates removed.
+    """
+    kernel = _ELIMINATION_KERNELS.get(name)
+    if kernel is None:
+        raise ValueError(f"not an elimination strategy: {name!r}")
+    found = {(r, c, v) for r, c, v, _ in kernel(grid, cand, None)}
+    for r, c, v in found:
+        cand[r][c].discard(v)
+    return len(found)
+
+
+# Default priority order of step_once.
+LADDER: Tuple[str, ...] = tuple(_STRATEGY_FUNCS)
+
+TECHNIQUE_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "singles": ("naked_single", "hidden_single"),
+    "locked_candidates": ("locked_candidates_pointing", "box_line_claiming"),
+    "pairs": ("naked_pair", "hidden_pair"),
+    "triples": ("naked_triple", "hidden_triple"),
+    "fish": ("x_wing", "swordfish"),
+    "coloring": ("simple_coloring",),
+}
+
+
+def _expand(name: str) -> Tuple[str, ...]:
+    if name in TECHNIQUE_GROUPS:
+        return TECHNIQUE_GROUPS[name]
+    if name in _STRATEGY_FUNCS:
+        return (name,)
+    known = ", ".join([*LADDER, *TECHNIQUE_GROUPS])
+    raise ValueError(f"unknown technique {name!r} (expected one of: {known})")
+
+
+def resolve_ladder(
+    techniques: Optional[Sequence[str]] = None, *, upto: Optional[str] = None
+) -> Tuple[str, ...]:
+    """
+    Expand a technique list into the strategy names step_once will try, in order.
+
+    ``techniques`` lists strategy names or groups (``singles``, ``locked_candidates``,
+    ``pairs``, ``triples``, ``fish``, ``coloring``) in priority order; None means
+    :data:`LADDER`. ``upto`` caps the ladder after that technique or group, e.g.
+    ``upto="locked_candidates"`` stops after singles and locked candidates.
+    """
+    names: List[str] = []
+    for t in LADDER if techniques is None else techniques:
+        for name in _expand(t):
+            if name not in names:
+                names.append(name)
+    if upto is not None:
+        cap = _expand(upto)
+        last = max((i for i, name in enumerate(names) if name in cap), default=-1)
+        if last < 0:
+            raise ValueError(f"upto={upto!r} is not part of the ladder")
+        del names[last + 1 :]
+    return tuple(names)
+
+
+@lru_cache(maxsize=None)
+def _compile_ladder(
+    techniques: Optional[Tuple[str, ...]], upto: Optional[str], bulk_singles: bool
+) -> Tuple[Tuple[str, ...], Tuple[Callable[..., Optional[Dict]], ...]]:
+    names = resolve_ladder(techniques, upto=upto)
+    if bulk_singles:
+        if "naked_single" not in names or "hidden_single" not in names:
+            raise ValueError("bulk_singles needs both naked_single and hidden_single in the ladder")
+        # the batch sweep takes the place of the first single rung; the other is dropped
+        first = min(names.index("naked_single"), names.index("hidden_single"))
+        names = tuple(
+            "all_singles" if i == first else name
+            for i, name in enumerate(names)
+            if i == first or name not in ("naked_single", "hidden_single")
+        )
+    fns = tuple(apply_all_singles if name == "all_singles" else _STRATEGY_FUNCS[name] for name in names)
+    return names, fns
+
+
+def step_once(
+    grid: Grid,
+    state: Optional[CandidateState] = None,
+    *,
+    bulk_singles: bool = False,
+    profile: Optional[StrategyProfile] = None,
+    techniques: Optional[Sequence[str]] = None,
+    upto: Optional[str] = None,
+) -> Optional[Dict]:
     """
     Apply exactly one logical step (prioritized order). Returns a move dict or None.
     Priority:
       1) Placements: naked_single > hidden_single
       2) Eliminations: locked_pointing > box_line_claiming > naked_pair > hidden_pair
                         > x_wing > naked_triple > hidden_triple > swordfish > simple_coloring
+
+    With ``state`` (whose ``grid`` must be ``grid``) candidates are taken from and
+    kept in the persistent state instead of being rebuilt from scratch.
+
+    ``techniques``/``upto`` replace the ladder above (see :func:`resolve_ladder`);
+    strategies outside it are never run, so a stall returns None right away.
+
+    ``bulk_singles=True`` first places every available single at once
+    (:func:`apply_all_singles`, one ``place_batch`` move); other strategies only
+    run when no single is left.
+
+    ``profile`` (a :class:`StrategyProfile`) switches to a timed copy of the ladder
+    that records every strategy call; without it the ladder runs uninstrumented.
     """
-    cand = candidates(grid)
-    m = apply_naked_single(grid, cand)
-    if m:
-        return m
-    m = apply_hidden_single(grid, cand)
-    if m:
-        return m
-    m = apply_locked_candidates_pointing(grid, cand)
-    if m:
-        return m
-    m = apply_box_line_claiming(grid, cand)
-    if m:
-        return m
-    m = apply_naked_pair(grid, cand)
-    if m:
-        return m
-    m = apply_hidden_pair(grid, cand)
-    if m:
-        return m
-    m = apply_x_wing(grid, cand)
-    if m:
-        return m
-    m = apply_naked_triple(grid, cand)
-    if m:
-        return m
-    m = apply_hidden_triple(grid, cand)
-    if m:
-        return m
-    m = apply_swordfish(grid, cand)
-    if m:
-        return m
-    m = apply_simple_coloring(grid, cand)
+    cand = candidates(grid) if state is None else state.cand
+    key = None if techniques is None else tuple(techniques)
+    names, ladder = _compile_ladder(key, upto, bulk_singles)
+    # every kernel returns right after its first mutation, so one mask snapshot serves the ladder
+    masks = _cell_masks(grid, cand)
+    m = None
+    if profile is not None:
+        t0 = perf_counter()
+        open_cands = sum(mask.bit_count() for mask in masks)
+        for name, fn in zip(names, ladder):
+            t1 = perf_counter()
+            m = fn(grid, cand, masks=masks)
+            profile.record(name, m is not None, perf_counter() - t1, open_cands)
+            if m:
+                break
+        profile.steps += 1
+        profile.seconds += perf_counter() - t0
+    else:
+        for fn in ladder:
+            m = fn(grid, cand, masks=masks)
+            if m:
+                break
+    if state is not None and m and m["type"] == "place":
+        state.place(m["r"], m["c"], m["v"])
     return m
 
 
+def is_solvable_with(
+    grid: Grid, techniques: Sequence[str], *, upto: Optional[str] = None
+) -> bool:
+    """
+    True if the given techniques alone fill ``grid`` completely (no search).
+
+    Runs the restricted ladder on a copy and stops at the first stall, so asking
+    ``is_solvable_with(g, ["singles"])`` never tries pairs, fish or coloring.
+    Singles are swept in bulk when both kinds are allowed.
+    """
+    names = resolve_ladder(techniques, upto=upto)
+    bulk = "naked_single" in names and "hidden_single" in names
+    state = CandidateState([row[:] for row in grid])
+    while step_once(state.grid, state, bulk_singles=bulk, techniques=names) is not None:
+        pass
+    g = state.grid
+    if any(g[r][c] == 0 for r in range(9) for c in range(9)):
+        return False
+    # sound steps on contradictory givens can fill the grid inconsistently
+    for kind in _KINDS:
+        for cells in _UNIT_CELLS[kind]:
+            if len({g[r][c] for r, c in cells}) != 9:
+                return False
+    return True
+
+
 __all__ = [
+    "CandidateState",
+    "StrategyProfile",
     "candidates",
     "apply_naked_single",
     "apply_hidden_single",
+    "apply_all_singles",
     "apply_locked_candidates_pointing",
     "apply_box_line_claiming",
     "apply_naked_pair",
@@ -646,5 +1038,10 @@ __all__ = [
     "apply_x_wing",
     "apply_swordfish",
     "apply_simple_coloring",
+    "apply_all_eliminations",
     "step_once",
+    "LADDER",
+    "TECHNIQUE_GROUPS",
+    "resolve_ladder",
+    "is_solvable_with",
 ]
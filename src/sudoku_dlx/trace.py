@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+"""Real DLX search traces streamed as NDJSON (``solve --trace-kind dlx``).
+
+One JSON object per line:
+
+- ``{"t": "start", "version", "kind": "dlx_search", "initial", "limit", "sample", "max_depth", "max_events"}``
+- ``{"t": "choose", "d", "col", "con", "size"}``: column picked at depth ``d`` (``con`` = cell/row/col/box)
+- ``{"t": "cover", "d", "r", "c", "v"}``: placement (depth 0 = givens and prepass singles)
+- ``{"t": "backtrack", "d", "r", "c", "v"}``: placement taken back
+- ``{"t": "solution", "d", "n"}``
+- ``{"t": "end", "count", "nodes", "branches", "max_depth", "events", "written", "dropped", "truncated"}``
+
+``sample=N`` keeps every Nth search event, ``max_depth`` drops events below that depth and
+``max_events`` stops writing (``truncated``) so traces of hard puzzles stay bounded; solutions
+and the start/end records are always kept.
+"""
+
+import json
+from typing import IO, Any, Dict, Optional
+
+from .api import Grid, to_string
+from .solver import ROW_PAYLOAD, SOLVER, SearchTracer, grid_clues
+
+TRACE_VERSION = "dlx-trace-1"
+
+_CONSTRAINTS = ("cell", "row", "col", "box")
+
+
+class TraceRecorder(SearchTracer):
+    """:class:`SearchTracer` that writes sampled, depth-limited events to a text stream."""
+
+    def __init__(
+        self,
+        fh: IO[str],
+        *,
+        sample: int = 1,
+        max_depth: Optional[int] = None,
+        max_events: Optional[int] = None,
+    ) -> None:
+        if sample < 1:
+            raise ValueError("sample must be >= 1")
+        if max_depth is not None and max_depth < 0:
+            raise ValueError("max_depth must be >= 0")
+        if max_events is not None and max_events < 1:
+            raise ValueError("max_events must be >= 1")
+        self.fh = fh
+        self.sample = sample
+        self.max_depth = max_depth
+        self.max_events = max_events
+        self.events = 0  # search events seen (before sampling/limits)
+        self.written = 0
+        self.dropped = 0
+        self.truncated = False
+
+    def _write(self, rec: Dict[str, Any]) -> None:
+        if self.max_events is not None and self.written >= self.max_events:
+            self.truncated = True
+            self.dropped += 1
+            return
+        self.fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        self.written += 1
+
+    def _keep(self, depth: int) -> bool:
+        self.events += 1
+        if self.max_depth is not None and depth > self.max_depth:
+            self.dropped += 1
+            return False
+        if self.sample > 1 and (self.events - 1) % self.sample:
+            self.dropped += 1
+            return False
+        return True
+
+    def on_choose_col(self, depth: int, col: int, size: int) -> None:
+        if self._keep(depth):
+            self._write({"t": "choose", "d": depth, "col": col, "con": _CONSTRAINTS[col // 81], "size": size})
+
+    def on_cover(self, depth: int, row_idx: int) -> None:
+        if depth == 0 or self._keep(depth):
+            r, c, v = ROW_PAYLOAD[row_idx]
+            self._write({"t": "cover", "d": depth, "r": r, "c": c, "v": v})
+
+    def on_backtrack(self, depth: int, row_idx: int) -> None:
+        if self._keep(depth):
+            r, c, v = ROW_PAYLOAD[row_idx]
+            self._write({"t": "backtrack", "d": depth, "r": r, "c": c, "v": v})
+
+    def on_solution(self, depth: int, count: int) -> None:
+        self.events += 1
+        self._write({"t": "solution", "d": depth, "n": count})
+
+
+def record_search(
+    grid: Grid,
+    fh: IO[str],
+    *,
+    limit: int = 1,
+    sample: int = 1,
+    max_depth: Optional[int] = None,
+    max_events: Optional[int] = 100_000,
+) -> Dict[str, Any]:
+    """
+    Run the DLX search on ``grid`` (stopping after ``limit`` solutions) and stream its trace to ``fh``.
+
+    Returns the ``end`` record.
+    """
+    rec = TraceRecorder(fh, sample=sample, max_depth=max_depth, max_events=max_events)
+    fh.write(
+        json.dumps(
+            {
+                "t": "start",
+                "version": TRACE_VERSION,
+                "kind": "dlx_search",
+                "initial": to_string(grid),
+                "limit": limit,
+                "sample": sample,
+                "max_depth": max_depth,
+                "max_events": max_events,
+            },
+            separators=(",", ":"),
+        )
+        + "\n"
+    )
+    count, _ = SOLVER.count_solutions(grid_clues(grid), limit=limit, tracer=rec)
+    stats = SOLVER.stats
+    end = {
+        "t": "end",
+        "count": count,
+        "nodes": stats.nodes,
+        "branches": stats.branches,
+        "max_depth": stats.max_depth,
+        "events": rec.events,
+        "written": rec.written,
+        "dropped": rec.dropped,
+        "truncated": rec.truncated,
+    }
+    fh.write(json.dumps(end, separators=(",", ":")) + "\n")
+    return end
+
+
+__all__ = ["TRACE_VERSION", "TraceRecorder", "record_search"]
@@ -40,6 +40,9 @@ def test_stats_exposed():
     assert result.stats.nodes >= 0
     assert result.stats.backtracks >= 0
     assert result.stats.ms >= 0.0
+    assert result.stats.backtracks == 0  # the empty grid needs no backtracking
+    assert result.stats.dead_ends == 0
+    assert len(result.stats.branching) == result.stats.max_depth + 1
 
 
 def test_from_string_rejects_bad_length():
@@ -97,6 +100,7 @@ def test_analyze_reports_invalid_grid():
     assert summary["unique"] is False
     assert summary["solution"] is None
     assert summary["stats"] == {"ms": 0, "nodes": 0, "backtracks": 0}
+    assert summary["search"] == {"dead_ends": 0, "failed_columns": 0, "max_depth": 0, "branching": []}
 
 
 def test_analyze_partial_grid_detects_non_unique_solution(monkeypatch):
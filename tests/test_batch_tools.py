@@ -22,3 +22,17 @@ def test_gen_batch_and_rate_file(tmp_path):
     assert len(lines) == 5
     rc = cli.main(["rate-file", "--in", str(out)])
     assert rc == 0
+
+
+def test_gen_batch_shards_partition_seed_space(tmp_path):
+    outs = []
+    for i in range(2):
+        out = tmp_path / f"shard{i}.txt"
+        rc = cli.main(
+            ["gen-batch", "--out", str(out), "--count", "2", "--givens", "40",
+             "--symmetry", "none", "--seed", "7", "--shard", f"{i}/2"]
+        )
+        assert rc == 0
+        outs.append(out.read_text(encoding="utf-8").split())
+    # seed offsets 0,2 vs 1,3: shards draw from disjoint seeds
+    assert outs[0] != outs[1]
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from sudoku_dlx import cli, count_solutions, from_string
+from sudoku_dlx.bench import (
+    CORPUS_SIZE,
+    TIERS,
+    build_corpus,
+    compare,
+    load_corpus,
+    run_benchmarks,
+    run_memory_benchmarks,
+)
+
+
+def test_shipped_corpora_are_full_and_unique() -> None:
+    for tier in TIERS:
+        puzzles = load_corpus(tier)
+        assert len(puzzles) == CORPUS_SIZE
+        assert len(set(puzzles)) == CORPUS_SIZE
+        assert count_solutions(from_string(puzzles[0]), limit=2) == 1
+    assert all(s.count(".") == 81 - 17 for s in load_corpus("minimal")[:5])
+
+
+def test_build_corpus_reproduces_shipped_file() -> None:
+    assert build_corpus("easy", 2) == load_corpus("easy")[:2]
+    with pytest.raises(ValueError):
+        load_corpus("extreme")
+
+
+def test_run_benchmarks_records_latency_and_nodes() -> None:
+    data = run_benchmarks(["easy"], ["solve", "count", "explain"], limit=2)
+    assert data["version"] == "bench-1"
+    rec = data["results"]["solve/easy"]
+    assert rec["n"] == 2
+    assert rec["p50_ms"] <= rec["p95_ms"] <= rec["p99_ms"]
+    assert rec["nodes_per_s"] > 0
+    assert "nodes_per_s" not in data["results"]["explain/easy"]
+    with pytest.raises(ValueError):
+        run_benchmarks(["easy"], ["fly"], limit=1)
+
+
+def test_compare_flags_slowdowns_over_threshold() -> None:
+    base = {"results": {"solve/easy": {"p50_ms": 1.0}, "count/easy": {"p50_ms": 1.0}}}
+    cur = {"results": {"solve/easy": {"p50_ms": 1.05}, "count/easy": {"p50_ms": 1.5}}}
+    regs = compare(cur, base, threshold=0.10)
+    assert [r["key"] for r in regs] == ["count/easy"]
+    assert regs[0]["change"] == pytest.approx(0.5)
+
+
+def test_cli_bench_writes_json_and_gates_on_baseline(tmp_path) -> None:
+    out = tmp_path / "bench.json"
+    args = ["bench", "--tiers", "easy", "--ops", "count", "--limit", "2", "--quiet"]
+    assert cli.main(args + ["--out", str(out)]) == 0
+    data = json.loads(out.read_text())
+    assert set(data["results"]) == {"count/easy"}
+    # a baseline that is impossibly fast must trip the gate
+    data["results"]["count/easy"]["p50_ms"] = 1e-6
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps(data))
+    assert cli.main(args + ["--out", str(tmp_path / "cur.json"), "--baseline", str(base)]) == 1
+
+
+def test_memory_benchmarks_separate_streaming_from_whole_file_reads() -> None:
+    data = run_memory_benchmarks(["easy"], ["count", "read_grids", "iter_grids"], limit=1)
+    res = data["results"]
+    assert data["steady_state"]["rss_kib"] is None or data["steady_state"]["rss_kib"] > 0
+    assert res["count/easy"]["n"] == 1
+    # read_grids materialises the whole scratch file, iter_grids streams it
+    assert res["read_grids/easy"]["peak_kib_max"] > 4 * res["iter_grids/easy"]["peak_kib_max"]
+    with pytest.raises(ValueError):
+        run_memory_benchmarks(["easy"], ["solve"], limit=1)
@@ -1,6 +1,7 @@
 from textwrap import dedent
 
 from sudoku_dlx import from_string, to_string, canonical_form
+from sudoku_dlx.canonical import invariant_fingerprint
 
 BASE = dedent(
     """
@@ -102,3 +103,22 @@ def test_canonical_equal_under_inner_row_col_swaps():
     c_rows = canonical_form(from_string(s_rows))
     c_cols = canonical_form(from_string(s_cols))
     assert c0 == c_rows == c_cols
+
+
+def test_invariant_fingerprint_matches_across_isomorphs():
+    variants = [
+        BASE,
+        rot90_string(BASE),
+        relabel_123_to_456(BASE),
+        swap_bands_string(BASE, order=(2, 0, 1)),
+        swap_stacks_string(BASE, order=(1, 2, 0)),
+        swap_rows_in_band_string(BASE, band=0, perm=(2, 1, 0)),
+        swap_cols_in_stack_string(BASE, stack=2, perm=(1, 0, 2)),
+    ]
+    fps = {invariant_fingerprint(from_string(s)) for s in variants}
+    assert len(fps) == 1
+
+
+def test_invariant_fingerprint_separates_different_clue_counts():
+    fewer = "." + BASE[1:]
+    assert invariant_fingerprint(from_string(BASE)) != invariant_fingerprint(from_string(fewer))
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+# modules the CLI must not load just to build its parser (each subcommand imports its own)
+HEAVY = (
+    "sudoku_dlx.api",
+    "sudoku_dlx.solver",
+    "sudoku_dlx.strategies",
+    "sudoku_dlx.crosscheck",
+    "sudoku_dlx.canonical",
+    "sudoku_dlx.rating",
+    "sudoku_dlx.formats",
+    "multiprocessing",
+    "statistics",
+    "dataclasses",
+)
+
+
+def _importtime(code: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_loads_no_subcommand_modules() -> None:
+    times = _importtime("import sudoku_dlx.cli; sudoku_dlx.cli.main(['--help'])")
+    assert "sudoku_dlx.cli" in times
+    assert [m for m in HEAVY if m in times] == []
+
+
+def test_cli_import_time_budget() -> None:
+    # generous: the eager CLI took ~60 ms warm and ~450 ms without bytecode caches
+    best = min(_importtime("import sudoku_dlx.cli")["sudoku_dlx.cli"] for _ in range(3))
+    assert best < 150_000
+
+
+def test_package_exports_resolve_lazily() -> None:
+    times = _importtime("import sudoku_dlx; sudoku_dlx.rate")
+    assert "sudoku_dlx.rating" in times
+    assert "sudoku_dlx.crosscheck" not in times
+    import sudoku_dlx
+    import sudoku_dlx.explain  # noqa: F401  (the submodule must not shadow the function)
+
+    assert callable(sudoku_dlx.explain) and sudoku_dlx.explain.__name__ == "explain"
+    assert sudoku_dlx.legacy_to_string is sudoku_dlx.solver.to_string
@@ -1,4 +1,5 @@
 import json
+import lzma
 
 from sudoku_dlx import cli
 
@@ -46,3 +47,65 @@ def test_explain_file_ndjson(tmp_path):
     assert len(data) == 1
     obj = data[0]
     assert "grid" in obj and "steps" in obj and "progress" in obj
+
+
+def test_explain_file_strategy_profile_report(tmp_path, capsys):
+    ptxt = tmp_path / "p.txt"
+    ptxt.write_text(PUZ + "\n" + PUZ + "\n", encoding="utf-8")
+    out = tmp_path / "steps.ndjson"
+    rc = cli.main(["explain-file", "--in", str(ptxt), "--out", str(out), "--strategy-profile"])
+    assert rc == 0
+    err = capsys.readouterr().err
+    assert "naked_single" in err and "steps:" in err
+    records = [json.loads(x) for x in out.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 2 and all("profile" not in r for r in records)
+
+
+def test_convert_txt_to_binary_and_back(tmp_path):
+    ptxt = tmp_path / "p.txt"
+    ptxt.write_text(PUZ + "\n" + PUZ + "\n", encoding="utf-8")
+    pbin = tmp_path / "p.sdkb"
+    assert cli.main(["convert", "--in", str(ptxt), "--out", str(pbin)]) == 0
+    assert pbin.stat().st_size < ptxt.stat().st_size
+    back = tmp_path / "back.txt"
+    assert cli.main(["convert", "--in", str(pbin), "--out", str(back)]) == 0
+    assert back.read_text(encoding="utf-8") == ptxt.read_text(encoding="utf-8")
+
+
+def test_batch_commands_read_and_write_compressed(tmp_path):
+    ptxt = tmp_path / "p.txt"
+    ptxt.write_text(PUZ + "\n", encoding="utf-8")
+    pgz = tmp_path / "p.txt.gz"
+    rc = cli.main(["convert", "--in", str(ptxt), "--out", str(pgz), "--compress-level", "9"])
+    assert rc == 0
+    assert pgz.read_bytes()[:2] == b"\x1f\x8b"
+    out = tmp_path / "steps.ndjson.xz"
+    assert cli.main(["explain-file", "--in", str(pgz), "--out", str(out)]) == 0
+    rows = [json.loads(x) for x in lzma.open(out, "rt", encoding="utf-8") if x.strip()]
+    assert len(rows) == 1 and rows[0]["grid"] == PUZ
+
+
+def test_to_cnf_simplify_writes_mapping(tmp_path):
+    out = tmp_path / "p.cnf"
+    rc = cli.main(["to-cnf", "--grid", PUZ, "--out", str(out), "--simplify"])
+    assert rc == 0
+    lines = out.read_text(encoding="utf-8").splitlines()
+    _, _, nvars, nclauses = lines[0].split()
+    assert 0 < int(nvars) < 729 and int(nclauses) == len(lines) - 1 < 11988
+    mapping = json.loads((tmp_path / "p.cnf.map.json").read_text(encoding="utf-8"))
+    assert len(mapping["vars"]) == int(nvars)
+    assert mapping["fixed"] == PUZ
+    used = {abs(int(x)) for line in lines[1:] for x in line.split()[:-1]}
+    assert used <= set(range(1, int(nvars) + 1))
+
+
+def test_to_cnf_batch_directory(tmp_path):
+    ptxt = tmp_path / "p.txt"
+    ptxt.write_text(PUZ + "\n" + PUZ.replace("5", ".", 1) + "\n", encoding="utf-8")
+    outdir = tmp_path / "cnf"
+    rc = cli.main(["to-cnf", "--in", str(ptxt), "--out", str(outdir), "--singles"])
+    assert rc == 0
+    names = sorted(p.name for p in outdir.iterdir())
+    assert names == ["000001.cnf", "000001.cnf.map.json", "000002.cnf", "000002.cnf.map.json"]
+    # singles alone solve this puzzle, so nothing is left to encode
+    assert (outdir / "000001.cnf").read_text(encoding="utf-8").splitlines() == ["p cnf 0 0"]
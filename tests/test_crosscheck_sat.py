@@ -2,8 +2,8 @@ from textwrap import dedent
 
 import pytest
 
-from sudoku_dlx import from_string, solve
-from sudoku_dlx.crosscheck import sat_solve
+from sudoku_dlx import count_solutions, from_string, solve
+from sudoku_dlx.crosscheck import cnf_dimacs_lines, sat_count, sat_solve, simplify_cnf
 
 
 PUZZLE = dedent(
@@ -33,3 +33,131 @@ def test_sat_crosscheck_matches_when_available() -> None:
     result = solve(grid)
     assert result is not None
     assert sat_grid == result.grid
+
+
+def test_sat_count_matches_dlx_count_when_available() -> None:
+    grid = from_string(PUZZLE)
+    if sat_count(grid) is None:
+        pytest.skip("python-sat not installed")
+    assert sat_count(grid, limit=5) == 1
+    loose = from_string("." * 30 + PUZZLE.replace("\n", "")[30:])
+    assert sat_count(loose, limit=7) == count_solutions(loose, limit=7) == 7
+    # blocking clauses from the previous count must not leak into later queries
+    assert sat_solve(grid) == solve(grid).grid
+    bad = [row[:] for row in grid]
+    bad[0][2] = 5
+    assert sat_count(bad) == 0 and sat_solve(bad) is None
+
+
+
+def test_sat_solver_is_rebuilt_after_max_selectors() -> None:
+    from sudoku_dlx.crosscheck import SatSolver
+
+    grid = from_string(PUZZLE)
+    loose = from_string("." * 30 + PUZZLE.replace("\n", "")[30:])
+    try:
+        solver = SatSolver(max_selectors=2)
+    except ImportError:
+        pytest.skip("python-sat not installed")
+    with solver:
+        inner = solver._solver
+        assert [solver.count(loose, limit=7) for _ in range(2)] == [7, 7]
+        assert solver._solver is inner
+        assert solver.count(loose, limit=7) == 7  # third count starts a fresh instance
+        assert solver._solver is not inner
+        assert solver.count_first(grid)[1] == solve(grid).grid
+    with pytest.raises(ValueError):
+        SatSolver(max_selectors=0)
+
+def test_dimacs_lines_use_base_cnf_plus_givens() -> None:
+    grid = from_string(PUZZLE)
+    lines = list(cnf_dimacs_lines(grid))
+    givens = sum(1 for row in grid for v in row if v)
+    assert lines[0] == f"p cnf 729 {11988 + givens}"
+    assert len(lines) == 1 + 11988 + givens
+    assert lines[-1] == "{} 0".format(8 * 81 + 8 * 9 + 9)
+
+
+def test_simplified_cnf_model_decodes_to_solution() -> None:
+    grid = from_string(PUZZLE)
+    enc = simplify_cnf(grid)
+    assert 0 < enc.num_vars < 729 and () not in enc.clauses
+    try:
+        from pysat.solvers import Minisat22
+    except ImportError:
+        pytest.skip("python-sat not installed")
+    with Minisat22(bootstrap_with=enc.clauses) as solver:
+        assert solver.solve()
+        assert enc.decode(solver.get_model()) == solve(grid).grid
+
+
+def test_simplified_cnf_keeps_contradiction() -> None:
+    bad = from_string(PUZZLE)
+    bad[0][2] = 5
+    assert () in simplify_cnf(bad).clauses
+
+
+def _api_engine(grid):
+    res = solve(grid)
+    return (res.grid if res else None), count_solutions(grid, limit=2)
+
+
+def test_crosscheck_grid_agrees_and_flags_bad_engine(monkeypatch) -> None:
+    from sudoku_dlx import crosscheck
+
+    monkeypatch.setitem(crosscheck._ENGINES, "api", _api_engine)
+    grid = from_string(PUZZLE)
+    res = crosscheck.crosscheck_grid(grid, ["dlx", "api"])
+    assert res["mismatch"] is None
+    assert res["engines"]["dlx"]["solution"] == res["engines"]["api"]["solution"]
+    assert res["engines"]["dlx"]["count"] == 1 and res["engines"]["dlx"]["ms"] >= 0.0
+
+    monkeypatch.setitem(crosscheck._ENGINES, "liar", lambda g: (_api_engine(g)[0], 2))
+    assert crosscheck.crosscheck_grid(grid, ["dlx", "liar"])["mismatch"] == "uniqueness"
+    monkeypatch.setitem(crosscheck._ENGINES, "junk", lambda g: ([[1] * 9 for _ in range(9)], 1))
+    assert crosscheck.crosscheck_grid(grid, ["dlx", "junk"])["mismatch"] == "invalid_solution"
+
+
+def test_crosscheck_file_writes_latency_and_exit_code(tmp_path, monkeypatch) -> None:
+    import json
+
+    from sudoku_dlx import cli, crosscheck
+
+    monkeypatch.setitem(crosscheck._ENGINES, "api", _api_engine)
+    monkeypatch.setitem(crosscheck._ENGINES, "liar", lambda g: (_api_engine(g)[0], 2))
+    flat = PUZZLE.replace("\n", "")
+    src = tmp_path / "p.txt"
+    src.write_text(flat + "\n" + "." * 30 + flat[30:] + "\n", encoding="utf-8")
+    out = tmp_path / "x.ndjson"
+    rc = cli.main(["crosscheck-file", "--in", str(src), "--out", str(out), "--engines", "dlx,api"])
+    assert rc == 0
+    recs = [json.loads(x) for x in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["type"] for r in recs] == ["latency", "latency", "summary"]
+    assert recs[0]["engine"] == "dlx" and recs[0]["n"] == 2 and sum(recs[0]["histogram"]["counts"]) == 2
+    assert recs[-1]["mismatches"] == 0 and recs[-1]["puzzles"] == 2
+
+    rc = cli.main(["crosscheck-file", "--in", str(src), "--out", str(out), "--engines", "dlx,liar"])
+    assert rc == 1
+    recs = [json.loads(x) for x in out.read_text(encoding="utf-8").splitlines()]
+    assert recs[0]["type"] == "mismatch" and recs[0]["index"] == 0 and recs[0]["kind"] == "uniqueness"
+
+
+def test_crosscheck_file_resolves_engine_import_paths(tmp_path) -> None:
+    import json
+
+    from sudoku_dlx import cli, crosscheck
+
+    path = f"{__name__}:_api_engine"
+    assert crosscheck.resolve_engine(path) is _api_engine
+    with pytest.raises(ValueError):
+        crosscheck.resolve_engine("nope")
+    with pytest.raises(ValueError):
+        crosscheck.resolve_engine("no_such_module_xyz:engine")
+    src = tmp_path / "p.txt"
+    src.write_text(PUZZLE.replace("\n", "") + "\n", encoding="utf-8")
+    out = tmp_path / "x.ndjson"
+    argv = ["crosscheck-file", "--in", str(src), "--out", str(out), "--parallel", "2"]
+    assert cli.main(argv + ["--engines", f"dlx,{path}"]) == 0
+    summary = json.loads(out.read_text(encoding="utf-8").splitlines()[-1])
+    assert summary["puzzles"] == 1 and summary["mismatches"] == 0
+    assert cli.main(argv + ["--engines", "dlx,no_such_module_xyz:engine"]) == 2
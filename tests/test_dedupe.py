@@ -29,3 +29,40 @@ def test_cli_dedupe_makes_unique_file():
         with open(outfile, "r", encoding="utf-8") as handle:
             lines = [line.strip() for line in handle if line.strip()]
         assert len(lines) == 1
+
+
+def test_cli_dedupe_keep_original_uses_fingerprint_prefilter():
+    s180 = "".join(reversed(S))
+    other = "." + S[1:]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infile = os.path.join(tmpdir, "in.txt")
+        outfile = os.path.join(tmpdir, "out.txt")
+        with open(infile, "w", encoding="utf-8") as handle:
+            handle.write(S + "\n")
+            handle.write(other + "\n")
+            handle.write(s180 + "\n")
+        rc = cli.main(["dedupe", "--in", infile, "--out", outfile, "--keep-original"])
+        assert rc == 0
+        with open(outfile, "r", encoding="utf-8") as handle:
+            lines = [line.strip() for line in handle if line.strip()]
+        assert lines == [S, other]
+
+
+def test_dedupe_prefiltered_streams_canonical_forms():
+    from sudoku_dlx.api import from_string
+    from sudoku_dlx.canonical import canonical_form
+    from sudoku_dlx.cli import _dedupe_prefiltered
+
+    s180 = "".join(reversed(S))
+    other = "." + S[1:]
+    consumed = []
+
+    def source():
+        for s in (S, "not a grid", s180, other):
+            consumed.append(s)
+            yield s
+
+    kept = _dedupe_prefiltered(source())
+    assert next(kept) == canonical_form(from_string(S))
+    assert consumed == [S]  # nothing read ahead of the first kept puzzle
+    assert list(kept) == [canonical_form(from_string(other))]
@@ -1,6 +1,6 @@
 from textwrap import dedent
 import json
-from sudoku_dlx import from_string, explain, solve
+from sudoku_dlx import from_string, explain, iter_explain, solve
 from sudoku_dlx import cli
 
 PUZ = dedent(
@@ -51,3 +51,96 @@ def test_cli_explain_json(capsys):
     data = json.loads(capsys.readouterr().out.strip())
     assert "steps" in data and isinstance(data["steps"], list)
     assert "progress" in data and len(data["progress"]) == 81
+
+
+def test_explain_persists_eliminations_across_steps():
+    # Needs eliminations before singles appear; rebuilding candidates every step
+    # used to rediscover the same elimination until max_steps ran out.
+    hard = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+    out = explain(from_string(hard), max_steps=200)
+    assert out["solved"]
+    assert out["progress"] == out["solution"]
+    elims = [(s["strategy"], s["r"], s["c"], s.get("v", s.get("remove", s.get("digit"))))
+             for s in out["steps"] if s["type"] == "eliminate"]
+    assert len(elims) == len(set(elims))
+
+
+def test_iter_explain_is_lazy_and_matches_explain():
+    g = from_string(PUZ)
+    snapshot = [row[:] for row in g]
+    it = iter_explain(g)
+    first_two = [next(it), next(it)]
+    assert g == snapshot
+    full = explain(g, max_steps=200)["steps"]
+    assert first_two == full[:2]
+    assert [first_two[0], first_two[1], *it] == full
+
+
+def test_explain_solves_only_when_the_solution_is_needed():
+    import importlib
+    from unittest.mock import patch
+
+    explain_mod = importlib.import_module("sudoku_dlx.explain")  # the module, not the function
+
+    g = from_string(PUZ)
+    full = solve(g).grid
+    sol = "".join(str(v) for row in full for v in row)
+    with patch.object(explain_mod, "solve", side_effect=AssertionError("solve called")):
+        # the steps finish this puzzle, so its solution is the progress
+        assert explain(g)["solution"] == sol
+        hints = explain(g, max_steps=2, solution=False)
+    assert hints["solution"] is None and len(hints["steps"]) == 2
+    assert explain(g, max_steps=2)["solution"] == sol
+
+
+def test_explain_bulk_singles_batches_placements():
+    g = from_string(PUZ)
+    step = explain(g, max_steps=200)
+    bulk = explain(g, max_steps=200, bulk_singles=True)
+    assert bulk["progress"] == step["progress"]
+    assert len(bulk["steps"]) < len(step["steps"])
+    batches = [s for s in bulk["steps"] if s["type"] == "place_batch"]
+    assert batches and all(s["placements"] for s in batches)
+    placed = [p for s in batches for p in s["placements"]]
+    assert len({(p["r"], p["c"]) for p in placed}) == len(placed)
+    assert all(bulk["progress"][p["r"] * 9 + p["c"]] == str(p["v"]) for p in placed)
+    assert explain(g, max_steps=200, bulk_singles=True) == bulk
+
+
+def test_cli_explain_bulk_singles(capsys):
+    rc = cli.main(["explain", "--grid", PUZ, "--json", "--bulk-singles"])
+    assert rc == 0
+    data = json.loads(capsys.readouterr().out.strip())
+    assert any(s["type"] == "place_batch" for s in data["steps"])
+
+
+def test_explain_profile_counts_strategy_calls():
+    g = from_string(PUZ)
+    plain = explain(g, max_steps=200)
+    prof = explain(g, max_steps=200, profile=True)
+    assert "profile" not in plain
+    report = prof.pop("profile")
+    assert prof == plain
+    assert report["steps"] == len(plain["steps"])
+    stats = report["strategies"]
+    assert stats["naked_single"]["calls"] == report["steps"]
+    hits = sum(s["hits"] for s in stats.values())
+    assert hits == len(plain["steps"])
+    assert all(s["open_candidates"] > 0 and s["seconds"] >= 0.0 for s in stats.values())
+
+
+def test_explain_profile_accumulates_into_given_profile():
+    from sudoku_dlx.strategies import StrategyProfile
+
+    shared = StrategyProfile()
+    a = explain(from_string(PUZ), profile=shared)
+    b = explain(from_string(PUZ), profile=shared)
+    assert shared.steps == len(a["steps"]) + len(b["steps"])
+    assert "naked_single" in shared.report()
+
+
+def test_cli_explain_techniques_restricts_ladder(capsys):
+    rc = cli.main(["explain", "--grid", PUZ, "--json", "--techniques", "naked_single"])
+    assert rc == 0
+    data = json.loads(capsys.readouterr().out.strip())
+    assert {s["strategy"] for s in data["steps"]} <= {"naked_single"}
@@ -1,4 +1,7 @@
-from sudoku_dlx.formats import read_grids, write_grids, detect_format
+import pytest
+
+from sudoku_dlx.formats import GridArray, GridWriter, iter_grids, read_grids, write_grids, detect_format
+from sudoku_dlx.formats import _iter_bin_stream, pack_grid, unpack_grid
 
 PUZ = (
     "53..7...."
@@ -26,7 +29,115 @@ def test_txt_csv_jsonl_roundtrip(tmp_path):
     grids3 = read_grids(str(pjsonl), "jsonl")
     assert grids3 == grids
 
+def test_write_grids_empty_txt_and_csv_sniff_whole_lines(tmp_path, monkeypatch):
+    import csv
+
+    empty = tmp_path / "empty.txt"
+    write_grids(str(empty), [])
+    assert empty.read_text(encoding="utf-8") == "\n"
+    assert read_grids(str(empty)) == []
+
+    samples = []
+    sniff = csv.Sniffer.sniff
+
+    def recording_sniff(self, sample, *args):
+        samples.append(sample)
+        return sniff(self, sample, *args)
+
+    monkeypatch.setattr(csv.Sniffer, "sniff", recording_sniff)
+    pcsv = tmp_path / "many.csv"
+    write_grids(str(pcsv), [PUZ] * 100)
+    assert read_grids(str(pcsv)) == [PUZ] * 100
+    assert samples[0].endswith("\n") and len(samples[0]) < 4096
+
+
 def test_detect_format_defaults_txt(tmp_path):
     assert detect_format("x.sdk") == "txt"
     assert detect_format("x.ndjson") == "jsonl"
     assert detect_format("x.unknown") == "txt"
+
+def test_iter_grids_streams_and_grid_writer_counts(tmp_path):
+    pcsv = tmp_path / "s.csv"
+    with GridWriter(str(pcsv)) as writer:
+        writer.write(PUZ)
+        writer.write_many([PUZ, PUZ])
+    assert writer.count == 3
+    it = iter_grids(str(pcsv))
+    assert next(it) == PUZ
+    assert list(it) == [PUZ, PUZ]
+
+def test_iter_grids_txt_non_strict_skips_bad_lines(tmp_path):
+    ptxt = tmp_path / "bad.txt"
+    ptxt.write_text(PUZ + "\n" + "123\n" + PUZ + "\n", encoding="utf-8")
+    assert list(iter_grids(str(ptxt), strict=False)) == [PUZ, PUZ]
+    assert list(iter_grids(str(ptxt), strict=False, keep_malformed=True)) == [PUZ, "123", PUZ]
+    with pytest.raises(ValueError):
+        list(iter_grids(str(ptxt)))
+
+
+def test_iter_grids_txt_blocks_normalize_blanks(tmp_path, monkeypatch):
+    from sudoku_dlx import formats
+
+    monkeypatch.setattr(formats, "_TXT_BLOCK_LINES", 2)
+    zeros = PUZ.replace(".", "0")
+    spaced = " ".join(PUZ[i : i + 9] for i in range(0, 81, 9))
+    junk = "x" + PUZ[1:]  # 81 chars but not a grid: passed through for the caller to reject
+    ptxt = tmp_path / "mixed.txt"
+    ptxt.write_text(f"{zeros}\n\n{spaced}\r\n{junk}\n{PUZ}\n", encoding="utf-8")
+    assert list(iter_grids(str(ptxt))) == [PUZ, PUZ, junk, PUZ]
+
+def test_binary_container_roundtrip_and_random_access(tmp_path):
+    pbin = tmp_path / "p.sdkb"
+    assert detect_format(str(pbin)) == "bin"
+    other = "." + PUZ[1:]
+    with GridWriter(str(pbin), scores=True) as writer:
+        writer.write(PUZ, score=4.2, flags=1)
+        writer.write(other, score=7.5)
+    assert pbin.stat().st_size == 16 + 2 * 44
+    with GridArray(str(pbin)) as arr:
+        assert len(arr) == 2
+        assert arr[1] == other and arr[-2] == PUZ
+        assert arr.score(0) == 4.2 and arr.flags(0) == 1
+        with pytest.raises(IndexError):
+            arr[2]
+    assert read_grids(str(pbin)) == [PUZ, other]
+
+def test_binary_container_rejects_foreign_files(tmp_path):
+    ptxt = tmp_path / "p.txt"
+    ptxt.write_text(PUZ + "\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        GridArray(str(ptxt))
+    bad = tmp_path / "zero.sdkb"
+    bad.write_bytes(b"SDKB\x01\x00\x00\x00" + bytes(8) + bytes(41))  # record size 0
+    with pytest.raises(ValueError, match="record size"):
+        GridArray(str(bad))
+    with bad.open("rb") as fb, pytest.raises(ValueError, match="record size"):
+        list(_iter_bin_stream(fb))
+
+
+def test_pack_grid_rejects_non_grid_characters():
+    assert unpack_grid(pack_grid(PUZ.replace(".", "0"))) == PUZ
+    for ch in ("\x05", "a", "é"):
+        with pytest.raises(ValueError, match="bad grid characters"):
+            pack_grid(ch + PUZ[1:])
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+def test_compressed_roundtrip(tmp_path, suffix):
+    for base, fmt in (("p.txt", "txt"), ("p.csv", "csv"), ("p.jsonl", "jsonl"), ("p.sdkb", "bin")):
+        path = str(tmp_path / (base + suffix))
+        assert detect_format(path) == fmt
+        write_grids(path, [PUZ, PUZ], compresslevel=1)
+        assert read_grids(path) == [PUZ, PUZ]
+
+@pytest.mark.parametrize("name", ["p.txt", "p.jsonl", "p.sdkb", "p.csv", "p.txt.gz"])
+def test_iter_grids_shards_partition_input(tmp_path, name):
+    grids = [str(i % 10 if i % 10 else ".") * 81 for i in range(23)]
+    path = str(tmp_path / name)
+    write_grids(path, grids)
+    for count in (1, 2, 3, 7):
+        shards = [list(iter_grids(path, shard=(i, count))) for i in range(count)]
+        assert sorted(g for part in shards for g in part) == sorted(grids)
+        if name in {"p.txt", "p.jsonl", "p.sdkb"}:
+            assert [g for part in shards for g in part] == grids
+    with pytest.raises(ValueError):
+        list(iter_grids(path, shard=(3, 3)))
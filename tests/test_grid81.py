@@ -0,0 +1,97 @@
+import array
+
+import pytest
+
+from sudoku_dlx import (
+    Grid81,
+    analyze,
+    canonical_form,
+    count_solutions,
+    explain,
+    from_string,
+    is_valid,
+    parse_many,
+    rate,
+    solve,
+    to_string,
+)
+from sudoku_dlx.bench import load_corpus
+
+PUZZLE = load_corpus("hard")[0]
+
+
+def test_grid81_round_trips_and_reads_like_a_list_grid() -> None:
+    g = Grid81.from_text(PUZZLE)
+    assert g.to_string() == to_string(g) == PUZZLE
+    assert g.to_grid() == from_string(PUZZLE) == g
+    assert Grid81.from_grid(from_string(PUZZLE)) == g
+    assert [list(row) for row in g] == g.to_grid() and len(g) == 9
+    assert g[8][8] == from_string(PUZZLE)[8][8]
+    assert g.clues() == [(r, c, v) for r, row in enumerate(g.to_grid()) for c, v in enumerate(row) if v]
+    assert g.givens() == 81 - PUZZLE.count(".")
+    assert Grid81.from_text(PUZZLE.encode().replace(b".", b"0")) == g
+    with pytest.raises(ValueError):
+        Grid81.from_text(PUZZLE[:-1] + "x")
+    with pytest.raises(ValueError):
+        Grid81(bytes(80))
+    with pytest.raises(ValueError):
+        Grid81(bytes([10]) + bytes(80))
+
+
+def test_grid81_wraps_buffers_without_copying() -> None:
+    cells = bytes(Grid81.from_text(PUZZLE))
+    buf = bytearray(cells * 3)
+    g = Grid81(memoryview(buf)[81:162])
+    assert g.cells.obj is buf
+    buf[81] = 0 if buf[81] else 1  # the grid sees writes to the shared buffer
+    assert g.cells[0] == buf[81]
+    ro = Grid81(cells)
+    with pytest.raises(TypeError):
+        ro[0][0] = 1
+    assert Grid81(array.array("B", cells)) == ro
+    empty = Grid81()
+    empty[4][4] = 7
+    assert empty.givens() == 1 and empty.to_string()[40] == "7"
+
+
+def test_api_accepts_grid81_alongside_lists() -> None:
+    g = Grid81.from_text(PUZZLE)
+    lst = from_string(PUZZLE)
+    res = solve(g)
+    assert isinstance(res.grid, Grid81)
+    assert res.grid == solve(lst).grid
+    assert g.to_string() == PUZZLE  # the puzzle itself is untouched
+    assert count_solutions(g) == count_solutions(lst) == 1
+    assert is_valid(g) and not is_valid(Grid81.from_text("11" + "." * 79))
+    assert canonical_form(g) == canonical_form(lst)
+    assert rate(g) == rate(lst)
+    assert rate(g, method="strategies") == rate(lst, method="strategies")
+    assert explain(g, max_steps=20) == explain(lst, max_steps=20)
+    a, b = analyze(g), analyze(lst)
+    a["stats"].pop("ms"), b["stats"].pop("ms")
+    assert a == b
+
+
+def test_parse_many_parses_a_whole_buffer() -> None:
+    puzzles = load_corpus("easy")[:5]
+    text = "\n".join(puzzles[:3]) + "\r\n\n" + puzzles[3].replace(".", "0") + "\n " + puzzles[4]
+    grids = parse_many(text.encode())
+    assert [g.to_string() for g in grids] == puzzles
+    assert parse_many(text) == grids and parse_many(bytearray(text.encode())) == grids
+    with pytest.raises(ValueError, match="line 2"):
+        parse_many(puzzles[0] + "\n" + puzzles[1][:-1] + "x\n")
+    assert parse_many("# header\n" + puzzles[0] + "\n", strict=False) == grids[:1]
+
+
+def test_string_round_trip_fast_paths_match_per_cell_formatting() -> None:
+    from sudoku_dlx import legacy_from_string, legacy_to_string
+
+    grid = from_string(PUZZLE)
+    assert to_string(grid) == legacy_to_string(grid) == PUZZLE
+    assert legacy_from_string(PUZZLE.replace(".", "0")) == grid
+    with pytest.raises(ValueError):
+        legacy_from_string(PUZZLE.replace(".", "-"))
+    assert from_string("\n".join(PUZZLE[i : i + 9] for i in range(0, 81, 9))) == grid
+    odd = [row[:] for row in grid]
+    odd[0][0] = 12  # not a cell value: falls back to str() per cell
+    assert to_string(odd).startswith("12")
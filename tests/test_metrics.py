@@ -0,0 +1,50 @@
+from sudoku_dlx import count_solutions, from_string, rate, solve
+from sudoku_dlx.metrics import Histogram, MetricsRegistry, disable_metrics, dump_metrics, enable_metrics
+from sudoku_dlx.rating import _RATING_CACHE
+
+PUZ = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+
+
+def test_metrics_are_off_by_default() -> None:
+    assert dump_metrics() == ""
+    solve(from_string(PUZ))
+    assert dump_metrics() == ""
+
+
+def test_registry_records_calls_nodes_and_cache() -> None:
+    _RATING_CACHE.clear()
+    reg = enable_metrics()
+    try:
+        g = from_string(PUZ)
+        solve(g)
+        count_solutions(g, limit=2)
+        rate(g)
+        rate(g)
+        text = dump_metrics()
+    finally:
+        disable_metrics()
+    assert reg.calls.value("count") == 1
+    assert reg.calls.value("rate") == 2
+    assert reg.calls.value("solve") >= 2  # rate solves once on a cache miss
+    assert reg.cache.value("rating", "hit") == 1
+    assert reg.cache.value("rating", "miss") == 1
+    assert reg.call_seconds.count("count") == 1
+    assert "# TYPE sudoku_dlx_call_seconds histogram" in text
+    assert 'sudoku_dlx_calls_total{op="rate"} 2' in text
+    assert 'sudoku_dlx_cache_total{cache="rating",result="hit"} 1' in text
+    assert 'sudoku_dlx_search_nodes_count{op="solve"}' in text
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    h = Histogram("t_seconds", "test", ("op",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.7, 3.0):
+        h.observe(v, "x")
+    lines = list(h.samples())
+    assert lines[:3] == [
+        't_seconds_bucket{op="x",le="0.1"} 1',
+        't_seconds_bucket{op="x",le="1"} 3',
+        't_seconds_bucket{op="x",le="+Inf"} 4',
+    ]
+    assert lines[-1] == 't_seconds_count{op="x"} 4'
+    reg = MetricsRegistry()
+    assert reg.counter("sudoku_dlx_calls_total", "again", ("op",)) is reg.calls
@@ -0,0 +1,44 @@
+import io
+import pstats
+
+import pytest
+
+from sudoku_dlx import cli, count_solutions, from_string
+from sudoku_dlx.bench import load_corpus
+from sudoku_dlx.crosscheck import available_engines
+from sudoku_dlx.profiling import Profiler, worker_pool
+
+
+def _count(s: str) -> int:
+    return count_solutions(from_string(s), limit=2)
+
+
+def _functions(path) -> set:
+    return {name for (_, _, name) in pstats.Stats(str(path)).stats}
+
+
+def test_profiler_merges_terminated_pool_workers(tmp_path) -> None:
+    out = tmp_path / "run.prof"
+    stream = io.StringIO()
+    with Profiler(str(out), top=5, stream=stream) as prof:
+        # the context manager exit terminates the workers (SIGTERM path)
+        with worker_pool(2) as pool:
+            assert pool.map(_count, load_corpus("easy")[:4]) == [1, 1, 1, 1]
+    assert prof.workers == 2
+    assert "_count" in _functions(out)
+    assert "parent + 2 worker(s)" in stream.getvalue()
+    assert "cumulative" in stream.getvalue()
+    with pytest.raises(ValueError):
+        Profiler(top=-1)
+
+
+def test_cli_profile_flag_covers_parallel_workers(tmp_path, capsys) -> None:
+    if "sat" not in available_engines():
+        pytest.skip("python-sat not installed")
+    src = tmp_path / "in.txt"
+    src.write_text("\n".join(load_corpus("easy")[:6]) + "\n", encoding="utf-8")
+    out = tmp_path / "cc.prof"
+    args = ["--profile", str(out), "--profile-top", "3", "crosscheck-file", "--in", str(src)]
+    assert cli.main(args + ["--out", str(tmp_path / "cc.ndjson"), "--parallel", "2"]) == 0
+    assert "_crosscheck_worker" in _functions(out)
+    assert "parent + 2 worker(s)" in capsys.readouterr().err
@@ -15,3 +15,26 @@ def test_rate_file_json(tmp_path, capsys):
     assert len(out) == 2
     j = json.loads(out[0])
     assert "grid" in j and "score" in j
+
+
+def test_rate_file_shards_cover_input(tmp_path, capsys):
+    p = tmp_path / "p.txt"
+    base = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+    grids = [base, "." + base[1:], base[:-1] + ".", "." + base[1:-1] + "."]
+    p.write_text("\n".join(grids) + "\n", encoding="utf-8")
+    seen = []
+    for i in range(3):
+        rc = cli.main(["rate-file", "--in", str(p), "--json", "--shard", f"{i}/3"])
+        assert rc == 0
+        seen += [json.loads(x)["grid"] for x in capsys.readouterr().out.splitlines()]
+    assert seen == grids
+
+
+def test_rate_file_strategies_method(tmp_path, capsys):
+    p = tmp_path / "p.txt"
+    grid = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+    p.write_text(grid + "\n", encoding="utf-8")
+    rc = cli.main(["rate-file", "--in", str(p), "--json", "--method", "strategies"])
+    assert rc == 0
+    j = json.loads(capsys.readouterr().out.strip())
+    assert 1.0 <= j["score"] < 2.5
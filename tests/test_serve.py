@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from sudoku_dlx.serve import SolverServer, dispatch
+
+PUZ = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+SOL = "534678912672195348198342567859761423426853791713924856961537284287419635345286179"
+
+
+def test_dispatch_ops_and_validation() -> None:
+    assert dispatch("solve", {"grid": PUZ})["solution"] == SOL
+    assert dispatch("count", {"grid": PUZ, "limit": 3}) == {"count": 1}
+    assert len(dispatch("canonical", {"grid": PUZ})["canonical"]) == 81
+    assert dispatch("explain", {"grid": PUZ, "max_steps": 3})["steps"]
+    assert len(dispatch("generate", {"seed": 3, "givens": 40})["grid"]) == 81
+    with pytest.raises(ValueError):
+        dispatch("count", {"grid": PUZ, "limit": 0})
+    with pytest.raises(ValueError):
+        dispatch("solve", {"grid": "77" + "." * 79})
+    with pytest.raises(ValueError, match="invalid grid"):
+        dispatch("analyze", {"grid": "1" * 81})
+    for flag in ("false", 0, 0.0, "0", None):
+        with pytest.raises(ValueError, match="true or false"):
+            dispatch("explain", {"grid": PUZ, "bulk_singles": flag})
+        with pytest.raises(ValueError, match="true or false"):
+            dispatch("generate", {"seed": 3, "minimal": flag})
+    assert dispatch("explain", {"grid": PUZ, "max_steps": 2, "solution": False})["solution"] is None
+    with pytest.raises(ValueError):
+        dispatch("teleport", {})
+
+
+@pytest.fixture
+def server():
+    yield from _running(SolverServer(port=0, workers=0, max_batch=4))
+
+
+def _running(srv):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(srv.start(), loop).result(timeout=30)
+    yield srv
+    asyncio.run_coroutine_threadsafe(srv.close(), loop).result(timeout=30)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+def _post(srv, path, body):
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{srv.port}/{path}", data=json.dumps(body).encode(), method="POST"
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_server_endpoints_batch_and_errors(server) -> None:
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/health", timeout=30) as resp:
+        assert json.loads(resp.read())["ok"] is True
+    status, body = _post(server, "solve", {"grid": PUZ})
+    assert status == 200 and body["solution"] == SOL
+    status, body = _post(
+        server, "batch", {"requests": [{"op": "count", "grid": PUZ}, {"op": "solve", "grid": "x"}]}
+    )
+    assert status == 200
+    assert body["results"][0] == {"count": 1} and "error" in body["results"][1]
+    assert _post(server, "batch", {"requests": [{"op": "count", "grid": PUZ}] * 5})[0] == 413
+    assert _post(server, "count", {"grid": PUZ, "limit": "many"})[0] == 400
+    assert _post(server, "analyze", {"grid": "1" * 81})[0] == 400
+    assert _post(server, "nope", {})[0] == 404
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=30) as resp:
+        text = resp.read().decode()
+    assert 'sudoku_dlx_requests_total{endpoint="solve",status="200"} 1' in text
+    assert 'sudoku_dlx_requests_total{endpoint="other",status="404"} 1' in text
+
+
+def _post_raw(srv, path, data):
+    req = urllib.request.Request(f"http://127.0.0.1:{srv.port}/{path}", data=data, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_server_answers_malformed_bodies_and_internal_errors(server, monkeypatch) -> None:
+    status, body = _post_raw(server, "solve", b"[" * 100_000)  # json.loads: RecursionError
+    assert status == 400 and body == {"error": "body must be JSON"}
+
+    def broken(op, payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("sudoku_dlx.serve.dispatch", broken)  # workers=0: runs in this process
+    assert _post(server, "solve", {"grid": PUZ}) == (500, {"error": "internal error: RuntimeError"})
+    status, body = _post(server, "batch", {"requests": [{"op": "solve", "grid": PUZ}]})
+    assert status == 200 and body["results"] == [{"error": "internal error: RuntimeError"}]
+
+    async def broken_route(method, name, body):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(server, "_route", broken_route)
+    assert _post(server, "solve", {"grid": PUZ})[0] == 500
+    monkeypatch.undo()
+    assert _post(server, "solve", {"grid": PUZ})[0] == 200
+
+
+def test_over_budget_worker_is_replaced() -> None:
+    # one worker, one batch of slow generates (~7 s of work) against a 300 ms budget
+    for srv in _running(SolverServer(port=0, workers=1, budget_ms=300, max_batch=16)):
+        slow = [{"op": "generate", "seed": i, "givens": 17, "minimal": True} for i in range(16)]
+        assert _post(srv, "batch", {"requests": slow})[0] == 504
+        t0 = time.monotonic()
+        status = 504
+        while status != 200 and time.monotonic() - t0 < 3.0:
+            status, body = _post(srv, "solve", {"grid": PUZ})
+        # served by the replacement long before the killed worker would have finished
+        assert status == 200 and body["solution"] == SOL
+        with urllib.request.urlopen(f"http://127.0.0.1:{srv.port}/metrics", timeout=30) as resp:
+            assert "sudoku_dlx_worker_restarts_total 1" in resp.read().decode()
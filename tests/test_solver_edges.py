@@ -55,6 +55,46 @@ def test_count_solutions_no_solution_when_search_fails(monkeypatch):
     assert (cnt, grid) == (0, None)
 
 
+def test_count_solutions_returns_full_first_solution_when_limit_not_reached():
+    # needs search after the prepass; the solution path used to be unwound while
+    # the search kept looking for a second solution
+    puzzle = from_string(
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+    )
+    count, sol = SOLVER.count_solutions(grid_clues(puzzle), limit=2)
+    assert count == 1
+    assert validate_grid(sol)
+    assert sol == SOLVER.count_solutions(grid_clues(puzzle), limit=1)[1]
+
+
+def test_search_stats_count_backtracks_and_dead_ends_exactly():
+    from sudoku_dlx.solver import SearchTracer
+
+    class Backtracks(SearchTracer):
+        def __init__(self):
+            self.n = 0
+
+        def on_backtrack(self, depth, row_idx):
+            self.n += 1
+
+    clues = grid_clues(
+        from_string("..4..3..62..8......6..1......259..6..8.....19.....7........68....97....5.56....43")
+    )
+    tr = Backtracks()
+    count, _ = SOLVER.count_solutions(clues, limit=1, tracer=tr)
+    st = SOLVER.stats
+    assert count == 1
+    assert st.backtracks == tr.n > 0
+    # every failed node is taken back once by its parent; the solution path is not
+    assert st.dead_ends + st.failed_columns == st.backtracks
+    assert st.backtracks == st.branches - st.max_depth
+    assert sum(st.depth_nodes) == st.nodes
+    assert sum(st.depth_branches) == st.branches
+    assert len(st.branching()) == st.max_depth + 1
+    SOLVER.count_solutions(clues, limit=1)
+    assert SOLVER.stats == st
+
+
 def test_iter_solutions_with_limit():
     puzzle = from_string(
         "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
@@ -1,3 +1,5 @@
+import json
+
 from sudoku_dlx import cli
 
 
@@ -16,3 +18,12 @@ def test_stats_file_small(tmp_path):
     # ensure it runs and prints JSON
     rc = cli.main(["stats-file", "--in", str(puzzles)])
     assert rc == 0
+
+
+def test_stats_file_counts_malformed_rows(tmp_path, capsys):
+    puz = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+    puzzles = tmp_path / "p.txt"
+    puzzles.write_text(puz + "\n" + "123\n" + puz + "\n", encoding="utf-8")
+    assert cli.main(["stats-file", "--in", str(puzzles)]) == 0
+    data = json.loads(capsys.readouterr().out.strip())
+    assert data["count"] == 3 and data["valid_pct"] == 66.67 and data["givens_min"] == 30
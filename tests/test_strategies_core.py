@@ -2,18 +2,25 @@ from __future__ import annotations
 
 from unittest.mock import patch
 
+import pytest
+
 from sudoku_dlx.strategies import (
+    LADDER,
+    CandidateState,
+    StrategyProfile,
+    apply_all_singles,
     apply_box_line_claiming,
     apply_hidden_pair,
     apply_hidden_single,
     apply_hidden_triple,
-    apply_hidden_single,
     apply_locked_candidates_pointing,
     apply_naked_single,
     apply_naked_pair,
     apply_naked_triple,
     apply_x_wing,
     candidates,
+    is_solvable_with,
+    resolve_ladder,
     step_once,
 )
 
@@ -599,3 +606,91 @@ def test_step_once_returns_none_when_no_moves_available() -> None:
 
     assert move is None
     assert grid == snapshot
+
+
+def test_candidate_state_place_updates_peers_incrementally() -> None:
+    grid = _empty_grid()
+    state = CandidateState(grid)
+
+    state.place(4, 4, 5)
+
+    assert grid[4][4] == 5
+    assert state.cand[4][4] == set()
+    assert 5 not in state.cand[4][0] and 5 not in state.cand[0][4] and 5 not in state.cand[3][3]
+    assert 5 in state.cand[0][0]
+    assert state.cand == candidates(grid)
+
+
+def test_step_once_with_state_keeps_eliminations() -> None:
+    grid = _empty_grid()
+    state = CandidateState(grid)
+    _set_candidates(state.cand, 0, 0, {1, 2})
+    _set_candidates(state.cand, 0, 1, {1, 2})
+
+    move = step_once(grid, state)
+
+    assert move is not None and move["strategy"] == "naked_pair"
+    removed = move["remove"]
+    assert removed not in state.cand[move["r"]][move["c"]]
+    second = step_once(grid, state)
+    assert second is not None
+    assert (second["r"], second["c"], second.get("remove")) != (move["r"], move["c"], removed)
+
+
+def test_apply_all_singles_places_batch_and_updates_peers():
+    g = [[0] * 9 for _ in range(9)]
+    g[0] = [0, 2, 3, 4, 5, 6, 7, 8, 9]
+    cand = candidates(g)
+    mv = apply_all_singles(g, cand)
+    assert mv is not None and mv["type"] == "place_batch"
+    assert {"strategy": "naked_single", "r": 0, "c": 0, "v": 1} in mv["placements"]
+    assert g[0][0] == 1
+    assert all(1 not in cand[r][0] for r in range(1, 9))
+    assert apply_all_singles(g, cand) is None
+
+
+HARD = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+EASY = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+
+
+def _grid(s: str) -> list[list[int]]:
+    return [[int(ch) if ch.isdigit() else 0 for ch in s[r * 9 : r * 9 + 9]] for r in range(9)]
+
+
+def test_resolve_ladder_groups_order_and_cap() -> None:
+    assert resolve_ladder(["singles"]) == ("naked_single", "hidden_single")
+    assert resolve_ladder(["hidden_single", "singles", "x_wing"]) == (
+        "hidden_single",
+        "naked_single",
+        "x_wing",
+    )
+    assert resolve_ladder(upto="locked_candidates") == (
+        "naked_single",
+        "hidden_single",
+        "locked_candidates_pointing",
+        "box_line_claiming",
+    )
+    with pytest.raises(ValueError):
+        resolve_ladder(["singles", "bogus"])
+    with pytest.raises(ValueError):
+        resolve_ladder(["singles"], upto="fish")
+
+
+def test_step_once_restricted_ladder_stops_at_stall() -> None:
+    state = CandidateState(_grid(HARD))
+    profile = StrategyProfile()
+    while step_once(state.grid, state, techniques=["singles"], profile=profile):
+        pass
+    assert not state.is_solved()
+    assert set(profile.calls) == {"naked_single", "hidden_single"}
+    # the full ladder still makes progress from the same stall
+    assert step_once(state.grid, state) is not None
+
+
+def test_is_solvable_with_classifies_by_technique() -> None:
+    assert is_solvable_with(_grid(EASY), ["singles"])
+    assert not is_solvable_with(_grid(HARD), ["singles"])
+    assert is_solvable_with(_grid(HARD), LADDER, upto="locked_candidates")
+    bad = _grid(EASY)
+    bad[0][2] = 5  # duplicate 5 in row 0
+    assert not is_solvable_with(bad, ["singles"])
@@ -49,3 +49,19 @@ def test_x_wing_row_eliminates_in_other_rows():
     mv = apply_x_wing(g, cand)
     assert mv is not None and mv["strategy"] in ("x_wing_row", "x_wing_col")
     assert d not in cand[mv["r"]][mv["c"]]
+
+
+def test_naked_triple_never_eliminates_from_the_triple_cells():
+    g = [[0] * 9 for _ in range(9)]
+    cand = candidates(g)
+    for r in range(9):
+        for c in range(9):
+            cand[r][c] -= {1, 2, 3}
+    cand[0][0] = {1, 2}
+    cand[0][1] = {1, 3}
+    cand[0][2] = {2, 3}
+    cand[0][7].update({1, 5})
+    mv = apply_naked_triple(g, cand)
+    assert mv is not None
+    assert (mv["r"], mv["c"], mv["v"]) == (0, 7, 1)
+    assert cand[0][2] == {2, 3}
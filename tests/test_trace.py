@@ -47,3 +47,67 @@ def test_cli_solve_writes_trace(tmp_path):
     # steps must fill exactly the blanks from initial
     blanks = sum(1 for ch in data["initial"] if ch == ".")
     assert blanks == len(data["steps"])
+
+
+HARD = "..4..3..62..8......6..1......259..6..8.....19.....7........68....97....5.56....43"
+
+
+def test_dlx_trace_replays_to_solution():
+    import io
+
+    from sudoku_dlx.trace import record_search
+
+    g = from_string(HARD)
+    buf = io.StringIO()
+    end = record_search(g, buf)
+    lines = [json.loads(line) for line in buf.getvalue().splitlines()]
+    assert lines[0]["t"] == "start" and lines[0]["kind"] == "dlx_search"
+    assert lines[-1] == end and end["count"] == 1 and not end["truncated"]
+    assert any(rec["t"] == "backtrack" for rec in lines)
+    cells = {}
+    for rec in lines:
+        if rec["t"] == "cover":
+            cells[(rec["r"], rec["c"])] = rec["v"]
+        elif rec["t"] == "backtrack":
+            del cells[(rec["r"], rec["c"])]
+    replay = "".join(str(cells[(r, c)]) for r in range(9) for c in range(9))
+    assert replay == to_string(solve(g).grid)
+
+
+def test_tracer_hooks_match_search_stats():
+    from sudoku_dlx.solver import SOLVER, SearchTracer, grid_clues
+
+    class Counter(SearchTracer):
+        def __init__(self):
+            self.covers = self.backtracks = self.solutions = 0
+
+        def on_cover(self, depth, row_idx):
+            self.covers += depth > 0
+
+        def on_backtrack(self, depth, row_idx):
+            self.backtracks += 1
+
+        def on_solution(self, depth, count):
+            self.solutions += 1
+
+    clues = grid_clues(from_string(HARD))
+    plain = SOLVER.count_solutions(clues, limit=2)
+    plain_stats = (SOLVER.stats.nodes, SOLVER.stats.branches)
+    tr = Counter()
+    assert SOLVER.count_solutions(clues, limit=2, tracer=tr) == plain
+    assert (SOLVER.stats.nodes, SOLVER.stats.branches) == plain_stats
+    assert tr.covers == SOLVER.stats.branches
+    assert tr.solutions == 1
+
+
+def test_cli_solve_dlx_trace_is_bounded(tmp_path):
+    out = tmp_path / "trace.ndjson"
+    rc = cli.main(
+        ["solve", "--grid", HARD, "--trace", str(out), "--trace-kind", "dlx",
+         "--trace-sample", "3", "--trace-max-events", "40"]
+    )
+    assert rc == 0
+    lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    end = lines[-1]
+    assert end["t"] == "end" and end["truncated"]
+    assert len(lines) == 40 + 2